@@ -1,16 +1,25 @@
+import bisect
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
-from DaVinciPipe.PipelineInterfaces import AbstractPipelineInterface
+from DaVinciPipe.pathKey import pathKey
+from DaVinciPipe.Progress import ProgressCallback
+from DaVinciPipe.ShotRecords import Clip, Shot, asShots
+
+if TYPE_CHECKING:
+    from DaVinciPipe.PipelineInterfaces import AbstractPipelineInterface
 
 
 class AbstractEditingSoftwareHandle(ABC):
-    def __init__(self, pipe: AbstractPipelineInterface, config: dict):
+    def __init__(self, pipe: "AbstractPipelineInterface", config: dict):
         self._pipe = pipe
         self._config = config
 
     @property
-    def pipe(self) -> AbstractPipelineInterface:
+    def pipe(self) -> "AbstractPipelineInterface":
         return self._pipe
 
     @property
@@ -18,17 +27,104 @@ class AbstractEditingSoftwareHandle(ABC):
         return self._config
 
     @abstractmethod
-    def getTimelineInfo(self) -> list[dict[str, Any]]:
+    def getTimelineInfo(self) -> list[Clip]:
         raise NotImplementedError()
 
     @abstractmethod
-    def importShotCollection(self, shotCollection: list[dict[str, Any]]):
+    def importShotCollection(self, shotCollection: list[Shot]):
         raise NotImplementedError()
 
+    @abstractmethod
+    def readTimelineSources(self) -> dict[str, Any]:
+        """
+        The timeline's clips grouped by source: clipCount and sources, each
+        with sourceId, mediaName, filePath and clipCount plus what
+        _replaceSource needs.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _replaceSource(self, change: dict[str, Any]) -> bool:
+        """Points the clips of a source of the plan to change["newPath"]."""
+        raise NotImplementedError()
+
+    def updateTimeline(self) -> dict[str, Any]:
+        timelineSources = self.readTimelineSources()
+        plan = self.planTimelineUpdate(timelineSources)
+        return self.applyTimelineUpdate(plan)
+
+    def planTimelineUpdate(self, timelineSources: dict[str, Any],
+                           progressCallback: Optional[ProgressCallback] = None,
+                           cancelEvent: Optional[threading.Event] = None,
+                           knownVersions: Optional[dict[str, Optional[Path]]] = None) -> dict[str, Any]:
+        """
+        Resolves the newest version of every source, scanning each source
+        directory once. Makes no calls into the editing software, so it can
+        run in a worker. knownVersions is shared between plans of one
+        batch: paths already in it are not resolved again, new results are
+        added to it.
+        """
+        sources = timelineSources["sources"]
+        directories = {str(Path(source["filePath"]).parent) for source in sources}
+
+        if knownVersions is None:
+            knownVersions = {}
+        missingPaths = list({source["filePath"] for source in sources} - knownVersions.keys())
+        knownVersions.update(self.pipe.getNewestVersions(missingPaths, progressCallback, cancelEvent))
+
+        changes = []
+        unresolved = []
+        for source in sources:
+            newPath = knownVersions.get(source["filePath"])
+            if newPath is None:
+                unresolved.append(source["filePath"])
+            elif Path(newPath) != Path(source["filePath"]):
+                changes.append({**source, "newPath": str(newPath)})
+
+        return {
+            "clipCount": timelineSources["clipCount"],
+            "sourceCount": len(sources),
+            "directoryCount": len(directories),
+            "changes": changes,
+            "unresolved": unresolved,
+        }
+
+    def applyTimelineUpdate(self, plan: dict[str, Any]) -> dict[str, Any]:
+        """Replaces the file of every changed source once and reports what changed."""
+        replaced = []
+        failed = []
+        for change in plan["changes"]:
+            entry = {
+                "mediaName": change["mediaName"],
+                "oldPath": change["filePath"],
+                "newPath": change["newPath"],
+                "clipCount": change["clipCount"],
+            }
+            if self._replaceSource(change):
+                replaced.append(entry)
+            else:
+                print(f"[WARNING] Could not replace {change['filePath']} with {change['newPath']}")
+                failed.append(entry)
+
+        return {
+            "clipCount": plan["clipCount"],
+            "sourceCount": plan["sourceCount"],
+            "directoryCount": plan["directoryCount"],
+            "replaced": replaced,
+            "failed": failed,
+            "unchanged": plan["sourceCount"] - len(plan["changes"]) - len(plan["unresolved"]),
+            "unresolved": plan["unresolved"],
+        }
+
+
+# Channels of Blender's sequencer
+MAX_CHANNELS = 128
+
 
 class BlenderHandle(AbstractEditingSoftwareHandle):
 
-    def __init__(self, pipe: AbstractPipelineInterface, config: dict, bpyObj):
+    def __init__(self, pipe: "AbstractPipelineInterface", config: dict, bpyObj):
+        super().__init__(pipe, config)
         self._bpy = bpyObj
         self._scene = None
         self._sequenceEditor = None
@@ -46,18 +142,200 @@ class BlenderHandle(AbstractEditingSoftwareHandle):
     @property
     def sequenceEditor(self):
         if self._sequenceEditor is None:
+            if self.scene.sequence_editor is None:
+                self.scene.sequence_editor_create()
             self._sequenceEditor = self.scene.sequence_editor
         return self._sequenceEditor
 
-    def getTimelineInfo(self) -> list[dict[str, Any]]:
-        pass
-
-    def importShotCollection(self, shotCollection: list[dict[str, Any]]):
-        for shot in shotCollection:
-            if shot.get("filePath"):
-                movieStrip = self.sequenceEditor.sequences.new_movie(
-                    name=shot["name"],
-                    filepath=str(shot["filePath"]),
-                    channel=1,
-                    frame_start=shot["start"],
-                )
+    @property
+    def strips(self):
+        """The top level strips; Blender 4.4 renamed sequences to strips."""
+        editor = self.sequenceEditor
+        return editor.strips if hasattr(editor, "strips") else editor.sequences
+
+    def getTimelineInfo(self, trackTypes: Iterable[str] = ("video", "audio")) -> list[Clip]:
+        """
+        The strips as Clips, ordered like DavinciHandle's timeline items: by
+        track type, channel and start. Blender has no media pool, strips of
+        the same file share a source (sourceId is the file's path key).
+        """
+        trackOrder = {trackType: i for i, trackType in enumerate(trackTypes)}
+        clips = []
+        for strip in self.strips:
+            trackType = "audio" if strip.type == "SOUND" else "video"
+            if trackType not in trackOrder:
+                continue
+            filePath = self._filePath(strip)
+            clips.append(Clip(
+                mediaPoolItem=strip,
+                sourceMediaPoolItem=strip if filePath else None,
+                sourceId=pathKey(filePath) if filePath else None,
+                name=strip.name,
+                trackType=trackType,
+                trackIndex=strip.channel,
+                start=strip.frame_final_start,
+                end=strip.frame_final_end - 1,
+                duration=strip.frame_final_duration,
+                mediaName=os.path.basename(filePath) if filePath else None,
+                filePath=filePath,
+            ))
+        clips.sort(key=lambda clip: (trackOrder[clip.trackType], clip.trackIndex, clip.start))
+        return clips
+
+    def importShotCollection(self, shotCollection: list[Shot]):
+        """
+        Adds a movie strip per shot in one pass over the sorted shots. Each
+        shot goes to the lowest channel where it overlaps no strip, existing
+        strips included, so overlapping shots don't end up on top of each
+        other. Shots that already have their strip (same file and start) are
+        skipped, so importing again only adds the new shots.
+        """
+        shots = []
+        for shot in asShots(shotCollection):
+            if shot.filePath and shot.start is not None:
+                shots.append(shot)
+            else:
+                print(f"[WARNING] Skipped shot: {shot.name}")
+
+        channels = _ChannelMap(MAX_CHANNELS)
+        existing = set()
+        for strip in self.strips:
+            channels.add(strip.channel, strip.frame_final_start, strip.frame_final_end)
+            filePath = self._filePath(strip)
+            if filePath:
+                existing.add(f"{strip.frame_final_start}:{pathKey(filePath)}")
+
+        strips = self.strips
+        skipped = 0
+        # In start order every strip is trimmed before a later one is added
+        for shot in sorted(shots, key=lambda shot: shot.start):
+            start = shot.start
+            if f"{start}:{pathKey(self.bpy.path.abspath(shot.filePath))}" in existing:
+                skipped += 1
+                continue
+            duration = _shotDuration(shot)
+            channel = channels.freeChannel(start, start + (duration or 1))
+            if channel is None:
+                print(f"[WARNING] No free channel for shot: {shot.name}")
+                continue
+            strip = strips.new_movie(
+                name=shot.name,
+                filepath=shot.filePath,
+                channel=channel,
+                frame_start=start,
+            )
+            if duration:
+                strip.frame_final_duration = duration
+            else:
+                # The shot has no range, the strip keeps the file's length
+                channel = channels.freeChannel(start, strip.frame_final_end)
+                if channel is None:
+                    print(f"[WARNING] No free channel for shot: {shot.name}")
+                    strips.remove(strip)
+                    continue
+            if strip.channel != channel:
+                strip.channel = channel
+            channels.add(channel, start, strip.frame_final_end)
+
+        if skipped:
+            print(f"[INFO] Skipped {skipped} shot(s) already in the sequencer")
+
+    def readTimelineSources(self) -> dict[str, Any]:
+        """Groups the strips by file, like DavinciHandle groups clips by MediaPoolItem."""
+        sources: dict[str, dict[str, Any]] = {}
+        clipCount = 0
+        for clip in self.getTimelineInfo():
+            clipCount += 1
+            if not clip.filePath:
+                continue
+            source = sources.get(clip.sourceId)
+            if source is None:
+                source = sources[clip.sourceId] = {
+                    "strips": [],
+                    "sourceId": clip.sourceId,
+                    "mediaName": clip.mediaName,
+                    "filePath": clip.filePath,
+                    "clipCount": 0,
+                }
+            source["strips"].append(clip.mediaPoolItem)
+            source["clipCount"] += 1
+
+        return {"clipCount": clipCount, "sources": list(sources.values())}
+
+    def _replaceSource(self, change: dict[str, Any]) -> bool:
+        return all([self._replaceFilePath(strip, change["newPath"]) for strip in change["strips"]])
+
+    def _filePath(self, strip) -> Optional[str]:
+        if strip.type == "MOVIE":
+            filePath = strip.filepath
+        elif strip.type == "SOUND":
+            filePath = strip.sound.filepath if strip.sound else ""
+        elif strip.type == "IMAGE" and len(strip.elements):
+            filePath = os.path.join(strip.directory, strip.elements[0].filename)
+        else:
+            return None
+        return self.bpy.path.abspath(filePath) if filePath else None
+
+    @staticmethod
+    def _replaceFilePath(strip, filePath: str) -> bool:
+        start, duration = strip.frame_final_start, strip.frame_final_duration
+        if strip.type == "MOVIE":
+            strip.filepath = filePath
+        elif strip.type == "SOUND":
+            strip.sound.filepath = filePath
+        elif strip.type == "IMAGE" and len(strip.elements) == 1:
+            strip.directory = os.path.dirname(filePath) + os.sep
+            strip.elements[0].filename = os.path.basename(filePath)
+        else:
+            return False
+        # The new file can have another length, the strip keeps its range in the edit
+        if strip.frame_final_start != start:
+            strip.frame_start += start - strip.frame_final_start
+        if strip.frame_final_duration != duration:
+            strip.frame_final_duration = duration
+        return True
+
+
+class _ChannelMap:
+    """The occupied frame ranges [start, end) of every channel, as sorted disjoint ranges."""
+
+    def __init__(self, channelCount: int):
+        self.channelCount = channelCount
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+
+    def isFree(self, channel: int, start: int, end: int) -> bool:
+        starts = self._starts.get(channel)
+        if not starts:
+            return True
+        i = bisect.bisect_left(starts, end)
+        return i == 0 or self._ends[channel][i - 1] <= start
+
+    def freeChannel(self, start: int, end: int) -> Optional[int]:
+        for channel in range(1, self.channelCount + 1):
+            if self.isFree(channel, start, end):
+                return channel
+        return None
+
+    def add(self, channel: int, start: int, end: int):
+        starts = self._starts.setdefault(channel, [])
+        ends = self._ends.setdefault(channel, [])
+        i = bisect.bisect_left(starts, start)
+        # Existing strips may overlap each other, ranges touching the new one are merged
+        if i > 0 and ends[i - 1] >= start:
+            i -= 1
+            start = starts[i]
+        j = i
+        while j < len(starts) and starts[j] <= end:
+            end = max(end, ends[j])
+            j += 1
+        starts[i:j] = [start]
+        ends[i:j] = [end]
+
+
+def _shotDuration(shot: Shot) -> Optional[int]:
+    if shot.duration:
+        return shot.duration
+    if shot.end is not None:
+        return shot.end - shot.start + 1
+    return None
@@ -1,15 +1,32 @@
 import copy
+import queue
+import threading
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
 
-from DaVinciPipe.PipelineInterfaces import AbstractPipelineInterface
+from DaVinciPipe import Timecode
+from DaVinciPipe.AbstractEditingSoftware import AbstractEditingSoftwareHandle
+from DaVinciPipe.MediaPoolIndex import MediaPoolIndex
+from DaVinciPipe.NamingTemplates import NamingScheme
+from DaVinciPipe.pathKey import pathKey
+from DaVinciPipe.Progress import ProgressCallback
+from DaVinciPipe.ProxyFinder import ProxyFinder
+from DaVinciPipe.PublishWatcher import PublishWatcher
+from DaVinciPipe.ShotRecords import Clip, Shot, asShots
+from DaVinciPipe.storage.ImportJournalStore import ImportJournalStore
 
+if TYPE_CHECKING:
+    from DaVinciPipe.PipelineInterfaces import AbstractPipelineInterface
 
-class DavinciHandle:
-    def __init__(self, pipe: AbstractPipelineInterface, resolve, config: dict) -> None:
+# Clip fields the version update needs
+TIMELINE_SOURCE_FIELDS = ("sourceMediaPoolItem", "sourceId", "mediaName", "filePath", "proxyPath")
+# Name of the timeline an import creates when the project has none, like AppendToTimeline does
+NEW_TIMELINE_NAME = "Timeline 1"
 
-        self._pipe = pipe
-        self._config = config
+
+class DavinciHandle(AbstractEditingSoftwareHandle):
+    def __init__(self, pipe: "AbstractPipelineInterface", resolve, config: dict) -> None:
+        super().__init__(pipe, config)
 
         # Resolve Objects:
         self._resolve = resolve
@@ -21,10 +38,19 @@ class DavinciHandle:
         self._timeline = None
 
         self._fps = None
+        self._frameRate = None
         self._shotCollection = None
+        self._importJournal: Optional[ImportJournalStore] = None
+        self._mediaPoolIndex = MediaPoolIndex()
+        self._proxyFinder: Optional[ProxyFinder] = None
+
+        # Publish watcher:
+        self._publishWatcher: Optional[PublishWatcher] = None
+        self._watchedSources: dict[str, list[dict[str, Any]]] = {}
+        self._changedFolders: "queue.Queue[set[str]]" = queue.Queue()
 
     @property
-    def pipe(self) -> AbstractPipelineInterface:
+    def pipe(self) -> "AbstractPipelineInterface":
         return self._pipe
 
     @property
@@ -80,95 +106,630 @@ class DavinciHandle:
         return self._fps
 
     @property
-    def shotCollection(self) -> list[dict[str, Any]] :
+    def frameRate(self) -> Timecode.FrameRate:
+        if self._frameRate is None:
+            rate = Timecode.FrameRate.parse(self.fps, dropFrame=False)
+            # Resolve keeps the flag set when the rate changes to one without drop-frame timecode
+            if str(self.project.GetSetting("timelineDropFrameTimecode")) == "1" and rate.canDropFrame:
+                rate = Timecode.FrameRate(rate.fps, dropFrame=True)
+            self._frameRate = rate
+        return self._frameRate
+
+    @property
+    def shotCollection(self) -> list[Shot]:
         if self._shotCollection is None:
             self._shotCollection = self.pipe.getShotInformations()
         return self._shotCollection
 
-    def getTimelineInfo(self) -> list[dict[str, Any]]:
-        clipsCollection = []
-        for trackType in ("video", "audio"):
-            for t in range(1, (self.timeline.GetTrackCount(trackType) or 0) + 1):
-                for item in (self.timeline.GetItemListInTrack(trackType, t) or []):
-                    mediaPool = item.GetMediaPoolItem()
-                    clipsCollection.append({
-                        "mediaPoolItem": item,
-                        "name": item.GetName(),
-                        "trackType": trackType,
-                        "trackIndex": t,
-                        "start": item.GetStart(),
-                        "end": item.GetEnd() - 1,
-                        "duration": item.GetDuration(),
-                        "mediaName": mediaPool.GetName() if mediaPool else None,
-                        "filePath": (mediaPool.GetClipProperty("File Path") if mediaPool else None),
-                    })
-
-        return clipsCollection
-
-    def importShotCollection(self):
+    def fetchShotCollection(self, progressCallback: Optional[ProgressCallback] = None,
+                            cancelEvent: Optional[threading.Event] = None) -> list[Shot]:
+        """Fetches the shots from the pipeline. Makes no Resolve calls, so it can run in a worker."""
+        self._shotCollection = self.pipe.getShotInformations(progressCallback, cancelEvent)
+        return self._shotCollection
 
-        clipInfos = []
-        for shot in self.shotCollection:
-            if shot.get("filePath"):
-                item = self._importShotViaFilePath(shot)
-                if item is not None:
-                    import pydevd_pycharm
-                    pydevd_pycharm.settrace('localhost', port=5678, stdout_to_server=True, stderr_to_server=True)
-                    recordFrame = self._startFrame() + shot["start"]
-                    clipInfo = {
-                        "mediaPoolItem": item,
-                        "trackIndex": 1,
-                        "recordFrame": recordFrame,
-                    }
-                    clipInfos.append(clipInfo)
+    def getTimelineInfo(self) -> list[Clip]:
+        return list(self.iterTimelineItems())
+
+    def iterTimelineItems(self, trackTypes: Iterable[str] = ("video", "audio"),
+                          trackIndices: Optional[Iterable[int]] = None,
+                          fields: Optional[Iterable[str]] = None, timeline=None) -> Iterator[Clip]:
+        """
+        Yields the timeline items track by track, of the given timeline or
+        the handle's timeline. Only the requested fields are read from
+        Resolve, the others stay None. MediaPoolItem properties are read once
+        per source (by unique id), so items sharing a source cost one
+        GetMediaPoolItem and one GetUniqueId call each.
+        """
+        if timeline is None:
+            timeline = self.timeline
+        fields = set(Clip.__slots__ if fields is None else fields)
+        needsSource = bool(fields & {"sourceMediaPoolItem", "sourceId", "mediaName", "filePath", "proxyPath"})
+        needsProperties = bool(fields & {"mediaName", "filePath", "proxyPath"})
+        sourceProperties: dict[str, dict[str, Any]] = {}
+
+        for trackType in trackTypes:
+            trackCount = timeline.GetTrackCount(trackType) or 0
+            if trackIndices is None:
+                indices = range(1, trackCount + 1)
+            else:
+                indices = [t for t in trackIndices if 1 <= t <= trackCount]
+
+            for t in indices:
+                for item in (timeline.GetItemListInTrack(trackType, t) or []):
+                    clip = Clip(mediaPoolItem=item, trackType=trackType, trackIndex=t)
+                    if "name" in fields:
+                        clip.name = item.GetName()
+                    if "start" in fields:
+                        clip.start = item.GetStart()
+                    if "end" in fields:
+                        clip.end = item.GetEnd() - 1
+                    if "duration" in fields:
+                        clip.duration = item.GetDuration()
+
+                    mediaPool = item.GetMediaPoolItem() if needsSource else None
+                    if mediaPool:
+                        clip.sourceMediaPoolItem = mediaPool
+                        clip.sourceId = mediaPool.GetUniqueId()
+                        if needsProperties:
+                            properties = sourceProperties.get(clip.sourceId)
+                            if properties is None:
+                                properties = sourceProperties[clip.sourceId] = mediaPool.GetClipProperty() or {}
+                            clip.mediaName = properties.get("Clip Name")
+                            clip.filePath = properties.get("File Path")
+                            clip.proxyPath = properties.get("Proxy Media Path") or None
+
+                    yield clip
+
+    def readTimelineSources(self, timeline=None) -> dict[str, Any]:
+        """Streams the timeline with only the fields the version update needs."""
+        return self.collectTimelineSources(self.iterTimelineItems(fields=TIMELINE_SOURCE_FIELDS, timeline=timeline))
+
+    def listTimelines(self, timelineNames: Optional[Iterable[str]] = None) -> list:
+        """The project's timelines, or only the named ones in the given order."""
+        timelines = [self.project.GetTimelineByIndex(i) for i in range(1, (self.project.GetTimelineCount() or 0) + 1)]
+        if timelineNames is None:
+            return [timeline for timeline in timelines if timeline]
+        byName = {timeline.GetName(): timeline for timeline in timelines if timeline}
+        selected = []
+        for name in timelineNames:
+            if name in byName:
+                selected.append(byName[name])
+            else:
+                print(f"[WARNING] Timeline not found: {name}")
+        return selected
+
+    def readTimelinesSources(self, timelineNames: Optional[Iterable[str]] = None) -> dict[str, Any]:
+        """
+        Reads the sources of several timelines of the current project (all
+        of them by default) and merges them. A MediaPoolItem used in more
+        than one timeline becomes one source, since replacing it updates
+        every timeline. Each source lists the timelines using it.
+        """
+        sources: dict[str, dict[str, Any]] = {}
+        timelines: dict[str, dict[str, Any]] = {}
+        for timeline in self.listTimelines(timelineNames):
+            name = timeline.GetName()
+            timelineSources = self.readTimelineSources(timeline)
+            timelines[name] = {"clipCount": timelineSources["clipCount"]}
+            for source in timelineSources["sources"]:
+                merged = sources.get(source["sourceId"])
+                if merged is None:
+                    merged = sources[source["sourceId"]] = {**source, "clipCount": 0, "timelines": []}
+                merged["clipCount"] += source["clipCount"]
+                merged["timelines"].append(name)
+
+        return {
+            "clipCount": sum(timeline["clipCount"] for timeline in timelines.values()),
+            "sources": list(sources.values()),
+            "timelines": timelines,
+        }
 
+    def importShotCollection(self, shotCollection: Optional[list[Shot]] = None):
+        if shotCollection is None:
+            shotCollection = self.shotCollection
+
+        shots = []
+        for shot in asShots(shotCollection):
+            if shot.filePath:
+                shots.append(shot)
             else:
-                print(f"[WARNING] Skipped shot: {shot['name']}")
+                print(f"[WARNING] Skipped shot: {shot.name}")
+
+        # A build that crashed halfway is resumed from its journal
+        plannedPaths = list(dict.fromkeys(str(shot.filePath) for shot in shots))
+        # AppendToTimeline targets the current timeline. It is created up front
+        # when there is none, so a rerun after a crash finds the journal again
+        currentTimeline = self._currentOrNewTimeline()
+        journalKey = f"{self.project.GetName()}_{currentTimeline.GetName()}"
+        pending = self.importJournal.loadPending(journalKey)
+        resume = pending is not None and pending["paths"] == plannedPaths
+        if pending is not None and not resume:
+            print("[WARNING] Discarding the journal of an unfinished build with other shots")
+        self.importJournal.begin(journalKey, plannedPaths, resume=resume)
+        # Files already in the pool are reused, including those of the crashed build
+        if resume:
+            self._mediaPoolIndex.expect(pending["imported"])
+        self._mediaPoolIndex.refresh(self.mediaPool.GetRootFolder())
+        try:
+            self._importAndAppend(shots, plannedPaths, pending if resume else None)
+        finally:
+            # After an error the journal stays, the next run resumes from it
+            self.importJournal.close()
+
+    def _currentOrNewTimeline(self):
+        timeline = self.project.GetCurrentTimeline()
+        if timeline is not None:
+            return timeline
+        timeline = self.mediaPool.CreateEmptyTimeline(NEW_TIMELINE_NAME)
+        if timeline is None:
+            raise RuntimeError(f"Could not create the timeline {NEW_TIMELINE_NAME!r}.")
+        self.project.SetCurrentTimeline(timeline)
+        return timeline
+
+    def _importAndAppend(self, shots: list[Shot], plannedPaths: list[str],
+                         pending: Optional[dict[str, Any]]):
+        itemsByPath = {}
+        for path in plannedPaths:
+            item = self._mediaPoolIndex.get(path)
+            if item is not None:
+                itemsByPath[pathKey(path)] = item
+        appended = set()
+        if pending is not None:
+            appended = pending["appended"]
+            print(f"[INFO] Resuming import: {len(pending['imported'])} file(s) "
+                  f"and {len(appended)} clip(s) done before")
+        newPaths = [path for path in plannedPaths if pathKey(path) not in itemsByPath]
+        if len(newPaths) < len(plannedPaths):
+            print(f"[INFO] Reusing {len(plannedPaths) - len(newPaths)} file(s) already in the media pool")
+        itemsByPath.update(self._importFilePaths(newPaths, self.importJournal))
+
+        clipInfos = []
+        clipKeys = []
+        startFrame = self._startFrame()
+        for shot in shots:
+            fileKey = pathKey(shot.filePath)
+            item = itemsByPath.get(fileKey)
+            if item is None:
+                print(f"[WARNING] Could not import shot: {shot.name}")
+                continue
+            clipKey = f"{startFrame + shot.start}:{fileKey}"
+            if clipKey in appended:
+                continue
+            clipInfo = {
+                "mediaPoolItem": item,
+                "trackIndex": 1,
+                "recordFrame": startFrame + shot.start,
+            }
+            clipInfos.append(clipInfo)
+            clipKeys.append(clipKey)
+
+        # Appending twice would duplicate clips, so every chunk is committed
+        chunkSize = self._importChunkSize()
+        for i in range(0, len(clipInfos), chunkSize):
+            self.mediaPool.AppendToTimeline(clipInfos[i:i + chunkSize])
+            self.importJournal.record("appended", clipKeys[i:i + chunkSize])
+            self.importJournal.commit()
+        self.importJournal.finish()
+
+    @property
+    def importJournal(self) -> ImportJournalStore:
+        if self._importJournal is None:
+            self._importJournal = ImportJournalStore()
+        return self._importJournal
 
-        self.mediaPool.AppendToTimeline(clipInfos)
+    def _importChunkSize(self) -> int:
+        return max(1, int(self._config.get("resolve", {}).get("importChunkSize", 500)))
+
+    def _importFilePaths(self, filePaths: list[str], journal: Optional[ImportJournalStore] = None) -> dict[str, Any]:
+        """
+        Imports the files in chunks and maps the returned MediaPoolItems back
+        to their file path. Every file is imported once, even if several
+        shots use it. When Resolve returned one item per file, the order is
+        trusted after spot-checking the first and last item, otherwise every
+        item is matched by its "File Path". Every imported chunk is
+        committed to the journal.
+        """
+        chunkSize = self._importChunkSize()
+        uniquePaths = list(dict.fromkeys(filePaths))
+        itemsByPath = {}
+
+        for i in range(0, len(uniquePaths), chunkSize):
+            chunk = uniquePaths[i:i + chunkSize]
+            addedItems = self.mediaStorage.AddItemListToMediaPool(chunk) or []
+            if journal is not None:
+                journal.record("imported", chunk)
+                journal.commit()
+            if len(addedItems) == len(chunk) and self._matchesPath(addedItems[0], chunk[0]) \
+                    and self._matchesPath(addedItems[-1], chunk[-1]):
+                for path, item in zip(chunk, addedItems):
+                    itemsByPath[pathKey(path)] = item
+                    self._mediaPoolIndex.add(path, item)
+                continue
+            for item in addedItems:
+                itemPath = item.GetClipProperty("File Path")
+                if itemPath:
+                    itemsByPath[pathKey(itemPath)] = item
+                    self._mediaPoolIndex.add(itemPath, item)
+
+        return itemsByPath
+
+    @staticmethod
+    def _matchesPath(item, filePath: str) -> bool:
+        return pathKey(item.GetClipProperty("File Path")) == pathKey(filePath)
 
     def _startFrame(self):
         """Davinci starts frame count at 1 hour"""
-        return self.fps * 3600
+        return Timecode.oneHourFrames(self.frameRate)
 
     def _importShotViaFilePath(self, shot: dict[str, Any]) -> Optional[any]:
         filePath: Path = shot.get("filePath")
         if filePath is None:
             return None
+        item = self._mediaPoolIndex.get(filePath)
+        if item is not None:
+            return item
         addedItems = self.mediaStorage.AddItemListToMediaPool([str(filePath)])
         if addedItems:
+            self._mediaPoolIndex.add(filePath, addedItems[0])
             return addedItems[0]
         return None
 
-    def updateTimeline(self):
-        clipsCollection = self.getTimelineInfo()
+    def collectTimelineSources(self, clipsCollection: Iterable[Clip]) -> dict[str, Any]:
+        """
+        Groups the timeline clips by their MediaPoolItem. Clips sharing a
+        MediaPoolItem (audio/video of one file, repeated uses of a shot)
+        become one source.
+        """
+        sources: dict[str, dict[str, Any]] = {}
+        clipCount = 0
         for clipInfo in clipsCollection:
-            isNewer, newPath = self._checkForNewerVersion(clipInfo["filePath"])
-            if isNewer:
-                clipInfo["mediaPoolItem"].GetMediaPoolItem().ReplaceClip(newPath)
+            clipCount += 1
+            sourceItem = clipInfo.sourceMediaPoolItem
+            if sourceItem is None or not clipInfo.filePath:
+                continue
+            sourceId = clipInfo.sourceId or sourceItem.GetUniqueId()
+            source = sources.get(sourceId)
+            if source is None:
+                source = sources[sourceId] = {
+                    "item": sourceItem,
+                    "sourceId": sourceId,
+                    "mediaName": clipInfo.mediaName,
+                    "filePath": clipInfo.filePath,
+                    "proxyPath": clipInfo.proxyPath,
+                    "clipCount": 0,
+                }
+            source["clipCount"] += 1
+
+        return {"clipCount": clipCount, "sources": list(sources.values())}
+
+    def _replaceSource(self, change: dict[str, Any]) -> bool:
+        if not change["item"].ReplaceClip(change["newPath"]):
+            return False
+        self._mediaPoolIndex.move(change["filePath"], change["newPath"], change["item"])
+        return True
+
+    @property
+    def proxyFinder(self) -> ProxyFinder:
+        if self._proxyFinder is None:
+            self._proxyFinder = ProxyFinder.fromConfig(self._config.get("proxies"), self._config.get("versionScan"))
+        return self._proxyFinder
+
+    def updateProxies(self) -> dict[str, Any]:
+        timelineSources = self.readTimelineSources()
+        plan = self.planProxyLinks(timelineSources)
+        return self.applyProxyLinks(plan)
+
+    def planProxyLinks(self, timelineSources: dict[str, Any],
+                       progressCallback: Optional[ProgressCallback] = None,
+                       cancelEvent: Optional[threading.Event] = None) -> dict[str, Any]:
+        """
+        Finds the proxy of every source, listing each proxy folder once, and
+        keeps only the sources whose linked proxy has to change. A proxy
+        following the proxy templates that has no match anymore (e.g. after
+        a version update) is unlinked. Makes no Resolve calls, so it can run
+        in a worker.
+        """
+        sources = timelineSources["sources"]
+        finder = self.proxyFinder
+        proxies, scanReport = finder.findProxies(
+            (source["filePath"] for source in sources), progressCallback, cancelEvent
+        )
+        unlinkStale = self._config.get("proxies", {}).get("unlinkStale", True)
+
+        links = []
+        unlinks = []
+        missing = []
+        linkedCount = 0
+        for source in sources:
+            proxyPath = proxies.get(source["filePath"])
+            currentPath = source.get("proxyPath")
+            if proxyPath is None:
+                missing.append(source["filePath"])
+                if unlinkStale and currentPath and finder.scanner.namingScheme.matches(Path(currentPath).name):
+                    unlinks.append(source)
+            elif currentPath and pathKey(currentPath) == pathKey(proxyPath):
+                linkedCount += 1
+            else:
+                links.append({**source, "newProxyPath": str(proxyPath)})
+
+        return {
+            "clipCount": timelineSources["clipCount"],
+            "sourceCount": len(sources),
+            "links": links,
+            "unlinks": unlinks,
+            "missing": missing,
+            "linkedCount": linkedCount,
+            "scanReport": scanReport,
+        }
+
+    def applyProxyLinks(self, plan: dict[str, Any]) -> dict[str, Any]:
+        """
+        Links the planned proxies, one LinkProxyMedia call per changed
+        source, and reports the share of sources that have a proxy.
+        """
+        linked = []
+        unlinked = []
+        failed = []
+        for link in plan["links"]:
+            entry = {"mediaName": link["mediaName"], "filePath": link["filePath"], "proxyPath": link["newProxyPath"]}
+            if link["item"].LinkProxyMedia(link["newProxyPath"]):
+                linked.append(entry)
+            else:
+                print(f"[WARNING] Could not link proxy {link['newProxyPath']} to {link['filePath']}")
+                failed.append(entry)
+        for source in plan["unlinks"]:
+            entry = {"mediaName": source["mediaName"], "filePath": source["filePath"], "proxyPath": source["proxyPath"]}
+            if source["item"].UnlinkProxyMedia():
+                unlinked.append(entry)
+            else:
+                print(f"[WARNING] Could not unlink stale proxy {source['proxyPath']} from {source['filePath']}")
+                failed.append(entry)
+
+        withProxy = plan["linkedCount"] + len(linked)
+        return {
+            "clipCount": plan["clipCount"],
+            "sourceCount": plan["sourceCount"],
+            "linked": linked,
+            "unlinked": unlinked,
+            "failed": failed,
+            "unchanged": plan["linkedCount"],
+            "missing": plan["missing"],
+            "coverage": withProxy / plan["sourceCount"] if plan["sourceCount"] else 1.0,
+        }
+
+    def startPublishWatcher(self) -> int:
+        """
+        Watches the publish folders of the current timeline sources. Changed
+        folders are queued by the watcher thread and taken on the main
+        thread by takePublishedSources (or applyPublishedVersions). Returns
+        the watched folder count.
+        """
+        self.stopPublishWatcher()
+        watchedSources: dict[str, list[dict[str, Any]]] = {}
+        for source in self.readTimelineSources()["sources"]:
+            watchedSources.setdefault(str(Path(source["filePath"]).parent), []).append(source)
+        self._watchedSources = watchedSources
+
+        self._publishWatcher = PublishWatcher.fromConfig(
+            watchedSources.keys(), self._changedFolders.put, self._config.get("publishWatcher"),
+            NamingScheme.fromConfig(self._config.get("versionScan", {}).get("namingTemplates")),
+        )
+        self._publishWatcher.start()
+        return self._publishWatcher.folderCount
+
+    def stopPublishWatcher(self):
+        if self._publishWatcher is not None:
+            self._publishWatcher.stop()
+            self._publishWatcher = None
+        self._watchedSources = {}
+        while not self._changedFolders.empty():
+            self._changedFolders.get_nowait()
+
+    @property
+    def isWatchingPublishes(self) -> bool:
+        return self._publishWatcher is not None
+
+    def applyPublishedVersions(self) -> Optional[dict[str, Any]]:
+        """
+        Drains the folders queued by the publish watcher and replaces only
+        the sources in those folders. Must run on the main thread; returns
+        None when nothing was queued.
+        """
+        publishedSources = self.takePublishedSources()
+        if publishedSources is None:
+            return None
+        return self.applyPublishedUpdate(publishedSources, self.planTimelineUpdate(publishedSources))
+
+    def takePublishedSources(self) -> Optional[dict[str, Any]]:
+        """
+        Drains the folders queued by the publish watcher and returns their
+        watched sources, shaped like readTimelineSources, for
+        planTimelineUpdate. Must run on the main thread; returns None when
+        nothing was queued.
+        """
+        folders = set()
+        while not self._changedFolders.empty():
+            folders |= self._changedFolders.get_nowait()
+        if not folders:
+            return None
+
+        sources = [source for folder in folders for source in self._watchedSources.get(folder, [])]
+        return {"clipCount": sum(source["clipCount"] for source in sources), "sources": sources}
+
+    def applyPublishedUpdate(self, publishedSources: dict[str, Any], plan: dict[str, Any]) -> dict[str, Any]:
+        """applyTimelineUpdate for the sources of takePublishedSources."""
+        report = self.applyTimelineUpdate(plan)
+
+        # Later events compare against the version that is now in the timeline
+        replacedPaths = {entry["oldPath"]: entry["newPath"] for entry in report["replaced"]}
+        for source in publishedSources["sources"]:
+            if source["filePath"] in replacedPaths:
+                source["filePath"] = replacedPaths[source["filePath"]]
+        return report
+
+    def updateTimelines(self, timelineNames: Optional[Iterable[str]] = None,
+                        knownVersions: Optional[dict[str, Optional[Path]]] = None) -> dict[str, Any]:
+        """Updates several timelines of the current project (all by default) in one pass."""
+        timelineSources = self.readTimelinesSources(timelineNames)
+        plan = self.planTimelineUpdate(timelineSources, knownVersions=knownVersions)
+        return self.applyTimelinesUpdate(timelineSources, plan)
+
+    def applyTimelinesUpdate(self, timelineSources: dict[str, Any], plan: dict[str, Any]) -> dict[str, Any]:
+        """applyTimelineUpdate, plus what the update changed in each timeline."""
+        report = self.applyTimelineUpdate(plan)
+        replacedPaths = {entry["oldPath"] for entry in report["replaced"]}
+        failedPaths = {entry["oldPath"] for entry in report["failed"]}
+        unresolvedPaths = set(report["unresolved"])
+
+        timelines = {
+            name: {"clipCount": timeline["clipCount"], "sourceCount": 0, "replaced": 0, "failed": 0, "unresolved": 0}
+            for name, timeline in timelineSources["timelines"].items()
+        }
+        for source in timelineSources["sources"]:
+            for name in source["timelines"]:
+                timeline = timelines[name]
+                timeline["sourceCount"] += 1
+                if source["filePath"] in replacedPaths:
+                    timeline["replaced"] += 1
+                elif source["filePath"] in failedPaths:
+                    timeline["failed"] += 1
+                elif source["filePath"] in unresolvedPaths:
+                    timeline["unresolved"] += 1
+        report["timelines"] = timelines
+        return report
+
+    def updateProjects(self, projectNames: Iterable[str],
+                       timelineNames: Optional[Iterable[str]] = None) -> dict[str, Any]:
+        """
+        Updates the timelines of several projects, loading one project after
+        the other. Versions are resolved once for all projects, each project
+        is saved after its update and the starting project is loaded again.
+        Returns one report with a section per project.
+        """
+        self.stopPublishWatcher()
+        startProject = self.project.GetName()
+        knownVersions: dict[str, Optional[Path]] = {}
+        projects = []
+        missingProjects = []
+        self.projectManager.SaveProject()
+        try:
+            for projectName in projectNames:
+                if not self.loadProject(projectName):
+                    print(f"[WARNING] Could not load project: {projectName}")
+                    missingProjects.append(projectName)
+                    continue
+                report = self.updateTimelines(timelineNames, knownVersions)
+                self.projectManager.SaveProject()
+                projects.append({"project": projectName, **report})
+        finally:
+            self.loadProject(startProject)
+
+        return {
+            "projects": projects,
+            "missingProjects": missingProjects,
+            "clipCount": sum(project["clipCount"] for project in projects),
+            "sourceCount": sum(project["sourceCount"] for project in projects),
+            "directoryCount": len({str(Path(filePath).parent) for filePath in knownVersions}),
+            "replaced": sum(len(project["replaced"]) for project in projects),
+            "failed": sum(len(project["failed"]) for project in projects),
+            "unresolved": sum(len(project["unresolved"]) for project in projects),
+        }
+
+    def loadProject(self, projectName: str) -> bool:
+        """Makes the named project current and drops the objects cached for the previous one."""
+        if self._project is not None and self._project.GetName() == projectName:
+            return True
+        project = self.projectManager.LoadProject(projectName)
+        if not project:
+            return False
+        self._project = project
+        self._mediaPoolIndex.clear()
+        self._mediaPool = None
+        self._timeline = None
+        self._fps = None
+        self._frameRate = None
+        return True
 
     def updateClip(self, shot) -> bool:
         return self._pipe.updateShot(shot)
 
+    def diffTimelineShots(self, shotCollection: Optional[list[Shot]] = None) -> list[dict[str, Any]]:
+        """
+        Compares the video clips of the timeline with the fetched shots and
+        returns the shots whose frame range changed in the edit, with only
+        the changed fields of start, end and duration and their fetched
+        values under "previous". The range is the clip's trimmed range on the
+        timeline, not the length of its source. A clip belongs to the shot
+        with the same file, or else to the only shot publishing into the
+        clip's folder; the first clip of a shot on the timeline counts.
+        """
+        if shotCollection is None:
+            shotCollection = self.shotCollection
+        shotsByPath = {}
+        shotsByFolder: dict[str, list[Shot]] = {}
+        for shot in asShots(shotCollection):
+            if shot.id and shot.filePath:
+                shotsByPath[pathKey(shot.filePath)] = shot
+                shotsByFolder.setdefault(pathKey(Path(shot.filePath).parent), []).append(shot)
+
+        startFrame = self._startFrame()
+        # GetStart and GetDuration of a timeline item are its record in and trimmed length
+        clips = self.iterTimelineItems(trackTypes=("video",), fields=("start", "duration", "filePath"))
+        edits = {}
+        for clip in sorted(clips, key=lambda clip: clip.start):
+            if not clip.filePath:
+                continue
+            shot = shotsByPath.get(pathKey(clip.filePath))
+            if shot is None:
+                folderShots = shotsByFolder.get(pathKey(Path(clip.filePath).parent), [])
+                shot = folderShots[0] if len(folderShots) == 1 else None
+            if shot is None or shot.id in edits:
+                continue
+            start = clip.start - startFrame
+            edited = {"start": start, "end": start + clip.duration - 1, "duration": clip.duration}
+            changed = {key: value for key, value in edited.items() if getattr(shot, key) != value}
+            edits[shot.id] = {
+                "id": shot.id,
+                "name": shot.name,
+                **changed,
+                "previous": {key: getattr(shot, key) for key in changed},
+            }
+        return [edit for edit in edits.values() if edit["previous"]]
+
+    def pushShotEdits(self, edits: list[dict[str, Any]], dryRun: bool = False,
+                      progressCallback: Optional[ProgressCallback] = None,
+                      cancelEvent: Optional[threading.Event] = None) -> dict[str, Any]:
+        """
+        Writes the edits of diffTimelineShots to the pipeline and updates the
+        fetched shots to match. Makes no Resolve calls, so it can run in a worker.
+        """
+        report = self.pipe.updateAllShots(edits, dryRun, progressCallback, cancelEvent)
+        if not dryRun and self._shotCollection is not None:
+            editsById = {edit["id"]: edit for edit in edits}
+            updatedIds = set(report["updated"])
+            for shot in self._shotCollection:
+                if shot.get("id") in updatedIds:
+                    for key in ("start", "end", "duration"):
+                        if key in editsById[shot["id"]]:
+                            shot[key] = editsById[shot["id"]][key]
+        return report
+
     def _frameToTimeCode(self, frame, fps=None, oneHourOffsetAlreadyAdded=True) -> str:
-        if fps is None:
-            fps = self._fps
-
-        f = int(frame)
-        h = f // int(fps * 3600)
-        f %= int(fps * 3600)
-        m = f // int(fps * 60)
-        f %= int(fps * 60)
-        s = f // int(fps)
-        f %= int(fps)
-        if not oneHourOffsetAlreadyAdded:
-            h += 1  # Resolve starts at 1 hour
-        return f"{h:02d}:{m:02d}:{s:02d}:{f:02d}"
-
-    def _checkForNewerVersion(self, filePath: str) -> tuple[bool, str]:
-        oldPath: Path = Path(filePath)
-        newPath: Path = self.pipe.getNewestVersion(filePath)
-        isNewer = True
-        if newPath == oldPath:
-            isNewer = False
-        return isNewer, str(newPath)
+        rate = self.frameRate if fps is None else Timecode.FrameRate.parse(fps)
+        return Timecode.frameToTimecode(frame, rate, addOneHour=not oneHourOffsetAlreadyAdded)
+
+    def getTimecodeReport(self) -> list[dict[str, Any]]:
+        """Record in/out timecodes of every timeline item, converted in bulk."""
+        clips = list(self.iterTimelineItems(fields=("name", "start", "end", "mediaName", "filePath")))
+        recordIn = Timecode.framesToTimecodes([clip.start for clip in clips], self.frameRate)
+        # end is inclusive, EDL style record out is exclusive
+        recordOut = Timecode.framesToTimecodes([clip.end + 1 for clip in clips], self.frameRate)
+        return [{
+            "name": clip.name,
+            "trackType": clip.trackType,
+            "trackIndex": clip.trackIndex,
+            "recordIn": tcIn,
+            "recordOut": tcOut,
+            "mediaName": clip.mediaName,
+            "filePath": clip.filePath,
+        } for clip, tcIn, tcOut in zip(clips, recordIn, recordOut)]
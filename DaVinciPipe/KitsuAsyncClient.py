@@ -0,0 +1,181 @@
+import asyncio
+import random
+import threading
+from typing import Any, Awaitable, Iterable, Optional
+
+from DaVinciPipe.lazyImport import lazyImport
+
+gazu = lazyImport("gazu")
+
+# Only loaded once a client is used, importing aiohttp takes a few hundred ms
+try:
+    aiohttp = lazyImport("aiohttp")
+except ModuleNotFoundError:
+    aiohttp = None
+
+# A request and its query parameters (GET) or JSON body (PUT)
+Request = tuple[str, Optional[dict[str, Any]]]
+# Body of a successful response that is not JSON
+_NOT_JSON = object()
+
+
+class AsyncKitsuClient:
+    """
+    Kitsu client on one pooled keep-alive aiohttp session. The event loop
+    runs in a background thread, so synchronous code can call get, getMany
+    and putMany, while the *Many calls keep up to maxConcurrency requests
+    in flight.
+    5xx responses, timeouts and dropped connections are retried with
+    jittered exponential backoff. Errors are raised as gazu exceptions, like
+    gazu.client.get does.
+    """
+
+    def __init__(self, apiUrl: str, accessToken: str, maxConcurrency: int = 8, timeout: float = 30.0,
+                 maxRetries: int = 3, backoffBase: float = 0.25, backoffMax: float = 8.0):
+        if aiohttp is None:
+            raise ImportError("AsyncKitsuClient needs aiohttp, install it into the vendor folder")
+        self.apiUrl = apiUrl.rstrip("/")
+        self.maxConcurrency = max(1, maxConcurrency)
+        self.timeout = timeout
+        self.maxRetries = maxRetries
+        self.backoffBase = backoffBase
+        self.backoffMax = backoffMax
+        self.requestCount = 0
+        self.retryCount = 0
+        self._accessToken = accessToken
+
+        # Session and semaphore belong to the loop, they are created on it
+        self._session = None
+        self._semaphore = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="KitsuAsyncClient", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def fromConfig(cls, apiUrl: str, accessToken: str, config: Optional[dict[str, Any]]) -> "AsyncKitsuClient":
+        config = config or {}
+        return cls(
+            apiUrl,
+            accessToken,
+            maxConcurrency=config.get("maxConcurrency", 8),
+            timeout=config.get("requestTimeout", 30.0),
+            maxRetries=config.get("maxRetries", 3),
+        )
+
+    def setAccessToken(self, accessToken: str):
+        """Used by requests sent from now on, e.g. after a token refresh."""
+        self._accessToken = accessToken
+
+    def run(self, coroutine: Awaitable) -> Any:
+        """Runs a coroutine on the client's loop and waits for the result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def get(self, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+        return self.run(self.getAsync(path, params))
+
+    def getMany(self, requests: Iterable[Request], missingOk: bool = False) -> list[Any]:
+        """
+        Runs all requests concurrently and returns the results in order.
+        With missingOk, a 404 gives None instead of raising.
+        """
+        return self.run(self._gather("GET", list(requests), missingOk))
+
+    def putMany(self, requests: Iterable[Request]) -> list[Any]:
+        """
+        Sends (path, body) PUTs concurrently. Returns the results in order,
+        a failed request gives its exception instead of a result.
+        """
+        return self.run(self._gather("PUT", list(requests), missingOk=False, returnExceptions=True))
+
+    async def getAsync(self, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+        return await self.requestAsync("GET", path, params)
+
+    async def requestAsync(self, method: str, path: str, data: Optional[dict[str, Any]] = None) -> Any:
+        """Sends one request; data is the query for GET and the JSON body otherwise."""
+        url = f"{self.apiUrl}/{path.lstrip('/')}"
+        if method == "GET":
+            options = {"params": {key: str(value) for key, value in (data or {}).items()}}
+        else:
+            options = {"json": data}
+        options["headers"] = {"Authorization": f"Bearer {self._accessToken}"}
+        session = self._getSession()
+        attempt = 0
+        while True:
+            try:
+                # The semaphore is not held during the backoff sleep
+                async with self._semaphore:
+                    self.requestCount += 1
+                    async with session.request(method, url, **options) as response:
+                        status = response.status
+                        payload = await _readJson(response) if status < 400 else None
+                if status < 500 and payload is not _NOT_JSON:
+                    _raiseForStatus(status, path)
+                    return payload
+                if payload is _NOT_JSON:
+                    # An HTML page from a proxy in front of Kitsu, retried like a server error
+                    error = gazu.exception.ServerErrorException(f"{status} on {path}: the response is not JSON")
+                else:
+                    error = gazu.exception.ServerErrorException(f"{status} on {path}")
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                error = e
+
+            if attempt >= self.maxRetries:
+                raise error
+            self.retryCount += 1
+            await asyncio.sleep(random.uniform(0, min(self.backoffMax, self.backoffBase * 2 ** attempt)))
+            attempt += 1
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        if self._session is not None:
+            self.run(self._session.close())
+            self._session = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _gather(self, method: str, requests: list[Request], missingOk: bool,
+                      returnExceptions: bool = False) -> list[Any]:
+        async def send(path: str, data: Optional[dict[str, Any]]) -> Any:
+            try:
+                return await self.requestAsync(method, path, data)
+            except gazu.exception.RouteNotFoundException:
+                if missingOk:
+                    return None
+                raise
+
+        return await asyncio.gather(*(send(path, data) for path, data in requests),
+                                    return_exceptions=returnExceptions)
+
+    def _getSession(self):
+        if self._session is None:
+            self._semaphore = asyncio.Semaphore(self.maxConcurrency)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.maxConcurrency, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+
+async def _readJson(response) -> Any:
+    """The JSON body, None for an empty one and _NOT_JSON if it can't be decoded."""
+    try:
+        return await response.json(content_type=None)
+    except ValueError:
+        return _NOT_JSON
+
+
+def _raiseForStatus(status: int, path: str):
+    if status < 400:
+        return
+    exceptions = {
+        400: gazu.exception.ParameterException,
+        401: gazu.exception.NotAuthenticatedException,
+        403: gazu.exception.NotAllowedException,
+        404: gazu.exception.RouteNotFoundException,
+        405: gazu.exception.MethodNotAllowedException,
+        413: gazu.exception.TooBigFileException,
+        422: gazu.exception.NotAuthenticatedException,
+    }
+    raise exceptions.get(status, gazu.exception.ParameterException)(f"{status} on {path}")
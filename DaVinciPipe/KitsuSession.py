@@ -0,0 +1,130 @@
+"""
+Stored Kitsu sessions. Kitsu's tokens are JWTs that carry their expiry, so
+a stored session is checked locally and the UI can start without a server
+round trip. The session is validated, or refreshed when the access token
+ran out, in a background thread; requests wait for that check first.
+"""
+import base64
+import json
+import threading
+import time
+from typing import Any, Optional
+
+from DaVinciPipe.lazyImport import lazyImport
+
+gazu = lazyImport("gazu")
+
+# A token expiring within this many seconds counts as expired
+TOKEN_LEEWAY = 60
+USER_CACHE_TTL = 24 * 3600
+
+
+def tokenExpiry(token: Optional[str]) -> Optional[float]:
+    """The exp claim of a JWT as a unix time, None if the token can't be read."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def isTokenValid(token: Optional[str], leeway: float = TOKEN_LEEWAY) -> bool:
+    expiry = tokenExpiry(token)
+    return expiry is not None and expiry - leeway > time.time()
+
+
+class KitsuSession:
+    def __init__(self, apiUrl: str, tokens: dict[str, Any], credentials, cache, userTtl: float = USER_CACHE_TTL):
+        self.apiUrl = apiUrl
+        self.tokens = tokens
+        self.credentials = credentials
+        self.cache = cache
+        self.userTtl = userTtl
+        self.valid = False
+        self.user = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def userKey(self) -> str:
+        return f"user:{self.apiUrl}"
+
+    def start(self) -> bool:
+        """
+        Hands the stored tokens to gazu and starts the background check.
+        Returns False when both tokens have expired, then a login is needed.
+        With a valid access token the session is usable at once; otherwise
+        wait() blocks until the background refresh is done.
+        """
+        accessValid = isTokenValid(self.tokens.get("access_token"))
+        refreshValid = isTokenValid(self.tokens.get("refresh_token"))
+        unreadable = tokenExpiry(self.tokens.get("access_token")) is None
+        if not (accessValid or refreshValid or unreadable):
+            return False
+
+        gazu.client.set_host(self.apiUrl)
+        gazu.client.default_client.tokens = dict(self.tokens)
+        self.valid = True
+        self.user = self.cache.get(self.userKey)
+        if accessValid:
+            self._ready.set()
+
+        self._thread = threading.Thread(
+            target=self._check, args=(not accessValid and refreshValid, accessValid),
+            name="KitsuSessionCheck", daemon=True,
+        )
+        self._thread.start()
+        return True
+
+    @property
+    def confirmed(self) -> bool:
+        """Whether the session is usable without waiting: checked, or trusted locally."""
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for a pending refresh; True if the session can be used. False
+        when the refresh did not finish within timeout, the local check
+        alone does not make a session usable.
+        """
+        if not self._ready.wait(timeout):
+            return False
+        return self.valid
+
+    def _check(self, refresh: bool, trustedLocally: bool):
+        try:
+            if refresh:
+                self._refresh()
+                # The server accepted the refresh token, requests can go ahead
+                self._ready.set()
+            try:
+                user = gazu.client.get_current_user()
+            except gazu.exception.NotAuthenticatedException:
+                # Revoked or expired early; one refresh before giving up
+                if refresh or not isTokenValid(self.tokens.get("refresh_token")):
+                    raise
+                self._refresh()
+                user = gazu.client.get_current_user()
+            self.user = user
+            self.cache.set(self.userKey, user, self.userTtl)
+        except gazu.exception.NotAuthenticatedException:
+            print("[WARNING] Stored Kitsu session was rejected, log in again")
+            self.valid = False
+            self.credentials.clear()
+            self.cache.invalidate(self.userKey)
+        except (OSError, gazu.exception.ServerErrorException, gazu.exception.HostException) as e:
+            # Offline or slow server (requests' errors are OSErrors): a locally valid session stays usable
+            print(f"[WARNING] Could not validate the Kitsu session: {e}")
+            self.valid = trustedLocally
+        finally:
+            self._ready.set()
+
+    def _refresh(self):
+        # gazu 1.x renamed refresh_token to refresh_access_token
+        if hasattr(gazu, "refresh_access_token"):
+            gazu.refresh_access_token()
+        else:
+            gazu.refresh_token()
+        self.credentials.saveSession(gazu.client.default_client.tokens)
+        print("[INFO] Kitsu session refreshed")
@@ -0,0 +1,134 @@
+from typing import Any, Optional
+
+from DaVinciPipe.pathKey import pathKey
+
+
+class MediaPoolIndex:
+    """
+    The media pool's clips by "File Path", so files already in the pool are
+    reused instead of imported again. refresh walks the folders once; a
+    folder whose clip list still starts with the clips seen last time (first
+    and last one spot-checked) only has its new clips read. New clips that
+    end with the imports recorded by add or expect (spot-checked the same
+    way) are not read either, so repeated refreshes cost a few calls per
+    folder. A clip relinked or replaced in the Resolve UI since the last
+    refresh can hide behind the spot checks, so get reads the path of an
+    item from an earlier refresh before handing it out; on a mismatch the
+    folder lists are dropped and the next refresh reads every clip. Only
+    the imports of a crashed build given to expect are trusted, the way
+    the resumed build trusts the rest of its journal.
+    """
+
+    def __init__(self):
+        self._itemsByPath: dict[str, Any] = {}
+        # Folder unique id -> path keys of its clips, in clip list order
+        self._folderPaths: dict[str, list[str]] = {}
+        # Imported since the last refresh, in import order
+        self._pendingPaths: list[str] = []
+        # Path keys whose item was read or imported since the last refresh
+        self._verified: set[str] = set()
+        # Whether the pending paths come from expect
+        self._trustPending = False
+        self.readCount = 0
+
+    def __len__(self) -> int:
+        return len(self._itemsByPath)
+
+    def get(self, filePath: Any) -> Optional[Any]:
+        key = pathKey(filePath)
+        item = self._itemsByPath.get(key)
+        if item is None or key in self._verified:
+            return item
+        actualKey = self._readPath(item)
+        if actualKey != key:
+            print(f"[INFO] Media pool clip of {filePath} was relinked, rereading the media pool next time")
+            del self._itemsByPath[key]
+            if actualKey:
+                self._itemsByPath.setdefault(actualKey, item)
+            self._folderPaths = {}
+            return None
+        self._verified.add(key)
+        return item
+
+    def add(self, filePath: Any, item: Any):
+        """Records an item imported since the last refresh."""
+        self._itemsByPath.setdefault(pathKey(filePath), item)
+        self._pendingPaths.append(pathKey(filePath))
+        self._verified.add(pathKey(filePath))
+
+    def expect(self, filePaths: list[Any]):
+        """
+        Files another run imported, in import order (e.g. from the journal
+        of a crashed build), unless this index saw imports itself.
+        """
+        if not self._pendingPaths:
+            self._pendingPaths = [pathKey(filePath) for filePath in filePaths]
+            self._trustPending = True
+
+    def move(self, oldPath: Any, newPath: Any, item: Any):
+        """Follows a ReplaceClip: the item now points to newPath."""
+        oldKey = pathKey(oldPath)
+        # Tracing wraps items in proxies, so the same clip is not always the same object
+        current = self._itemsByPath.get(oldKey)
+        if current is not None and (current is item or current.GetUniqueId() == item.GetUniqueId()):
+            del self._itemsByPath[oldKey]
+        self._itemsByPath.setdefault(pathKey(newPath), item)
+        self._verified.add(pathKey(newPath))
+        for paths in self._folderPaths.values():
+            if oldKey in paths:
+                paths[paths.index(oldKey)] = pathKey(newPath)
+                break
+
+    def clear(self):
+        self._itemsByPath = {}
+        self._folderPaths = {}
+        self._pendingPaths = []
+        self._verified = set()
+        self._trustPending = False
+
+    def refresh(self, rootFolder):
+        itemsByPath = {}
+        folderPaths = {}
+        self._verified = set()
+        # Sibling folders can share a name, so folders are told apart by id
+        folders = [rootFolder]
+        while folders:
+            folder = folders.pop()
+            folderKey = folder.GetUniqueId()
+            clips = folder.GetClipList() or []
+            paths = self._readFolder(clips, self._folderPaths.get(folderKey))
+            folderPaths[folderKey] = paths
+            for path, item in zip(paths, clips):
+                if path:
+                    itemsByPath.setdefault(path, item)
+            folders.extend(folder.GetSubFolderList() or [])
+        self._itemsByPath = itemsByPath
+        self._folderPaths = folderPaths
+        self._pendingPaths = []
+        self._trustPending = False
+
+    def _readFolder(self, clips: list, knownPaths: Optional[list[str]]) -> list[str]:
+        head = []
+        if knownPaths and self._endsWith(clips[:len(knownPaths)], knownPaths):
+            head = knownPaths
+        newClips = clips[len(head):]
+        tail = []
+        if self._pendingPaths and self._endsWith(newClips, self._pendingPaths):
+            tail = self._pendingPaths
+        unknownClips = newClips[:len(newClips) - len(tail)]
+        unknownPaths = [self._readPath(item) for item in unknownClips]
+        self._verified.update(unknownPaths)
+        if self._trustPending:
+            self._verified.update(tail)
+        return head + unknownPaths + tail
+
+    def _endsWith(self, clips: list, paths: list[str]) -> bool:
+        """Whether the last clips are the given paths, checking the first and last one."""
+        if len(clips) < len(paths):
+            return False
+        return self._readPath(clips[len(clips) - len(paths)]) == paths[0] and self._readPath(clips[-1]) == paths[-1]
+
+    def _readPath(self, item) -> str:
+        self.readCount += 1
+        filePath = item.GetClipProperty("File Path")
+        return pathKey(filePath) if filePath else ""
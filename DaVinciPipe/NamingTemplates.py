@@ -0,0 +1,102 @@
+"""
+Configurable naming templates for published version files. A template
+like "{camera}_{shot}_v{version}.{ext}" is compiled to a regex once; a
+NamingScheme tries its templates in order, so departments or extensions
+with their own convention can live next to each other.
+"""
+import re
+from typing import Any, Iterable, Optional
+
+DEFAULT_TEMPLATES = [
+    {"name": "default", "pattern": "{camera}_{shot}_v{version}.{ext}"},
+]
+
+# What each field may contain. Other fields ({department}, {task}, ...) are
+# matched like shot and ignored.
+FIELD_PATTERNS = {
+    "camera": r"[A-Za-z0-9_.]+",
+    "shot": r"[A-Za-z0-9]+",
+    "version": r"\d{3,}",
+    "ext": r"[A-Za-z0-9]+",
+}
+OTHER_FIELD_PATTERN = r"[A-Za-z0-9]+"
+
+FIELD_TOKEN = re.compile(r"\{(\w+)\}")
+
+# A parsed version file: (fileName, camera, shot, version, ext)
+VersionEntry = list
+
+
+class NamingTemplate:
+    def __init__(self, name: str, pattern: str, extensions: Optional[Iterable[str]] = None):
+        self.name = name
+        self.pattern = pattern
+        self.extensions = {ext.lower().lstrip(".") for ext in extensions} if extensions else None
+        self.regex = _compile(pattern)
+
+    def parse(self, fileName: str) -> Optional[VersionEntry]:
+        m = self.regex.match(fileName)
+        if m is None:
+            return None
+        fields = m.groupdict()
+        ext = fields.get("ext") or ""
+        if self.extensions is not None and ext.lower() not in self.extensions:
+            return None
+        return [fileName, fields.get("camera") or "", fields.get("shot") or "", int(fields["version"]), ext]
+
+
+class NamingScheme:
+    """The configured templates; the first one that matches a file name wins."""
+
+    def __init__(self, templates: list[NamingTemplate]):
+        if not templates:
+            raise ValueError("A naming scheme needs at least one template")
+        self.templates = templates
+        # Index entries parsed with other templates must not be reused
+        self.signature = "|".join(
+            f"{template.pattern}:{','.join(sorted(template.extensions or []))}" for template in templates
+        )
+
+    @classmethod
+    def fromConfig(cls, templates: Optional[list[dict[str, Any]]]) -> "NamingScheme":
+        return cls([
+            NamingTemplate(template.get("name", template["pattern"]), template["pattern"], template.get("extensions"))
+            for template in (templates or DEFAULT_TEMPLATES)
+        ])
+
+    @classmethod
+    def default(cls) -> "NamingScheme":
+        return cls.fromConfig(None)
+
+    def parse(self, fileName: str) -> Optional[VersionEntry]:
+        for template in self.templates:
+            entry = template.parse(fileName)
+            if entry is not None:
+                return entry
+        return None
+
+    def matches(self, fileName: str) -> bool:
+        return self.parse(fileName) is not None
+
+
+def versionKey(entry: VersionEntry) -> tuple[str, str, str]:
+    """(camera, shot, ext) of an entry, case-insensitive like the file system."""
+    return entry[1].lower(), entry[2].lower(), entry[4].lower()
+
+
+def _compile(pattern: str) -> "re.Pattern":
+    fields = FIELD_TOKEN.findall(pattern)
+    if "version" not in fields:
+        raise ValueError(f"Naming template needs a {{version}} field: {pattern}")
+    if len(fields) != len(set(fields)):
+        raise ValueError(f"Naming template uses a field twice: {pattern}")
+
+    parts = []
+    position = 0
+    for m in FIELD_TOKEN.finditer(pattern):
+        parts.append(re.escape(pattern[position:m.start()]))
+        field = m.group(1)
+        parts.append(f"(?P<{field}>{FIELD_PATTERNS.get(field, OTHER_FIELD_PATTERN)})")
+        position = m.end()
+    parts.append(re.escape(pattern[position:]))
+    return re.compile("^" + "".join(parts) + "$", re.IGNORECASE)
@@ -1,49 +1,62 @@
+import concurrent.futures
 import json
-import pathlib
-import re
+import threading
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Optional
 
-import gazu
-from PySide6.QtWidgets import QDialog
-
+from DaVinciPipe.KitsuSession import KitsuSession
+from DaVinciPipe.lazyImport import lazyImport
+from DaVinciPipe.Progress import ProgressCallback, checkCanceled, reportProgress
+from DaVinciPipe.ProjectResolver import PROJECT_CACHE_TTL, ProjectResolver
+from DaVinciPipe.ShotRecords import Shot, validateShots
+from DaVinciPipe.storage.CacheStore import CacheStore
 from DaVinciPipe.storage.ConfigStore import ConfigStore
 from DaVinciPipe.storage.CredentialStore import CredentialStore
-from ui.loginWindow import LoginDialog
+from DaVinciPipe.storage.ShotSnapshotStore import ShotSnapshotStore
+from DaVinciPipe.VersionScanner import VersionScanner, printScanReport
+
+gazu = lazyImport("gazu")
+
+# Re-read a little before the last sync, so clock skew to the Kitsu server
+# can't drop changes. Merging a shot twice is harmless.
+SYNC_SAFETY_MARGIN = timedelta(minutes=10)
 
 
 class AbstractPipelineInterface(ABC):
 
-    def getShotInformations(self):
-        shotList = self._collectShotsFromPipeline()
+    def getShotInformations(self, progressCallback: Optional[ProgressCallback] = None,
+                            cancelEvent: Optional[threading.Event] = None) -> list[Shot]:
+        shotList = self._collectShotsFromPipeline(progressCallback, cancelEvent)
         if self.__validate(shotList):
             return shotList
         else:
             raise Exception('Shot information not valid')
 
     def __validate(self, shotList):
-        for shot in shotList:
-            if shot.get("name") and shot.get("start") and shot.get("duration") and shot.get("end"):
-                continue
-            else:
-                return False
-        return True
+        return validateShots(shotList)
 
     @abstractmethod
-    def _collectShotsFromPipeline(self) -> list[dict[str, Any]]:
+    def _collectShotsFromPipeline(self, progressCallback: Optional[ProgressCallback] = None,
+                                  cancelEvent: Optional[threading.Event] = None) -> list[Shot]:
         """
         Needs to be implemented to collect the shots from the database
-        (e.g. Shotgrid / Kitsu)
+        (e.g. Shotgrid / Kitsu). Reports per-shot progress and stops with
+        SyncCanceled once cancelEvent is set.
         """
         pass
 
     @abstractmethod
-    def updateAllShots(self, shotList: list[dict[str, Any]]) -> bool:
+    def updateAllShots(self, shotList: list[dict[str, Any]], dryRun: bool = False,
+                       progressCallback: Optional[ProgressCallback] = None,
+                       cancelEvent: Optional[threading.Event] = None) -> dict[str, Any]:
         """
-        Needs to be implemented to update the shots from the database
+        Needs to be implemented to write edited shots back to the database.
+        Every entry holds the shot id and only the changed fields of start,
+        end and duration. With dryRun nothing is sent.
         :param shotList:
-        :return:
+        :return: report with the planned requests, updated ids and failures
         """
         pass
 
@@ -55,10 +68,24 @@ class AbstractPipelineInterface(ABC):
         :return:
         """
 
+    @abstractmethod
+    def getNewestVersions(self, filePaths: list[str], progressCallback: Optional[ProgressCallback] = None,
+                          cancelEvent: Optional[threading.Event] = None) -> dict[str, Optional[Path]]:
+        """
+        Needs to be implemented to get the newest version of many files at once.
+        Maps every given file path to its newest version (None if not found)
+        :param filePaths:
+        :return:
+        """
+
     @abstractmethod
     def updateShot(self, shot) -> bool:
         pass
 
+    def close(self):
+        """Releases connections or threads the pipeline holds."""
+        pass
+
 
 class ShotgridPipeline(AbstractPipelineInterface):
     pass
@@ -66,11 +93,55 @@ class ShotgridPipeline(AbstractPipelineInterface):
 
 class KitsuPipeline(AbstractPipelineInterface):
 
-    def __init__(self, qtApp):
+    def __init__(self, qtApp, appConfig: Optional[dict[str, Any]] = None, interactive: bool = True):
+        """
+        Logs in with the stored session, or with the login dialog. The stored
+        tokens are checked locally and validated in the background (see
+        KitsuSession), so a valid session costs no round trip here. With
+        interactive=False (headless runs) there is no dialog: without a valid
+        stored session passedLogin stays False, and the kitsu section of
+        appConfig is used instead of the stored config.
+        """
+        self._setUp(qtApp, appConfig)
+        self._login(interactive)
+        if self.passedLogin:
+            self._loggedIn()
+
+    @classmethod
+    def fromSession(cls, config: dict[str, Any], session: Optional[KitsuSession] = None,
+                    appConfig: Optional[dict[str, Any]] = None, versionScanner: Optional[VersionScanner] = None,
+                    appName: str = "ResolveKitsuTool") -> "KitsuPipeline":
+        """
+        A pipeline on a login done elsewhere: the host and tokens of the
+        current gazu client, and the session validating them if there is
+        one. Neither the stored session nor the login dialog is used, so
+        tools and benchmarks can point it at any server. config is the kitsu
+        section of the config, appName selects the cache files.
+        """
+        pipe = cls.__new__(cls)
+        pipe._setUp(None, appConfig, versionScanner, appName)
+        pipe.config = config
+        pipe.session = session
+        pipe.passedLogin = True
+        pipe._loggedIn()
+        return pipe
+
+    def _setUp(self, qtApp, appConfig: Optional[dict[str, Any]], versionScanner: Optional[VersionScanner] = None,
+               appName: str = "ResolveKitsuTool"):
         self._qtApp = qtApp
-        self.configStore = ConfigStore()
-        self.credentials = CredentialStore()
-
+        self.appConfig = appConfig or {}
+        self.versionScanner = versionScanner or VersionScanner.fromConfig(self.appConfig.get("versionScan"))
+        self.lastScanReport = None
+        self.shotSnapshots = ShotSnapshotStore(appName)
+        # Last fetched Kitsu shots by id, the base for write-back requests
+        self._kitsuShots: dict[str, dict[str, Any]] = {}
+        self.configStore = ConfigStore(appName)
+        self.credentials = CredentialStore(appName)
+        self.cache = CacheStore(appName)
+        self.session = None
+        self.passedLogin = False
+
+    def _login(self, interactive: bool):
         # Load stored config path (optional)
         storedConfigPath = self.configStore.loadConfigPath()
         loaded_config = None
@@ -84,26 +155,34 @@ class KitsuPipeline(AbstractPipelineInterface):
                 storedConfigPath = None
                 loaded_config = None
 
+        if not interactive and self.appConfig.get("kitsu"):
+            loaded_config = self.appConfig
+
         # Try saved tokens + saved config
         saved_tokens = self.credentials.loadSession()
         if saved_tokens and loaded_config:
             api_url = loaded_config.get("kitsu").get("apiUrl")
             if api_url:
-                gazu.client.set_host(api_url)
-                gazu.client.default_client.tokens = saved_tokens
-
-                try:
-                    gazu.client.get_current_user()
-                    print("[INFO] Auto-login successful using stored config + tokens")
+                session = KitsuSession(api_url, saved_tokens, self.credentials, self.cache)
+                if session.start():
+                    print("[INFO] Auto-login using stored config + tokens, validating in the background")
+                    self.session = session
                     self.config = loaded_config.get("kitsu")
                     self.passedLogin = True
                     return
-                except:
-                    print("[WARNING] Saved session invalid")
+                print("[WARNING] Saved session expired")
             else:
                 print("[WARNING] Stored config missing apiUrl")
 
+        if not interactive:
+            print("[ERROR] No valid stored session, log in once through the UI")
+            self.passedLogin = False
+            return
+
         # 3. Show login dialog (pass stored config)
+        from PySide6.QtWidgets import QDialog
+        from ui.loginWindow import LoginDialog
+
         dlg = LoginDialog(config=loaded_config)
 
         if dlg.exec() != QDialog.Accepted:
@@ -132,88 +211,380 @@ class KitsuPipeline(AbstractPipelineInterface):
         print("[INFO] Login + config selection successful")
         self.passedLogin = True
 
-    def _collectShotsFromPipeline(self) -> list[dict[str, Any]]:
+    def _loggedIn(self):
+        """Called once the pipeline is logged in, by __init__ and fromSession."""
+        pass
+
+    def _collectShotsFromPipeline(self, progressCallback: Optional[ProgressCallback] = None,
+                                  cancelEvent: Optional[threading.Event] = None) -> list[Shot]:
+        self._waitForSession()
         project = self._getProject()
         shotListOut = []
 
-        filter = {
-            "project_id": project["id"]
-        }
-        kitsuShotList = gazu.client.get(path="data/shots", params=filter)
+        if self.config.get("deltaSync", True):
+            kitsuShotList = self._fetchShotsDelta(project["id"])
+        elif self.config.get("bulkShotRetrieval", True):
+            kitsuShotList = self._fetchShotsBulk(project["id"])
+        else:
+            kitsuShotList = self._fetchShotsPerShot(project["id"])
 
-        for kitsuShot in kitsuShotList:
-            id = kitsuShot["id"]
-            shot = gazu.shot.get_shot(id)
-            if shot is None or shot.get("data") is None:
-                continue
-            else:
-                name = shot["sequence_name"] + "_" + shot["name"]
-                filePath = self._getNewestVersionFile(folderPath=shot.get("data").get("absolutepath"))
-                if filePath is None:
-                    print(f"[WARNING] Could not find file for shot: {name}")
+        checkCanceled(cancelEvent)
+        kitsuShotList = [shot for shot in kitsuShotList if shot is not None and shot.get("data") is not None]
+        self._kitsuShots = {shot["id"]: shot for shot in kitsuShotList}
+        newestByFolder = self._scanFolders(
+            (shot.get("data").get("absolutepath") for shot in kitsuShotList), progressCallback, cancelEvent
+        )
 
-                outShot = {
-                    "name": name,
-                    "start": shot["frame_in"],
-                    "end": shot["frame_out"],
-                    "duration": shot["nb_frames"],
-                    "filePath": filePath
-                }
+        for shot in kitsuShotList:
+            name = shot["sequence_name"] + "_" + shot["name"]
+            filePath = newestByFolder.get(shot.get("data").get("absolutepath"))
+            if filePath is None:
+                print(f"[WARNING] Could not find file for shot: {name}")
 
-                shotListOut.append(outShot)
+            outShot = Shot(
+                name=name,
+                start=shot["frame_in"],
+                end=shot["frame_out"],
+                duration=shot["nb_frames"],
+                filePath=filePath,
+                id=shot.get("id"),
+            )
 
-        return shotListOut
+            shotListOut.append(outShot)
 
-    def getNewestVersion(self, filePath: str) -> Path:
-        directoryPath = Path(filePath).parent
-        newestVersion = self._getNewestVersionFile(str(directoryPath))
-        return Path(newestVersion)
+        return shotListOut
 
-    def updateAllShots(self, shotList: list[dict[str, Any]]) -> bool:
-        return True
+    def _fetchShotsPerShot(self, projectId: str) -> list[dict[str, Any]]:
+        """
+        Legacy retrieval: lists the shots and then fetches every shot on its own
+        (one request per shot).
+        """
+        filter = {
+            "project_id": projectId
+        }
+        kitsuShotList = self._get("data/shots", filter)
+        return self._fetchShots([kitsuShot["id"] for kitsuShot in kitsuShotList])
 
-    def updateShot(self, shot) -> bool:
-        return True
+    def _fetchShotsBulk(self, projectId: str) -> list[dict[str, Any]]:
+        """
+        Fetches all shots of the project in pages and joins the sequence names
+        locally, so the request count does not grow with the number of shots.
+        """
+        sequenceNames = self._fetchSequenceNames(projectId)
+        kitsuShotList = self._getPaged("data/shots", {"project_id": projectId})
+        for shot in kitsuShotList:
+            self._normalizeShot(shot, sequenceNames)
+        return kitsuShotList
 
-    ### HELPER ###
+    def _fetchShotsDelta(self, projectId: str) -> list[dict[str, Any]]:
+        """
+        Merges the shots changed since the last sync into the local snapshot.
+        Kitsu's data routes can't filter by updated_at, so the changed shot
+        ids come from the project's event log. Without a snapshot, or when
+        too many events piled up, all shots are fetched in bulk.
+        """
+        syncStart = (datetime.now(timezone.utc) - SYNC_SAFETY_MARGIN).strftime("%Y-%m-%dT%H:%M:%S")
+        snapshot = self.shotSnapshots.loadSnapshot(projectId)
+        delta = None
+        if snapshot is not None:
+            delta = self._fetchEventDelta(projectId, snapshot["syncedAt"])
+
+        if delta is None:
+            sequenceNames = self._fetchSequenceNames(projectId)
+            kitsuShotList = self._getPaged("data/shots", {"project_id": projectId})
+            snapshot = {
+                "sequences": sequenceNames,
+                "shots": {shot["id"]: self._normalizeShot(shot, sequenceNames) for shot in kitsuShotList},
+            }
+        else:
+            changedIds, removedIds, sequencesChanged = delta
+            shots = snapshot["shots"]
+            for shotId in removedIds:
+                shots.pop(shotId, None)
+            if sequencesChanged:
+                snapshot["sequences"] = self._fetchSequenceNames(projectId)
+                for shot in shots.values():
+                    self._normalizeShot(shot, snapshot["sequences"])
+            changedIds = list(changedIds - removedIds)
+            for shotId, shot in zip(changedIds, self._fetchShots(changedIds)):
+                if shot is None or shot.get("canceled"):
+                    shots.pop(shotId, None)
+                else:
+                    shots[shotId] = self._normalizeShot(shot, snapshot["sequences"])
+            print(f"[INFO] Delta sync: {len(changedIds)} changed, {len(removedIds)} removed shots")
+
+        snapshot["syncedAt"] = syncStart
+        self.shotSnapshots.saveSnapshot(projectId, snapshot)
+        return list(snapshot["shots"].values())
+
+    def _fetchEventDelta(self, projectId: str, after: str) -> Optional[tuple[set[str], set[str], bool]]:
+        """
+        Returns the ids of changed and removed shots and whether sequences
+        changed since after, or None if there are more events than
+        maxDeltaEvents.
+        """
+        maxEvents = int(self.config.get("maxDeltaEvents", 1000))
+        changedIds = set()
+        removedIds = set()
+        sequencesChanged = False
+        eventNames = ("shot:new", "shot:update", "shot:delete", "sequence:new", "sequence:update")
+        eventLists = self._getMany([
+            ("data/events/last", {"project_id": projectId, "after": after, "limit": maxEvents, "name": eventName})
+            for eventName in eventNames
+        ])
+        for eventName, events in zip(eventNames, eventLists):
+            if len(events) >= maxEvents:
+                return None
+            if eventName.startswith("sequence:"):
+                sequencesChanged = sequencesChanged or bool(events)
+                continue
+            for event in events:
+                shotId = (event.get("data") or {}).get("shot_id")
+                if shotId:
+                    (removedIds if eventName == "shot:delete" else changedIds).add(shotId)
+        return changedIds, removedIds, sequencesChanged
+
+    def _fetchShots(self, shotIds) -> list[Optional[dict[str, Any]]]:
+        """Fetches full shots in the order of shotIds, None for deleted shots."""
+        return self._getMany([(f"data/shots/{shotId}", None) for shotId in shotIds], missingOk=True)
+
+    def _fetchSequenceNames(self, projectId: str) -> dict[str, str]:
+        sequences = self._get(f"data/projects/{projectId}/sequences")
+        return {sequence["id"]: sequence["name"] for sequence in sequences}
+
+    @staticmethod
+    def _normalizeShot(shot: dict[str, Any], sequenceNames: dict[str, str]) -> dict[str, Any]:
+        shot["sequence_name"] = sequenceNames.get(shot.get("parent_id"), shot.get("sequence_name", ""))
+        # The list route keeps the frame range in the custom data
+        data = shot.get("data") or {}
+        for key in ("frame_in", "frame_out"):
+            if shot.get(key) is None:
+                shot[key] = data.get(key)
+        return shot
 
-    def _getNewestVersionFile(self, folderPath: str) -> Optional[str]:
-        if folderPath is None or "":
-            return None
-        p = pathlib.Path(folderPath)
-        if not p.exists() or not p.is_dir():
-            return None
+    def getNewestVersion(self, filePath: str) -> Path:
+        # Same camera, shot and extension as the given file
+        newestVersion = self.versionScanner.resolveFile(filePath)
+        return Path(newestVersion)
 
-        pattern = re.compile(
-            r"^(?P<camera>[A-Za-z0-9_.]+)_(?P<shot>[A-Za-z0-9]+)_v(?P<ver>\d{3,})\.(?P<ext>[A-Za-z0-9]+)$",
-            re.IGNORECASE
+    def getNewestVersions(self, filePaths: list[str], progressCallback: Optional[ProgressCallback] = None,
+                          cancelEvent: Optional[threading.Event] = None) -> dict[str, Optional[Path]]:
+        newestByFile, report = self.versionScanner.resolveFiles(
+            filePaths, progressCallback=progressCallback, cancelEvent=cancelEvent
         )
+        printScanReport(report)
+        self.lastScanReport = report
+        return newestByFile
 
-        bestVersion = -1
-        newestTask = 0
-        bestPath = None
+    def updateAllShots(self, shotList: list[dict[str, Any]], dryRun: bool = False,
+                       progressCallback: Optional[ProgressCallback] = None,
+                       cancelEvent: Optional[threading.Event] = None) -> dict[str, Any]:
+        """
+        Sends the changed frame ranges as one PUT per shot, writeBatchSize
+        shots per batch with up to maxConcurrency requests in flight. Kitsu
+        keeps frame_in/frame_out in the shot's custom data, which a PUT
+        replaces, so the data of the last fetched shot is merged in. Makes
+        no Resolve calls, so it can run in a worker.
+        """
+        self._waitForSession()
+        shotList = [shot for shot in shotList if shot.get("id")]
+        missingIds = [shot["id"] for shot in shotList if shot["id"] not in self._kitsuShots]
+        for shotId, kitsuShot in zip(missingIds, self._fetchShots(missingIds)):
+            if kitsuShot is not None:
+                self._kitsuShots[shotId] = kitsuShot
+
+        requests = []
+        report = {"dryRun": dryRun, "requests": requests, "updated": [], "failed": []}
+        for shot in shotList:
+            kitsuShot = self._kitsuShots.get(shot["id"])
+            if kitsuShot is None:
+                report["failed"].append({"id": shot["id"], "name": shot.get("name"), "error": "Shot not found"})
+                continue
+            requests.append((f"data/entities/{shot['id']}", self._shotUpdateBody(kitsuShot, shot)))
+
+        if dryRun or not requests:
+            return report
+
+        batchSize = max(1, int(self.config.get("writeBatchSize", 100)))
+        reportProgress(progressCallback, 0, len(requests))
+        for i in range(0, len(requests), batchSize):
+            checkCanceled(cancelEvent)
+            batch = requests[i:i + batchSize]
+            for (path, body), result in zip(batch, self._putMany(batch)):
+                shotId = path.rsplit("/", 1)[-1]
+                if isinstance(result, Exception):
+                    print(f"[WARNING] Could not update shot {shotId}: {result}")
+                    report["failed"].append({"id": shotId, "error": f"{type(result).__name__}: {result}"})
+                    continue
+                kitsuShot = self._kitsuShots[shotId]
+                kitsuShot.update(body)
+                kitsuShot.update({key: value for key, value in body.get("data", {}).items()
+                                  if key in ("frame_in", "frame_out")})
+                report["updated"].append(shotId)
+            reportProgress(progressCallback, min(i + batchSize, len(requests)), len(requests))
+
+        print(f"[INFO] Updated {len(report['updated'])} shot(s) in Kitsu, {len(report['failed'])} failed")
+        return report
 
-        for file in p.iterdir():
+    def updateShot(self, shot) -> bool:
+        report = self.updateAllShots([shot])
+        return bool(report["updated"]) and not report["failed"]
+
+    @staticmethod
+    def _shotUpdateBody(kitsuShot: dict[str, Any], shot: dict[str, Any]) -> dict[str, Any]:
+        body = {}
+        data = {}
+        if shot.get("start") is not None:
+            data["frame_in"] = shot["start"]
+        if shot.get("end") is not None:
+            data["frame_out"] = shot["end"]
+        if data:
+            body["data"] = {**(kitsuShot.get("data") or {}), **data}
+        if shot.get("duration") is not None:
+            body["nb_frames"] = shot["duration"]
+        return body
 
-            if not file.is_file():
-                continue
+    ### HELPER ###
 
-            m = pattern.match(file.name)
-            if not m:
-                continue
+    def _getNewestVersionFile(self, folderPath: str) -> Optional[Path]:
+        return self.versionScanner.scanFolder(folderPath)
 
-            info = m.groupdict()
+    def invalidateVersionIndex(self, folderPath: Optional[str] = None):
+        """Forces the next scan to re-list the given folder (or all folders)."""
+        self.versionScanner.invalidate(folderPath)
 
-            versionNumber = int(info["ver"])
+    def _scanFolders(self, folders, progressCallback: Optional[ProgressCallback] = None,
+                     cancelEvent: Optional[threading.Event] = None) -> dict[str, Optional[Path]]:
+        newestByFolder, report = self.versionScanner.scanFolders(
+            folders, progressCallback=progressCallback, cancelEvent=cancelEvent
+        )
+        printScanReport(report)
+        self.lastScanReport = report
+        return newestByFolder
 
-            if versionNumber > bestVersion:
-                bestVersion = versionNumber
-                bestPath = file
+    def _get(self, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+        return gazu.client.get(path=path, params=params)
 
-        return bestPath
+    def _getMany(self, requests: list[tuple[str, Optional[dict[str, Any]]]],
+                 missingOk: bool = False) -> list[Any]:
+        """
+        Runs (path, params) requests and returns the results in order. With
+        missingOk, a 404 gives None instead of raising.
+        """
+        results = []
+        for path, params in requests:
+            try:
+                results.append(self._get(path, params))
+            except gazu.exception.RouteNotFoundException:
+                if not missingOk:
+                    raise
+                results.append(None)
+        return results
+
+    def _putMany(self, requests: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """
+        Sends (path, body) PUTs, up to maxConcurrency at a time. Returns the
+        results in order, a failed request gives its exception.
+        """
+        def put(request):
+            path, body = request
+            try:
+                return gazu.client.put(path, body)
+            except Exception as e:
+                return e
+
+        maxConcurrency = max(1, int(self.config.get("maxConcurrency", 8)))
+        if maxConcurrency == 1 or len(requests) == 1:
+            return [put(request) for request in requests]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(maxConcurrency, len(requests))) as executor:
+            return list(executor.map(put, requests))
+
+    def _getPaged(self, path: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        pageSize = int(self.config.get("pageSize", 1000))
+        result = self._get(path, {**params, "page": 1, "limit": pageSize})
+        if isinstance(result, list):
+            # Server does not paginate this route
+            return result
+        entries = list(result.get("data", []))
+        # The first page tells how many there are, the rest can be requested together
+        pageCount = int(result.get("nb_pages", 1))
+        for pageResult in self._getMany([
+            (path, {**params, "page": page, "limit": pageSize}) for page in range(2, pageCount + 1)
+        ]):
+            entries.extend(pageResult.get("data", []))
+        return entries
+
+    def _waitForSession(self):
+        """
+        Blocks until the background session check is done; raises if the
+        session was rejected or not confirmed in time.
+        """
+        if self.session is None:
+            return
+        timeout = self.config.get("requestTimeout", 30)
+        if self.session.wait(timeout):
+            return
+        if not self.session.confirmed:
+            raise gazu.exception.NotAuthenticatedException(
+                f"Stored Kitsu session was not confirmed within {timeout}s, log in again"
+            )
+        raise gazu.exception.NotAuthenticatedException("Stored Kitsu session is no longer valid, log in again")
 
     def _getProject(self):
-        projectName = self.config.get("project_name")
-        allProjects = gazu.client.get("/data/projects/all")
-        kitsuProject = [project for project in allProjects if project["name"] == projectName][0]
-        return kitsuProject
+        resolver = ProjectResolver(
+            self._get, self.cache, gazu.client.get_host(), float(self.config.get("projectCacheTtl", PROJECT_CACHE_TTL))
+        )
+        return resolver.resolve(self.config.get("project_name"))
+
+
+class AsyncKitsuPipeline(KitsuPipeline):
+    """
+    KitsuPipeline whose requests go through an AsyncKitsuClient: pages,
+    event queries and per-shot fetches are sent concurrently on a pooled
+    session, with retries on server errors and timeouts. Login and the
+    synchronous interface are the same as KitsuPipeline's. Without aiohttp
+    it sends its requests like KitsuPipeline.
+    """
+
+    def _setUp(self, qtApp, appConfig: Optional[dict[str, Any]], versionScanner: Optional[VersionScanner] = None,
+               appName: str = "ResolveKitsuTool"):
+        super()._setUp(qtApp, appConfig, versionScanner, appName)
+        self.client = None
+
+    def _loggedIn(self):
+        # Imported here, aiohttp is too heavy for the startup of the default pipeline
+        from DaVinciPipe.KitsuAsyncClient import AsyncKitsuClient
+
+        try:
+            self.client = AsyncKitsuClient.fromConfig(
+                gazu.client.get_host(), gazu.client.default_client.tokens["access_token"], self.config
+            )
+        except ImportError as e:
+            print(f"[WARNING] {e}, sending requests one by one")
+
+    def _waitForSession(self):
+        super()._waitForSession()
+        # A background refresh may have replaced the access token
+        if self.client is not None:
+            self.client.setAccessToken(gazu.client.default_client.tokens["access_token"])
+
+    def _get(self, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+        if self.client is None:
+            return super()._get(path, params)
+        return self.client.get(path, params)
+
+    def _getMany(self, requests: list[tuple[str, Optional[dict[str, Any]]]],
+                 missingOk: bool = False) -> list[Any]:
+        if self.client is None:
+            return super()._getMany(requests, missingOk)
+        return self.client.getMany(requests, missingOk)
+
+    def _putMany(self, requests: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        if self.client is None:
+            return super()._putMany(requests)
+        return self.client.putMany(requests)
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
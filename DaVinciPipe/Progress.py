@@ -0,0 +1,19 @@
+import threading
+from typing import Callable, Optional
+
+# Called with (done, total) while a sync is running
+ProgressCallback = Callable[[int, int], None]
+
+
+class SyncCanceled(Exception):
+    pass
+
+
+def checkCanceled(cancelEvent: Optional[threading.Event]) -> None:
+    if cancelEvent is not None and cancelEvent.is_set():
+        raise SyncCanceled()
+
+
+def reportProgress(progressCallback: Optional[ProgressCallback], done: int, total: int) -> None:
+    if progressCallback is not None:
+        progressCallback(done, total)
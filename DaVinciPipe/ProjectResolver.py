@@ -0,0 +1,61 @@
+from typing import Any, Callable, Optional
+
+from DaVinciPipe.lazyImport import lazyImport
+
+gazu = lazyImport("gazu")
+
+# Project ids don't change, names rarely do
+PROJECT_CACHE_TTL = 30 * 86400
+
+
+class ProjectNotFoundError(LookupError):
+    pass
+
+
+class ProjectResolver:
+    """
+    Finds a Kitsu project by name. The name -> id mapping is cached per
+    server in the CacheStore, so later lookups fetch the one project by id.
+    The cached id is only refreshed on a miss, a 404 or a renamed project,
+    with a name-filtered query instead of the list of all projects.
+    """
+
+    def __init__(self, get: Callable[..., Any], cache, apiUrl: str, ttl: float = PROJECT_CACHE_TTL):
+        self._get = get
+        self.cache = cache
+        self.apiUrl = apiUrl
+        self.ttl = ttl
+
+    def resolve(self, projectName: str) -> dict[str, Any]:
+        if not projectName:
+            raise ProjectNotFoundError("No Kitsu project configured, set kitsu.project_name in the config")
+
+        projectId = self.cache.get(self._cacheKey(projectName))
+        if projectId is not None:
+            project = self._fetchById(projectId)
+            if project is not None and project.get("name") == projectName:
+                return project
+            self.cache.invalidate(self._cacheKey(projectName))
+
+        project = self._fetchByName(projectName)
+        if project is None:
+            raise ProjectNotFoundError(
+                f"Kitsu project {projectName!r} not found on {self.apiUrl}, "
+                f"check kitsu.project_name in the config and the project's team"
+            )
+        self.cache.set(self._cacheKey(projectName), project["id"], self.ttl)
+        return project
+
+    def _fetchById(self, projectId: str) -> Optional[dict[str, Any]]:
+        try:
+            return self._get(f"data/projects/{projectId}")
+        except gazu.exception.RouteNotFoundException:
+            return None
+
+    def _fetchByName(self, projectName: str) -> Optional[dict[str, Any]]:
+        projects = self._get("data/projects", {"name": projectName})
+        # Filter again in case the server ignored the query
+        return next((project for project in projects if project.get("name") == projectName), None)
+
+    def _cacheKey(self, projectName: str) -> str:
+        return f"project:{self.apiUrl}:{projectName}"
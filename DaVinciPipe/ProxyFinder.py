@@ -0,0 +1,66 @@
+"""
+Finds the proxy renders published next to the hero files. A proxy belongs
+to a hero file when it has the same camera, shot and version and is named
+after one of the proxy templates, in the hero's folder or a subfolder of it.
+"""
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from DaVinciPipe.NamingTemplates import NamingScheme
+from DaVinciPipe.Progress import ProgressCallback
+from DaVinciPipe.VersionScanner import VersionScanner
+
+DEFAULT_PROXY_TEMPLATES = [
+    {"name": "proxy", "pattern": "{camera}_{shot}_v{version}_proxy.{ext}"},
+]
+
+
+class ProxyFinder:
+    def __init__(self, heroScheme: NamingScheme, proxyScheme: NamingScheme, subfolder: str = "",
+                 extensions: Optional[Iterable[str]] = None, maxWorkers: int = 8, batchTimeout: float = 120.0):
+        self.heroScheme = heroScheme
+        self.subfolder = subfolder
+        # Preferred proxy extensions in order, None takes any
+        self.extensions = [ext.lower().lstrip(".") for ext in extensions] if extensions else None
+        # The proxy folders are crawled once per run, so no index is kept
+        self.scanner = VersionScanner(maxWorkers, batchTimeout, namingScheme=proxyScheme)
+
+    @classmethod
+    def fromConfig(cls, config: Optional[dict[str, Any]],
+                   versionScanConfig: Optional[dict[str, Any]] = None) -> "ProxyFinder":
+        config = config or {}
+        versionScanConfig = versionScanConfig or {}
+        return cls(
+            NamingScheme.fromConfig(versionScanConfig.get("namingTemplates")),
+            NamingScheme.fromConfig(config.get("namingTemplates") or DEFAULT_PROXY_TEMPLATES),
+            subfolder=config.get("subfolder", ""),
+            extensions=config.get("extensions"),
+            maxWorkers=versionScanConfig.get("maxWorkers", 8),
+            batchTimeout=versionScanConfig.get("batchTimeout", 120.0),
+        )
+
+    def proxyFolder(self, filePath: str) -> str:
+        folder = Path(filePath).parent
+        return str(folder / self.subfolder) if self.subfolder else str(folder)
+
+    def findProxies(self, filePaths: Iterable[str], progressCallback: Optional[ProgressCallback] = None,
+                    cancelEvent: Optional[threading.Event] = None) -> tuple[dict[str, Optional[Path]], dict[str, list]]:
+        """
+        Maps every hero file to its proxy, None if there is none. Every proxy
+        folder is listed once, in the scanner's thread pool.
+        """
+        filePaths = [str(filePath) for filePath in filePaths if filePath]
+        versionsByFolder, report = self.scanner.scanFolderVersions(
+            (self.proxyFolder(filePath) for filePath in filePaths), progressCallback=progressCallback,
+            cancelEvent=cancelEvent,
+        )
+        proxies = {}
+        for filePath in filePaths:
+            entry = self.heroScheme.parse(Path(filePath).name)
+            versions = versionsByFolder.get(self.proxyFolder(filePath))
+            if entry is None or versions is None:
+                proxies[filePath] = None
+                continue
+            proxies[filePath] = versions.versionOfShot(entry[1], entry[2], entry[3], self.extensions)
+        return proxies, report
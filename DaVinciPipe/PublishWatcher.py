@@ -0,0 +1,165 @@
+import os
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+from DaVinciPipe.NamingTemplates import NamingScheme
+from DaVinciPipe.pathKey import pathKey
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class PublishWatcher:
+    """
+    Watches publish folders for new version files and reports the changed
+    folders in debounced batches. Uses native file events (inotify,
+    ReadDirectoryChangesW) through watchdog when it is installed, and
+    polls folder mtimes for network shares, where native events don't
+    arrive. onChange is called from a watcher thread with a set of folders.
+    """
+
+    def __init__(self, folders: Iterable[str], onChange: Callable[[set[str]], None],
+                 debounceSeconds: float = 2.0, pollInterval: float = 10.0,
+                 pollingPrefixes: Iterable[str] = (), forcePolling: bool = False,
+                 namingScheme: Optional[NamingScheme] = None):
+        self._folders = {pathKey(folder): folder for folder in folders if folder}
+        self._onChange = onChange
+        self.namingScheme = namingScheme or NamingScheme.default()
+        self.debounceSeconds = debounceSeconds
+        self.pollInterval = pollInterval
+        prefixes = tuple(pathKey(prefix) for prefix in pollingPrefixes)
+
+        self._polledFolders = {}
+        self._nativeFolders = []
+        for key, folder in self._folders.items():
+            if forcePolling or Observer is None or key.startswith(prefixes):
+                self._polledFolders[key] = None
+            else:
+                self._nativeFolders.append(folder)
+
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._stopEvent = threading.Event()
+        self._observer = None
+        self._pollThread = None
+
+    @classmethod
+    def fromConfig(cls, folders: Iterable[str], onChange: Callable[[set[str]], None],
+                   config: Optional[dict[str, Any]], namingScheme: Optional[NamingScheme] = None) -> "PublishWatcher":
+        config = config or {}
+        return cls(
+            folders,
+            onChange,
+            debounceSeconds=config.get("debounceSeconds", 2.0),
+            pollInterval=config.get("pollInterval", 10.0),
+            pollingPrefixes=config.get("pollingPrefixes", []),
+            forcePolling=config.get("mode") == "polling",
+            namingScheme=namingScheme,
+        )
+
+    @property
+    def folderCount(self) -> int:
+        return len(self._folders)
+
+    def start(self):
+        if self._nativeFolders:
+            self._observer = Observer()
+            handler = _VersionEventHandler(self)
+            for folder in self._nativeFolders:
+                try:
+                    self._observer.schedule(handler, folder, recursive=False)
+                except OSError:
+                    self._polledFolders[pathKey(folder)] = None
+            self._observer.start()
+        if self._polledFolders:
+            for key in self._polledFolders:
+                self._polledFolders[key] = self._snapshot(self._folders[key])
+            self._pollThread = threading.Thread(target=self._pollLoop, daemon=True)
+            self._pollThread.start()
+
+    def stop(self):
+        self._stopEvent.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
+
+    def notify(self, filePath: str):
+        """Marks the folder of a created or moved file as changed if the file is a version."""
+        if not self.namingScheme.matches(os.path.basename(filePath)):
+            return
+        folder = self._folders.get(pathKey(os.path.dirname(filePath)))
+        if folder is not None:
+            self._markChanged(folder)
+
+    def _markChanged(self, folder: str):
+        with self._lock:
+            if self._stopEvent.is_set():
+                return
+            self._pending.add(folder)
+            # Restart the timer, so a burst of writes ends up in one batch
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounceSeconds, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            folders = self._pending
+            self._pending = set()
+            self._timer = None
+        if folders and not self._stopEvent.is_set():
+            self._onChange(folders)
+
+    def _pollLoop(self):
+        while not self._stopEvent.wait(self.pollInterval):
+            for key, previous in list(self._polledFolders.items()):
+                folder = self._folders[key]
+                current = self._snapshot(folder, previous)
+                if previous is not None and current is not None and current[1] - previous[1]:
+                    self._markChanged(folder)
+                self._polledFolders[key] = current
+
+    def _snapshot(self, folder: str, previous: Optional[tuple] = None) -> Optional[tuple[float, frozenset]]:
+        """Returns (mtime, version file names); only re-lists when the mtime changed."""
+        try:
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            return None
+        if previous is not None and previous[0] == mtime:
+            return previous
+        try:
+            names = frozenset(name for name in os.listdir(folder) if self.namingScheme.matches(name))
+        except OSError:
+            return None
+        return mtime, names
+
+
+class _VersionEventHandler(FileSystemEventHandler):
+    def __init__(self, watcher: PublishWatcher):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._watcher.notify(event.src_path)
+
+    def on_modified(self, event):
+        # A file that is still being copied keeps pushing the debounce back
+        if not event.is_directory:
+            self._watcher.notify(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._watcher.notify(event.dest_path)
@@ -0,0 +1,116 @@
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Iterable, Iterator, Optional
+
+
+def toFrame(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def internPath(filePath: Any) -> Optional[str]:
+    if filePath is None:
+        return None
+    return sys.intern(str(filePath))
+
+
+class Record(MutableMapping):
+    """
+    Base for compact __slots__ records that still behave like the dicts the
+    handles used before: record["name"], record.get("filePath"), dict(record).
+    Only the declared fields can be set. Item access still costs a few
+    times a dict lookup, hot loops read the attributes (record.filePath).
+    """
+    __slots__ = ()
+    # The declared fields, set per subclass
+    _fieldSet: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fieldSet = frozenset(cls.__slots__)
+
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            setattr(self, field, fields.pop(field, None))
+        if fields:
+            raise TypeError(f"Unknown {type(self).__name__} fields: {', '.join(fields)}")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fieldSet:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._fieldSet:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fieldSet
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._fieldSet:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str):
+        raise TypeError(f"{type(self).__name__} fields can't be deleted")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def toDict(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class Shot(Record):
+    __slots__ = ("id", "name", "start", "end", "duration", "filePath")
+
+    def __init__(self, name: str, start: Any, end: Any, duration: Any, filePath: Any = None,
+                 id: Optional[str] = None):
+        super().__init__(
+            id=id, name=name, start=toFrame(start), end=toFrame(end), duration=toFrame(duration),
+            filePath=internPath(filePath),
+        )
+
+    @classmethod
+    def fromMapping(cls, shot: Any) -> "Shot":
+        """A Shot from a shot dict; Shot records are returned as they are."""
+        if type(shot) is cls:
+            return shot
+        return cls(shot.get("name"), shot.get("start"), shot.get("end"), shot.get("duration"),
+                   shot.get("filePath"), shot.get("id"))
+
+
+def asShots(shots: Iterable[Any]) -> list[Shot]:
+    """Shot records of shots given as records or dicts, so hot loops can use attribute access."""
+    return [Shot.fromMapping(shot) for shot in shots]
+
+
+def validateShots(shots: Iterable[Any]) -> bool:
+    """Every shot needs a name and non-zero start, end and duration."""
+    for shot in shots:
+        if type(shot) is Shot:
+            if not (shot.name and shot.start and shot.end and shot.duration):
+                return False
+        elif not (shot.get("name") and shot.get("start") and shot.get("end") and shot.get("duration")):
+            return False
+    return True
+
+
+class Clip(Record):
+    __slots__ = (
+        "mediaPoolItem", "sourceMediaPoolItem", "sourceId", "name", "trackType", "trackIndex",
+        "start", "end", "duration", "mediaName", "filePath", "proxyPath",
+    )
@@ -0,0 +1,160 @@
+"""
+Bulk frame <-> timecode conversion for integer, NTSC (23.976, 29.97,
+59.94) and drop-frame rates. Uses NumPy when it is installed and falls back
+to plain Python lists otherwise. NumPy is imported on the first conversion,
+not with the module, so it stays off the startup path.
+"""
+import re
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TIMECODE_PATTERN = re.compile(r"^(\d+):(\d{2}):(\d{2})[:;.](\d{2})$")
+
+Frames = Union["np.ndarray", list[int]]
+
+
+class FrameRate:
+    """
+    A timeline frame rate. nominal is the frame count per timecode second
+    (24 for 23.976), dropFrame is only possible for 29.97 and 59.94.
+    """
+    __slots__ = ("fps", "nominal", "dropFrame")
+
+    def __init__(self, fps: float, dropFrame: bool = False):
+        self.fps = float(fps)
+        self.nominal = int(round(self.fps))
+        if dropFrame and not self.canDropFrame:
+            raise ValueError(f"Drop-frame timecode is not defined for {fps} fps")
+        self.dropFrame = dropFrame
+
+    @classmethod
+    def parse(cls, value: Any, dropFrame: bool = None) -> "FrameRate":
+        """
+        Parses a Resolve frame rate setting like "24", "23.976" or
+        "29.97 DF". Without an explicit dropFrame, "DF" in the value decides.
+        """
+        if isinstance(value, FrameRate):
+            return value
+        text = str(value).strip().upper()
+        if dropFrame is None:
+            dropFrame = "DF" in text and "NDF" not in text
+        number = re.match(r"^\d+(\.\d+)?", text)
+        if number is None:
+            raise ValueError(f"Invalid frame rate: {value!r}")
+        return cls(float(number.group(0)), dropFrame)
+
+    @property
+    def canDropFrame(self) -> bool:
+        """Whether drop-frame timecode exists for this rate (29.97, 59.94)."""
+        isNtsc = abs(self.fps - self.nominal) > 1e-6
+        return isNtsc and self.nominal % 30 == 0
+
+    @property
+    def dropPerMinute(self) -> int:
+        return self.nominal // 15 if self.dropFrame else 0
+
+    @property
+    def separator(self) -> str:
+        return ";" if self.dropFrame else ":"
+
+    def __repr__(self) -> str:
+        return f"FrameRate({self.fps:g}{' DF' if self.dropFrame else ''})"
+
+
+def oneHourFrames(rate: Any) -> int:
+    """Frame number of 01:00:00:00, where Resolve timelines start."""
+    return int(timecodesToFrames(["01:00:00:00"], rate)[0])
+
+
+def framesToTimecodes(frames: Iterable[int], rate: Any, addOneHour: bool = False) -> list[str]:
+    np = _numpy()
+    rate = FrameRate.parse(rate)
+    frames = _asFrames(frames)
+    if addOneHour:
+        frames = frames + oneHourFrames(rate) if np is not None else [f + oneHourFrames(rate) for f in frames]
+
+    drop = rate.dropPerMinute
+    if drop:
+        framesPerMinute = rate.nominal * 60 - drop
+        framesPer10Minutes = framesPerMinute * 10 + drop
+        if np is not None:
+            tens, rest = np.divmod(frames, framesPer10Minutes)
+            frames = frames + 9 * drop * tens + drop * (np.maximum(rest - drop, 0) // framesPerMinute)
+        else:
+            frames = [
+                f + 9 * drop * (f // framesPer10Minutes)
+                + drop * (max(f % framesPer10Minutes - drop, 0) // framesPerMinute)
+                for f in frames
+            ]
+
+    n = rate.nominal
+    separator = rate.separator
+    if np is not None:
+        hours, rest = np.divmod(frames, n * 3600)
+        minutes, rest = np.divmod(rest, n * 60)
+        seconds, frameNumbers = np.divmod(rest, n)
+        rows = zip(hours.tolist(), minutes.tolist(), seconds.tolist(), frameNumbers.tolist())
+    else:
+        rows = ((f // (n * 3600), f % (n * 3600) // (n * 60), f % (n * 60) // n, f % n) for f in frames)
+    return [f"{h:02d}:{m:02d}:{s:02d}{separator}{f:02d}" for h, m, s, f in rows]
+
+
+def timecodesToFrames(timecodes: Iterable[str], rate: Any, subtractOneHour: bool = False) -> Frames:
+    np = _numpy()
+    rate = FrameRate.parse(rate)
+    fields = []
+    for timecode in timecodes:
+        m = TIMECODE_PATTERN.match(timecode.strip())
+        if m is None:
+            raise ValueError(f"Invalid timecode: {timecode!r}")
+        fields.append(tuple(int(value) for value in m.groups()))
+
+    n = rate.nominal
+    drop = rate.dropPerMinute
+    if np is not None:
+        h, m, s, f = np.array(fields, dtype=np.int64).reshape(-1, 4).T
+        totalMinutes = 60 * h + m
+        frames = n * 3600 * h + n * 60 * m + n * s + f - drop * (totalMinutes - totalMinutes // 10)
+    else:
+        frames = [
+            n * 3600 * h + n * 60 * m + n * s + f - drop * ((60 * h + m) - (60 * h + m) // 10)
+            for h, m, s, f in fields
+        ]
+
+    if subtractOneHour:
+        offset = oneHourFrames(rate)
+        frames = frames - offset if np is not None else [frame - offset for frame in frames]
+    return frames
+
+
+def frameToTimecode(frame: int, rate: Any, addOneHour: bool = False) -> str:
+    return framesToTimecodes([frame], rate, addOneHour)[0]
+
+
+def timecodeToFrame(timecode: str, rate: Any, subtractOneHour: bool = False) -> int:
+    return int(timecodesToFrames([timecode], rate, subtractOneHour)[0])
+
+
+_np = False
+
+
+def _numpy() -> Optional[Any]:
+    """The numpy module, None if it isn't installed. Imported on the first call."""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _asFrames(frames: Iterable[int]) -> Frames:
+    np = _numpy()
+    if np is not None:
+        return np.asarray(list(frames) if not isinstance(frames, (Sequence, np.ndarray)) else frames,
+                          dtype=np.int64).reshape(-1)
+    return [int(frame) for frame in frames]
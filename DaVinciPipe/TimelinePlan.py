@@ -0,0 +1,81 @@
+"""
+Timeline plans: the shots of a project with their newest version and record
+timecodes, as they would be laid out by DavinciHandle.importShotCollection.
+Written as JSON or as a CMX3600 EDL, without Qt or Resolve.
+"""
+import json
+import os
+import time
+from typing import Any, Iterable
+
+from DaVinciPipe import Timecode
+from DaVinciPipe.ShotRecords import asShots
+from DaVinciPipe.storage.atomicFile import writeAtomic
+
+EDL_REEL = "AX"
+
+
+def buildTimelinePlan(projectName: str, shots: Iterable[Any], rate: Any) -> dict[str, Any]:
+    """
+    Places every shot with a file at one hour plus its start frame, like
+    the import does. Shots without a file are listed under missing.
+    """
+    rate = Timecode.FrameRate.parse(rate)
+    placed = []
+    missing = []
+    for shot in asShots(shots):
+        (placed if shot.filePath else missing).append(shot)
+    placed.sort(key=lambda shot: shot.start)
+
+    recordStarts = [shot.start for shot in placed]
+    recordIn = Timecode.framesToTimecodes(recordStarts, rate, addOneHour=True)
+    recordOut = Timecode.framesToTimecodes(
+        [start + shot.duration for start, shot in zip(recordStarts, placed)], rate, addOneHour=True
+    )
+    sourceOut = Timecode.framesToTimecodes([shot.duration for shot in placed], rate)
+
+    return {
+        "project": projectName,
+        "fps": rate.fps,
+        "dropFrame": rate.dropFrame,
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "shots": [{
+            "id": shot.id,
+            "name": shot.name,
+            "start": shot.start,
+            "end": shot.end,
+            "duration": shot.duration,
+            "filePath": str(shot.filePath),
+            "recordIn": tcIn,
+            "recordOut": tcOut,
+            "sourceOut": tcSourceOut,
+        } for shot, tcIn, tcOut, tcSourceOut in zip(placed, recordIn, recordOut, sourceOut)],
+        "missing": [shot.name for shot in missing],
+    }
+
+
+def writePlanJson(plan: dict[str, Any], path: str) -> str:
+    writeAtomic(path, json.dumps(plan, indent=2))
+    return path
+
+
+def writeEdl(plan: dict[str, Any], path: str) -> str:
+    rate = Timecode.FrameRate(plan["fps"], plan["dropFrame"])
+    sourceIn = Timecode.frameToTimecode(0, rate)
+    lines = [
+        f"TITLE: {plan['project']}",
+        f"FCM: {'DROP FRAME' if rate.dropFrame else 'NON-DROP FRAME'}",
+        "",
+    ]
+    for event, shot in enumerate(plan["shots"], start=1):
+        lines.append(
+            f"{event:03d}  {EDL_REEL:<8} V     C        "
+            f"{sourceIn} {shot['sourceOut']} {shot['recordIn']} {shot['recordOut']}"
+        )
+        lines.append(f"* FROM CLIP NAME: {os.path.basename(shot['filePath'])}")
+        lines.append(f"* SOURCE FILE: {shot['filePath']}")
+        lines.append(f"* COMMENT: {shot['name']}")
+        lines.append("")
+    writeAtomic(path, "\n".join(lines))
+    return path
+
@@ -0,0 +1,342 @@
+"""
+Timing spans and call counts for the pipeline, the DavinciHandle, the
+version scan and the Resolve scripting bridge. Nothing is wrapped until
+enable() is called, so with tracing off the code runs unchanged. The
+collected spans export as Chrome-trace JSON (chrome://tracing, Perfetto)
+and as a summary table. Generators (iterTimelineItems) are timed while
+they are consumed, not when they are created.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Method names instrumented on every AbstractPipelineInterface subclass that defines them
+PIPE_METHODS = (
+    "getShotInformations", "_collectShotsFromPipeline", "getNewestVersion", "getNewestVersions",
+    "updateAllShots", "updateShot", "_getNewestVersionFile", "_scanFolders", "_get", "_getMany",
+    "_putMany", "_getPaged", "_fetchShots", "_fetchShotsPerShot", "_fetchShotsBulk", "_fetchShotsDelta",
+)
+# Per folder, shows how long the share takes to list one folder
+FILESYSTEM_METHODS = ("versionEntries",)
+
+# Values returned by the Resolve bridge that are data, not scripting objects
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class Tracer:
+    """
+    Collects complete spans ("X" events) with their thread and aggregates
+    calls, total and max time per name. Past maxEvents only the aggregates
+    keep growing.
+    """
+
+    def __init__(self, maxEvents: int = 200000):
+        self.maxEvents = maxEvents
+        self.events: list[dict[str, Any]] = []
+        self.stats: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def record(self, name: str, category: str, start: float, end: float):
+        duration = end - start
+        with self._lock:
+            stat = self.stats.get((category, name))
+            if stat is None:
+                self.stats[(category, name)] = [1, duration, duration]
+            else:
+                stat[0] += 1
+                stat[1] += duration
+                if duration > stat[2]:
+                    stat[2] = duration
+            if len(self.events) < self.maxEvents:
+                self.events.append({
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                })
+
+    @contextmanager
+    def span(self, name: str, category: str = "app") -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter())
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+            self.stats = {}
+            self._origin = time.perf_counter()
+
+    def summary(self) -> list[dict[str, Any]]:
+        """One row per traced name, slowest total first."""
+        with self._lock:
+            rows = [{
+                "category": category,
+                "name": name,
+                "calls": int(calls),
+                "totalMs": total * 1000,
+                "meanMs": total / calls * 1000,
+                "maxMs": maximum * 1000,
+            } for (category, name), (calls, total, maximum) in self.stats.items()]
+        return sorted(rows, key=lambda row: row["totalMs"], reverse=True)
+
+    def formatSummary(self, limit: int = 40) -> str:
+        rows = self.summary()
+        lines = [f"{'category':<11} {'name':<44} {'calls':>8} {'total ms':>11} {'mean ms':>9} {'max ms':>9}"]
+        for row in rows[:limit]:
+            lines.append(
+                f"{row['category']:<11} {row['name'][:44]:<44} {row['calls']:>8} "
+                f"{row['totalMs']:>11.1f} {row['meanMs']:>9.3f} {row['maxMs']:>9.1f}"
+            )
+        if len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more")
+        return "\n".join(lines)
+
+    def exportChromeTrace(self, path: str) -> str:
+        with self._lock:
+            threadNames = {thread.ident: thread.name for thread in threading.enumerate()}
+            metadata = [{
+                "name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                "args": {"name": threadNames.get(tid, str(tid))},
+            } for tid in {event["tid"] for event in self.events}]
+            trace = {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return path
+
+
+class TracedObject:
+    """
+    Proxy for a Resolve scripting object. Every method call is a span named
+    after the method, and scripting objects it returns are proxied too.
+    Proxies are unwrapped again when passed back into the bridge.
+    """
+    __slots__ = ("_target", "_tracer")
+
+    def __init__(self, target: Any, tracer: Tracer):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_tracer", tracer)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+        tracer = self._tracer
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attribute(*_unwrap(args), **_unwrap(kwargs))
+            finally:
+                tracer.record(name, "resolve", start, time.perf_counter())
+            return _wrap(result, tracer)
+
+        return call
+
+    def __eq__(self, other: Any) -> bool:
+        return self._target == _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._target)
+
+    def __bool__(self) -> bool:
+        return bool(self._target)
+
+    def __repr__(self) -> str:
+        return f"TracedObject({self._target!r})"
+
+
+_tracer: Optional[Tracer] = None
+_patches: list[tuple[type, str, Any]] = []
+_config: dict[str, Any] = {}
+
+
+def getTracer() -> Optional[Tracer]:
+    """The active tracer, None while tracing is off."""
+    return _tracer
+
+
+def enable(config: Optional[dict[str, Any]] = None) -> Tracer:
+    """Starts tracing and wraps the pipeline, handle and version scan methods."""
+    global _tracer, _config
+    if _tracer is not None:
+        return _tracer
+    from DaVinciPipe.DavinciHandle import DavinciHandle
+    from DaVinciPipe.PipelineInterfaces import AbstractPipelineInterface
+    from DaVinciPipe.VersionScanner import VersionScanner
+
+    _config = dict(config or {})
+    _tracer = Tracer(maxEvents=_config.get("maxEvents", 200000))
+
+    for pipelineClass in _subclasses(AbstractPipelineInterface):
+        for name in PIPE_METHODS:
+            if name in vars(pipelineClass):
+                _instrument(pipelineClass, name, "pipe")
+    # Methods inherited from AbstractEditingSoftwareHandle are wrapped on DavinciHandle
+    for name, attribute in _classAttributes(DavinciHandle).items():
+        if not name.startswith("__") and (isinstance(attribute, property) or callable(attribute)):
+            _instrument(DavinciHandle, name, "handle", attribute)
+    for name in FILESYSTEM_METHODS:
+        _instrument(VersionScanner, name, "filesystem")
+    return _tracer
+
+
+def enableFromConfig(config: Optional[dict[str, Any]]) -> Optional[Tracer]:
+    """Enables tracing if the config's tracing section says so."""
+    if config and config.get("enabled"):
+        return enable(config)
+    return None
+
+
+def disable():
+    """Restores the original methods and drops the tracer."""
+    global _tracer
+    while _patches:
+        cls, name, original = _patches.pop()
+        if original is None:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, original)
+    _tracer = None
+
+
+def traceResolve(resolve: Any) -> Any:
+    """Proxies the Resolve object while tracing is on, returns it unchanged otherwise."""
+    if _tracer is None or resolve is None:
+        return resolve
+    return TracedObject(resolve, _tracer)
+
+
+def flush(label: str = "session") -> Optional[str]:
+    """
+    Writes the Chrome trace, prints the summary table and starts a new
+    trace. Returns the trace path, or None while tracing is off.
+    """
+    if _tracer is None or not _tracer.stats:
+        return None
+    outputDir = _config.get("outputDir")
+    if not outputDir:
+        from appdirs import user_log_dir
+
+        outputDir = os.path.join(user_log_dir("ResolveKitsuTool"), "traces")
+    path = os.path.join(outputDir, f"trace_{label}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    _tracer.exportChromeTrace(path)
+    print(f"[INFO] Trace written to {path}")
+    print(_tracer.formatSummary(_config.get("summaryRows", 40)))
+    _tracer.reset()
+    return path
+
+
+def _instrument(cls: type, name: str, category: str, original: Any = None):
+    """Wraps the attribute name of cls, or original (inherited by cls) under that name."""
+    own = original is None or vars(cls).get(name) is original
+    if original is None:
+        original = vars(cls)[name]
+    spanName = f"{cls.__name__}.{name}"
+    if isinstance(original, property):
+        wrapped = property(_timed(original.fget, spanName, category), original.fset, original.fdel, original.__doc__)
+    elif isinstance(original, staticmethod):
+        wrapped = staticmethod(_timed(original.__func__, spanName, category))
+    elif isinstance(original, classmethod):
+        wrapped = classmethod(_timed(original.__func__, spanName, category))
+    elif inspect.isgeneratorfunction(original):
+        wrapped = _timedGenerator(original, spanName, category)
+    else:
+        wrapped = _timed(original, spanName, category)
+    setattr(cls, name, wrapped)
+    _patches.append((cls, name, original if own else None))
+
+
+def _timed(function: Callable, spanName: str, category: str) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            tracer.record(spanName, category, start, time.perf_counter())
+
+    return wrapper
+
+
+def _timedGenerator(function: Callable, spanName: str, category: str) -> Callable:
+    """
+    One span per generator, from its first step to its end, as long as the
+    time spent inside it: the consumer's work between items is left out.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return (yield from function(*args, **kwargs))
+        generator = function(*args, **kwargs)
+        first = None
+        busy = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                if first is None:
+                    first = start
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    busy += time.perf_counter() - start
+                yield item
+        finally:
+            generator.close()
+            if first is not None:
+                tracer.record(spanName, category, first, first + busy)
+
+    return wrapper
+
+
+def _classAttributes(cls: type) -> dict[str, Any]:
+    """The attributes of cls including inherited ones, without those of object."""
+    attributes = {}
+    for baseClass in reversed(cls.__mro__[:-1]):
+        attributes.update(vars(baseClass))
+    return attributes
+
+
+def _subclasses(cls: type) -> list[type]:
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_subclasses(subclass))
+    return classes
+
+
+def _wrap(value: Any, tracer: Tracer) -> Any:
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, list):
+        return [_wrap(item, tracer) for item in value]
+    if isinstance(value, dict):
+        return {key: _wrap(item, tracer) for key, item in value.items()}
+    return TracedObject(value, tracer)
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, TracedObject):
+        return value._target
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
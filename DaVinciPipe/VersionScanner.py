@@ -0,0 +1,286 @@
+import concurrent.futures
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from DaVinciPipe.NamingTemplates import NamingScheme, VersionEntry, versionKey
+from DaVinciPipe.Progress import ProgressCallback, checkCanceled, reportProgress
+from DaVinciPipe.storage.VersionIndexStore import VersionIndexStore
+
+
+class FolderVersions:
+    """
+    The version files of one folder, grouped by (camera, shot, ext) with
+    their versions sorted. Latest, latest per extension and a given version
+    are dictionary lookups, and two cameras in one folder stay apart.
+    """
+    __slots__ = ("folder", "byKey", "byKeyVersion", "latestByExt", "latest")
+
+    def __init__(self, folder: str, entries: Iterable[VersionEntry]):
+        self.folder = folder
+        self.byKey: dict[tuple[str, str, str], list[VersionEntry]] = {}
+        for entry in entries:
+            self.byKey.setdefault(versionKey(entry), []).append(entry)
+        self.byKeyVersion: dict[tuple[str, str, str], dict[int, VersionEntry]] = {}
+        self.latestByExt: dict[str, VersionEntry] = {}
+        self.latest: Optional[VersionEntry] = None
+        for key, keyEntries in self.byKey.items():
+            keyEntries.sort(key=lambda entry: entry[3])
+            self.byKeyVersion[key] = {entry[3]: entry for entry in keyEntries}
+            newest = keyEntries[-1]
+            if key[2] not in self.latestByExt or newest[3] > self.latestByExt[key[2]][3]:
+                self.latestByExt[key[2]] = newest
+            if self.latest is None or newest[3] > self.latest[3]:
+                self.latest = newest
+
+    def newest(self, ext: Optional[str] = None) -> Optional[Path]:
+        """Highest version in the folder, optionally of one extension only."""
+        entry = self.latest if ext is None else self.latestByExt.get(ext.lower().lstrip("."))
+        return self._path(entry)
+
+    def newestFor(self, camera: str, shot: str, ext: str) -> Optional[Path]:
+        entries = self.byKey.get((camera.lower(), shot.lower(), ext.lower()))
+        return self._path(entries[-1] if entries else None)
+
+    def version(self, camera: str, shot: str, ext: str, version: int) -> Optional[Path]:
+        return self._path(self.byKeyVersion.get((camera.lower(), shot.lower(), ext.lower()), {}).get(version))
+
+    def versionOfShot(self, camera: str, shot: str, version: int,
+                      extensions: Optional[Iterable[str]] = None) -> Optional[Path]:
+        """The given version of camera and shot in the first of extensions that has it, or in any extension."""
+        if extensions is not None:
+            for ext in extensions:
+                path = self.version(camera, shot, ext, version)
+                if path is not None:
+                    return path
+            return None
+        camera, shot = camera.lower(), shot.lower()
+        for (keyCamera, keyShot, _), entries in self.byKeyVersion.items():
+            if keyCamera == camera and keyShot == shot and version in entries:
+                return self._path(entries[version])
+        return None
+
+    def versions(self, camera: str, shot: str, ext: str) -> list[int]:
+        return [entry[3] for entry in self.byKey.get((camera.lower(), shot.lower(), ext.lower()), [])]
+
+    def _path(self, entry: Optional[VersionEntry]) -> Optional[Path]:
+        return None if entry is None else Path(self.folder) / entry[0]
+
+
+class VersionScanner:
+    """
+    Resolves the newest version file of many publish folders at once.
+    Folders are listed in a bounded thread pool, so one slow folder on the
+    network share does not hold back the others. File names are parsed with
+    the configured naming scheme.
+    """
+
+    def __init__(self, maxWorkers: int = 8, batchTimeout: float = 120.0, slowThreshold: float = 5.0,
+                 index: Optional[VersionIndexStore] = None, namingScheme: Optional[NamingScheme] = None):
+        self.maxWorkers = max(1, int(maxWorkers))
+        self.batchTimeout = batchTimeout
+        self.slowThreshold = slowThreshold
+        self.namingScheme = namingScheme or NamingScheme.default()
+        self.index = index
+        if index is not None:
+            index.setSignature(self.namingScheme.signature)
+        # folder -> (entries list it was built from, FolderVersions)
+        self._folderVersions: dict[str, tuple[list, FolderVersions]] = {}
+
+    @classmethod
+    def fromConfig(cls, config: Optional[dict[str, Any]]) -> "VersionScanner":
+        config = config or {}
+        index = None
+        if config.get("indexEnabled", True):
+            index = VersionIndexStore(maxEntries=config.get("indexMaxEntries", 20000))
+        return cls(
+            maxWorkers=config.get("maxWorkers", 8),
+            batchTimeout=config.get("batchTimeout", 120.0),
+            slowThreshold=config.get("slowThreshold", 5.0),
+            index=index,
+            namingScheme=NamingScheme.fromConfig(config.get("namingTemplates")),
+        )
+
+    def scanFolder(self, folderPath: Optional[str], forceRefresh: bool = False) -> Optional[Path]:
+        if not folderPath:
+            return None
+        versions = self.folderVersions(folderPath, forceRefresh)
+        return versions.newest() if versions is not None else None
+
+    def resolveFile(self, filePath: str, version: Union[str, int] = "latest",
+                    ext: Optional[str] = None, forceRefresh: bool = False) -> Optional[Path]:
+        """
+        Finds the latest (or the given) version of the file's own camera,
+        shot and extension in its folder. ext switches to another extension
+        of the same camera and shot. Files the naming scheme can't parse
+        fall back to the newest file of the folder.
+        """
+        folder = str(Path(filePath).parent)
+        versions = self.folderVersions(folder, forceRefresh)
+        if versions is None:
+            return None
+        return self._resolveIn(versions, filePath, version, ext)
+
+    def folderVersions(self, folderPath: str, forceRefresh: bool = False) -> Optional[FolderVersions]:
+        entries = self.versionEntries(folderPath, forceRefresh)
+        if entries is None:
+            return None
+        cached = self._folderVersions.get(folderPath)
+        # The index hands out the same list while the folder is unchanged
+        if cached is not None and cached[0] is entries:
+            return cached[1]
+        versions = FolderVersions(folderPath, entries)
+        self._folderVersions[folderPath] = (entries, versions)
+        return versions
+
+    def versionEntries(self, folderPath: str, forceRefresh: bool = False) -> Optional[list[list]]:
+        """
+        Returns the parsed version files of a folder as
+        [fileName, camera, shot, version, ext] lists, or None if the folder
+        does not exist. Uses the index when the folder mtime is unchanged.
+        """
+        try:
+            folderStat = os.stat(folderPath)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISDIR(folderStat.st_mode):
+            return None
+
+        if self.index is not None and not forceRefresh:
+            cached = self.index.get(folderPath, folderStat.st_mtime)
+            if cached is not None:
+                return cached
+
+        entries = []
+        with os.scandir(folderPath) as it:
+            for file in it:
+                if not file.is_file():
+                    continue
+                entry = self.namingScheme.parse(file.name)
+                if entry is not None:
+                    entries.append(entry)
+
+        if self.index is not None:
+            self.index.put(folderPath, folderStat.st_mtime, entries)
+        return entries
+
+    def invalidate(self, folderPath: Optional[str] = None):
+        if folderPath is None:
+            self._folderVersions.clear()
+        else:
+            self._folderVersions.pop(folderPath, None)
+        if self.index is not None:
+            self.index.invalidate(folderPath)
+            self.index.save()
+
+    def scanFolders(self, folders: Iterable[Optional[str]], forceRefresh: bool = False,
+                    progressCallback: Optional[ProgressCallback] = None,
+                    cancelEvent: Optional[threading.Event] = None) -> tuple[dict[str, Optional[Path]], dict[str, list]]:
+        """
+        Scans every folder once and returns a folder -> newest file map plus a
+        report of missing, failed, slow and timed out folders. Folders that did
+        not finish within batchTimeout map to None. Raises SyncCanceled when
+        cancelEvent is set.
+        """
+        versionsByFolder, report = self.scanFolderVersions(folders, forceRefresh, progressCallback, cancelEvent)
+        newestByFolder = {
+            folder: versions.newest() if versions is not None else None
+            for folder, versions in versionsByFolder.items()
+        }
+        return newestByFolder, report
+
+    def resolveFiles(self, filePaths: Iterable[Optional[str]], version: Union[str, int] = "latest",
+                     forceRefresh: bool = False, progressCallback: Optional[ProgressCallback] = None,
+                     cancelEvent: Optional[threading.Event] = None) -> tuple[dict[str, Optional[Path]], dict[str, list]]:
+        """
+        resolveFile for many files: every folder is scanned once, then each
+        file is matched to its own camera, shot and extension.
+        """
+        filePaths = [str(filePath) for filePath in filePaths if filePath]
+        versionsByFolder, report = self.scanFolderVersions(
+            (str(Path(filePath).parent) for filePath in filePaths), forceRefresh, progressCallback, cancelEvent
+        )
+        resolved = {}
+        for filePath in filePaths:
+            versions = versionsByFolder.get(str(Path(filePath).parent))
+            resolved[filePath] = self._resolveIn(versions, filePath, version) if versions is not None else None
+        return resolved, report
+
+    def scanFolderVersions(self, folders: Iterable[Optional[str]], forceRefresh: bool = False,
+                           progressCallback: Optional[ProgressCallback] = None,
+                           cancelEvent: Optional[threading.Event] = None
+                           ) -> tuple[dict[str, Optional[FolderVersions]], dict[str, list]]:
+        """scanFolders, returning the whole FolderVersions of every folder."""
+        uniqueFolders = list(dict.fromkeys(str(folder) for folder in folders if folder))
+        versionsByFolder: dict[str, Optional[FolderVersions]] = {folder: None for folder in uniqueFolders}
+        report = {"missing": [], "failed": [], "slow": [], "timedOut": []}
+        if not uniqueFolders:
+            return versionsByFolder, report
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(self.maxWorkers, len(uniqueFolders)))
+        try:
+            futures = {executor.submit(self._timedScan, folder, forceRefresh): folder for folder in uniqueFolders}
+            pending = set(futures)
+            deadline = time.monotonic() + self.batchTimeout
+            doneCount = 0
+            reportProgress(progressCallback, doneCount, len(uniqueFolders))
+
+            while pending:
+                checkCanceled(cancelEvent)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=min(remaining, 0.2), return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    folder = futures[future]
+                    doneCount += 1
+                    reportProgress(progressCallback, doneCount, len(uniqueFolders))
+                    try:
+                        versions, seconds = future.result()
+                    except OSError as e:
+                        report["failed"].append((folder, str(e)))
+                        continue
+                    if seconds >= self.slowThreshold:
+                        report["slow"].append((folder, seconds))
+                    if versions is None or versions.latest is None:
+                        report["missing"].append(folder)
+                    versionsByFolder[folder] = versions
+
+            report["timedOut"] = [futures[future] for future in pending]
+        finally:
+            # Don't wait for folders that hang on the share
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.index is not None:
+                self.index.save()
+
+        return versionsByFolder, report
+
+    def _timedScan(self, folder: str, forceRefresh: bool) -> tuple[Optional[FolderVersions], float]:
+        start = time.perf_counter()
+        versions = self.folderVersions(folder, forceRefresh)
+        return versions, time.perf_counter() - start
+
+    def _resolveIn(self, versions: FolderVersions, filePath: str, version: Union[str, int] = "latest",
+                   ext: Optional[str] = None) -> Optional[Path]:
+        entry = self.namingScheme.parse(Path(filePath).name)
+        if entry is None:
+            return versions.newest(ext)
+        camera, shot, ownExt = entry[1], entry[2], ext.lstrip(".") if ext else entry[4]
+        if version == "latest":
+            return versions.newestFor(camera, shot, ownExt)
+        return versions.version(camera, shot, ownExt, int(version))
+
+
+def printScanReport(report: dict[str, list]) -> None:
+    for folder, error in report.get("failed", []):
+        print(f"[WARNING] Could not scan folder {folder}: {error}")
+    for folder, seconds in report.get("slow", []):
+        print(f"[WARNING] Slow folder ({seconds:.1f}s): {folder}")
+    for folder in report.get("timedOut", []):
+        print(f"[WARNING] Folder scan timed out: {folder}")
@@ -0,0 +1,135 @@
+"""
+Headless batch runner: resolves the shots and newest versions of one or
+more Kitsu projects and writes timeline plans (JSON and/or EDL), without
+Qt or Resolve. Projects are spread over a process pool; every worker logs
+in with the session stored by the UI (CredentialStore).
+
+    python -m DaVinciPipe.cli --projects hamster otter --output plans --format json edl --workers 4
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+from typing import Any, Optional
+
+from DaVinciPipe.main import _addVendorToSyspath, _loadDefaultConfig
+
+
+def planProject(projectName: str, config: dict[str, Any], outputDir: str, formats: list[str]) -> dict[str, Any]:
+    """Runs in a worker process; returns a summary, errors included, so one project can't stop the batch."""
+    from DaVinciPipe.PipelineInterfaces import AsyncKitsuPipeline, KitsuPipeline
+    from DaVinciPipe.TimelinePlan import buildTimelinePlan, writeEdl, writePlanJson
+
+    start = time.perf_counter()
+    summary = {"project": projectName, "shots": 0, "missing": 0, "outputs": [], "error": None}
+    pipe = None
+    try:
+        pipelineClass = AsyncKitsuPipeline if config.get("kitsu", {}).get("asyncClient") else KitsuPipeline
+        pipe = pipelineClass(None, appConfig=config, interactive=False)
+        if not pipe.passedLogin:
+            raise RuntimeError("Login failed, log in once through the UI to store a session")
+        pipe.config = {**pipe.config, "project_name": projectName}
+
+        shots = pipe.getShotInformations()
+        plan = buildTimelinePlan(projectName, shots, config.get("fps", 24))
+        summary["shots"] = len(plan["shots"])
+        summary["missing"] = len(plan["missing"])
+
+        baseName = os.path.join(outputDir, _safeName(projectName))
+        if "json" in formats:
+            summary["outputs"].append(writePlanJson(plan, baseName + ".json"))
+        if "edl" in formats:
+            summary["outputs"].append(writeEdl(plan, baseName + ".edl"))
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if pipe is not None:
+            pipe.close()
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def runBatch(projectNames: list[str], config: dict[str, Any], outputDir: str, formats: list[str],
+             workers: int) -> list[dict[str, Any]]:
+    workers = max(1, min(workers, len(projectNames)))
+    summaries = []
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_initWorker, initargs=(config,)) as executor:
+        futures = {
+            executor.submit(planProject, projectName, config, outputDir, formats): projectName
+            for projectName in projectNames
+        }
+        for future in concurrent.futures.as_completed(futures):
+            summary = future.result()
+            _printSummary(summary)
+            summaries.append(summary)
+    return sorted(summaries, key=lambda summary: projectNames.index(summary["project"]))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m DaVinciPipe.cli", description=__doc__.strip(),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", help="Config file, defaults to config/default.json")
+    parser.add_argument("--projects", nargs="+", help="Kitsu project names, defaults to the config's project_name")
+    parser.add_argument("--output", default="plans", help="Folder for the plan files")
+    parser.add_argument("--format", nargs="+", choices=("json", "edl"), default=["json"], dest="formats")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--fps", help="Timeline frame rate, like 24, 23.976 or \"29.97 DF\"")
+    parser.add_argument("--summary", help="Also write the batch summary as JSON to this path")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    else:
+        config = _loadDefaultConfig()
+    if args.fps:
+        config["fps"] = args.fps
+    _initWorker(config)
+
+    # A project given twice would be planned twice, both writing the same files
+    projectNames = list(dict.fromkeys(args.projects or [config.get("kitsu", {}).get("project_name")]))
+    if not all(projectNames):
+        parser.error("No project given and none in the config")
+    outputNames = {}
+    for projectName in projectNames:
+        other = outputNames.setdefault(_safeName(projectName), projectName)
+        if other != projectName:
+            parser.error(f"Projects {other!r} and {projectName!r} would write the same plan files")
+
+    summaries = runBatch(projectNames, config, args.output, args.formats, args.workers)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+    failed = [summary for summary in summaries if summary["error"]]
+    print(f"[INFO] {len(summaries) - len(failed)} of {len(summaries)} project(s) planned")
+    return 1 if failed else 0
+
+
+def _initWorker(config: dict[str, Any]):
+    # Farm nodes may not mount the vendor share; gazu can come from the environment
+    try:
+        _addVendorToSyspath(config)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"[WARNING] {e}")
+
+
+def _printSummary(summary: dict[str, Any]):
+    if summary["error"]:
+        print(f"[ERROR] {summary['project']}: {summary['error']}")
+        return
+    print(
+        f"[INFO] {summary['project']}: {summary['shots']} shot(s), {summary['missing']} without file, "
+        f"{summary['seconds']:.1f}s -> {', '.join(summary['outputs'])}"
+    )
+
+
+def _safeName(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,11 @@
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Any, Dict
 
-from PySide6.QtGui import QIcon
-
-from ui.mainUi import MainUi
-from ui.style import appStyle
-
-vendor = r"N:\vendor"
-if vendor not in sys.path:
-    sys.path.insert(0, vendor)
-
-from DaVinciPipe.DavinciHandle import DavinciHandle
-from DaVinciPipe.PipelineInterfaces import AbstractPipelineInterface, KitsuPipeline, ShotgridPipeline
-
-from PySide6.QtWidgets import QApplication
+# Qt, gazu and the UI are imported in main(), after the vendor folder is on
+# sys.path, so importing this module from Resolve's script menu stays cheap.
 
 mainWindow = None
 
@@ -28,7 +18,8 @@ def _addVendorToSyspath(config: dict[str, Any]) -> None:
         raise FileNotFoundError(f"Could not find Vendor-Folder: {vendorsPath}")
     vendorStr = str(vendorsPath)
     if vendorStr not in sys.path:
-        sys.path.insert(0, vendorStr)
+        # Appended, so stdlib lookups don't go through the network share first
+        sys.path.append(vendorStr)
 
 
 def _loadDefaultConfig() -> Dict[str, Any]:
@@ -45,11 +36,26 @@ def _loadDefaultConfig() -> Dict[str, Any]:
 
 def main(editingObject, config: dict[str, Any] = None):
     global mainWindow
+    startTime = time.perf_counter()
 
     if config is None:
         config = _loadDefaultConfig()
 
     _addVendorToSyspath(config)
+
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+
+    from DaVinciPipe import Tracing
+    from DaVinciPipe.DavinciHandle import DavinciHandle
+    from DaVinciPipe.PipelineInterfaces import (
+        AbstractPipelineInterface, AsyncKitsuPipeline, KitsuPipeline, ShotgridPipeline
+    )
+    from ui.mainUi import MainUi
+    from ui.style import appStyle
+
+    Tracing.enableFromConfig(config.get("tracing"))
+
     print(sys.path)
     try:
         print(editingObject)
@@ -74,17 +80,19 @@ def main(editingObject, config: dict[str, Any] = None):
         if manager == "shotgrid":
             pipe = ShotgridPipeline() or None
         elif manager == "kitsu":
-            config = config.get("kitsu")
-            pipe = KitsuPipeline(app) or None
+            # The async client needs aiohttp in the vendor folder
+            pipelineClass = AsyncKitsuPipeline if config.get("kitsu", {}).get("asyncClient") else KitsuPipeline
+            pipe = pipelineClass(app, appConfig=config) or None
         else:
             print(f"[ERROR] Config error: unknown manager: {config.get('manager')}")
         if pipe is None:
             print("Pipe is None")
             return
-        handle: DavinciHandle = DavinciHandle(pipe, editingObject, config)
+        handle: DavinciHandle = DavinciHandle(pipe, Tracing.traceResolve(editingObject), config)
 
         mainWindow = MainUi(handle=handle)
         mainWindow.show()
+        print(f"[INFO] Window shown after {time.perf_counter() - startTime:.2f}s")
 
         if appWasCreatedHere:
             app.exec()
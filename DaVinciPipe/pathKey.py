@@ -0,0 +1,10 @@
+import os
+
+
+def pathKey(path) -> str:
+    """
+    The key paths are compared and looked up by: normalized, without a
+    trailing separator, and case-folded on Windows. Files and folders use
+    the same key, so a folder key matches the key of a file's parent.
+    """
+    return os.path.normcase(os.path.normpath(str(path)))
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from DaVinciPipe.storage.atomicFile import fileLock, writeJsonAtomic
+
+
+class CacheStore:
+    """
+    Small key/value cache with a time-to-live per entry, kept in one JSON
+    file. For lookups that rarely change (the logged-in user, project ids),
+    so a cold start does not wait for the server. Every change is merged
+    into the file's current content, so processes sharing it keep each
+    other's entries.
+    """
+
+    def __init__(self, appName="ResolveKitsuTool", fileName="cache.json"):
+        from appdirs import user_data_dir
+
+        self.dataDir = user_data_dir(appName)
+        os.makedirs(self.dataDir, exist_ok=True)
+        self.path = os.path.join(self.dataDir, fileName)
+        # The session check writes from a background thread
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        """The value stored under key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expiresAt"] < time.time():
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: float):
+        entry = {"value": value, "expiresAt": time.time() + ttl}
+        with self._lock:
+            self._entries[key] = entry
+            self._save(lambda entries: entries.__setitem__(key, entry))
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drops one entry, or all of them."""
+        with self._lock:
+            if key is None:
+                self._entries = {}
+                self._save(lambda entries: entries.clear())
+            elif self._entries.pop(key, None) is not None:
+                self._save(lambda entries: entries.pop(key, None))
+
+    def _load(self, report: bool = True) -> dict[str, dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            if report:
+                print(f"[WARNING] Cache corrupted, starting empty: {e}")
+            return {}
+        # Expired entries are dropped on the next save
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if entry.get("expiresAt", 0) >= now}
+
+    def _save(self, change: Callable[[dict[str, dict[str, Any]]], Any]):
+        """Applies change to the file's current entries; the cache is only an optimization, errors are logged."""
+        try:
+            with fileLock(self.path):
+                entries = self._load(report=False)
+                change(entries)
+                writeJsonAtomic(self.path, entries)
+        except OSError as e:
+            print(f"[WARNING] Could not save the cache: {e}")
+            return
+        self._entries = entries
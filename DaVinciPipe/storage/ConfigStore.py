@@ -1,11 +1,11 @@
 import json
 import os
 
-from appdirs import user_data_dir
-
 
 class ConfigStore:
     def __init__(self, appName="ResolveKitsuTool"):
+        from appdirs import user_data_dir
+
         self.dataDir = user_data_dir(appName)
         os.makedirs(self.dataDir, exist_ok=True)
         self.path = os.path.join(self.dataDir, "config_path.json")
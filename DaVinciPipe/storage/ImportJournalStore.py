@@ -0,0 +1,102 @@
+import json
+import os
+import re
+from typing import Any, Iterable, Optional
+
+
+class ImportJournalStore:
+    """
+    Append-only JSONL journal of one timeline build, so a build that crashed
+    halfway can be resumed. The first line is the plan (the files to
+    import), then one line per imported chunk and per appended chunk; the
+    file is removed once the build finished. Records are buffered and
+    written with one fsync per commit, the caller commits after every
+    operation that must not run twice.
+    """
+
+    def __init__(self, appName="ResolveKitsuTool"):
+        from appdirs import user_data_dir
+
+        self.dataDir = os.path.join(user_data_dir(appName), "journals")
+        os.makedirs(self.dataDir, exist_ok=True)
+        self.syncCount = 0
+        self._file = None
+        self._path = None
+        self._buffer: list[str] = []
+
+    def loadPending(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        The state of an unfinished build: planned paths, the imported paths
+        in import order and the set of appended entries. None if there is
+        no journal for key.
+        """
+        path = self._pathFor(key)
+        if not os.path.exists(path):
+            return None
+        state = None
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from the crash
+                    break
+                op = record.get("op") if isinstance(record, dict) else None
+                if op == "plan":
+                    state = {"paths": record.get("paths", []), "imported": [], "appended": set()}
+                elif state is not None and op == "imported":
+                    state["imported"].extend(record.get("entries", []))
+                elif state is not None and op == "appended":
+                    state["appended"].update(record.get("entries", []))
+        return state
+
+    def begin(self, key: str, paths: list[str], resume: bool = False):
+        """Opens the journal of key; unless resuming, it starts over with a new plan."""
+        self.close()
+        self._path = self._pathFor(key)
+        if resume:
+            self._dropTornLine(self._path)
+        self._file = open(self._path, "a" if resume else "w", encoding="utf-8")
+        if not resume:
+            self.record("plan", paths=paths)
+            self.commit()
+
+    def record(self, op: str, entries: Iterable[str] = (), **fields):
+        self._buffer.append(json.dumps({"op": op, "entries": list(entries), **fields}) + "\n")
+
+    def commit(self):
+        if self._file is None or not self._buffer:
+            return
+        self._file.write("".join(self._buffer))
+        self._buffer = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncCount += 1
+
+    def finish(self):
+        """The build is complete, its journal is not needed anymore."""
+        path = self._path
+        self._buffer = []
+        self.close()
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def close(self):
+        """Writes what is buffered and closes the file; the journal stays for a resume."""
+        if self._file is not None:
+            self.commit()
+            self._file.close()
+        self._file = None
+        self._path = None
+
+    @staticmethod
+    def _dropTornLine(path: str):
+        """Cuts a partly written last line, so appended records start on their own line."""
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _pathFor(self, key: str) -> str:
+        safeKey = re.sub(r"[^A-Za-z0-9_-]", "_", key)
+        return os.path.join(self.dataDir, f"import_{safeKey}.jsonl")
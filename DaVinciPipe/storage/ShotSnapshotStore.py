@@ -0,0 +1,42 @@
+import json
+import os
+import re
+from typing import Any, Optional
+
+from DaVinciPipe.storage.atomicFile import writeJsonAtomic
+
+
+class ShotSnapshotStore:
+    """
+    Local copy of a project's Kitsu shots and sequence names, plus the time
+    of the last sync, so later fetches only need the changes.
+    """
+
+    def __init__(self, appName="ResolveKitsuTool"):
+        from appdirs import user_data_dir
+
+        self.dataDir = os.path.join(user_data_dir(appName), "snapshots")
+        os.makedirs(self.dataDir, exist_ok=True)
+
+    def saveSnapshot(self, projectId: str, snapshot: dict[str, Any]):
+        writeJsonAtomic(self._path(projectId), snapshot)
+
+    def loadSnapshot(self, projectId: str) -> Optional[dict[str, Any]]:
+        path = self._path(projectId)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Shot snapshot corrupted, fetching all shots: {e}")
+            return None
+
+    def clear(self, projectId: str):
+        path = self._path(projectId)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _path(self, projectId: str) -> str:
+        safeId = re.sub(r"[^A-Za-z0-9_-]", "_", projectId)
+        return os.path.join(self.dataDir, f"shots_{safeId}.json")
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from DaVinciPipe.storage.atomicFile import fileLock, writeJsonAtomic
+
+# Directory mtimes on network shares can be coarse. A folder that was
+# scanned within this many seconds of its mtime is re-listed next time.
+MTIME_SETTLE_SECONDS = 2.0
+
+
+class VersionIndexStore:
+    """
+    Persistent index of parsed version files per publish folder, keyed by
+    the folder's mtime. Folders whose mtime did not change are not re-listed.
+    The signature of the naming scheme is stored with it; an index parsed
+    with other templates is dropped. Several processes can share the file:
+    save merges this process's changes into what is on disk. Hits only
+    update the access order in memory, so a scan that found nothing new
+    doesn't rewrite the file; the order is written with the next change.
+    """
+
+    def __init__(self, appName="ResolveKitsuTool", maxEntries: int = 20000):
+        from appdirs import user_data_dir
+
+        self.dataDir = user_data_dir(appName)
+        os.makedirs(self.dataDir, exist_ok=True)
+        self.path = os.path.join(self.dataDir, "version_index.json")
+        self.maxEntries = maxEntries
+        self._signature: Optional[str] = None
+        self._folders: Optional[dict[str, dict]] = None
+        self._dirty = False
+        # Changes since the last save, merged into the file's current content
+        self._changed: set[str] = set()
+        self._removed: set[str] = set()
+        self._cleared = False
+        # Folder -> time of the last hit since the last save
+        self._usedAt: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def setSignature(self, signature: str):
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                # Checked against the file on the next load
+                self._folders = None
+
+    def get(self, folder: str, mtime: float) -> Optional[list[list]]:
+        with self._lock:
+            record = self._load().get(folder)
+            if record is None or record["mtime"] != mtime:
+                return None
+            if record["scannedAt"] - mtime < MTIME_SETTLE_SECONDS:
+                return None
+            self._usedAt[folder] = time.time()
+            return record["entries"]
+
+    def put(self, folder: str, mtime: float, entries: list[list]):
+        now = time.time()
+        with self._lock:
+            self._load()[folder] = {
+                "mtime": mtime,
+                "scannedAt": now,
+                "lastUsed": now,
+                "entries": entries,
+            }
+            self._changed.add(folder)
+            self._removed.discard(folder)
+            self._dirty = True
+
+    def invalidate(self, folder: Optional[str] = None):
+        """Forgets one folder, or the whole index if no folder is given."""
+        with self._lock:
+            if folder is None:
+                self._folders = {}
+                self._cleared = True
+                self._changed.clear()
+                self._removed.clear()
+                self._usedAt.clear()
+            else:
+                self._load().pop(folder, None)
+                self._changed.discard(folder)
+                self._removed.add(folder)
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            own = self._load()
+            try:
+                with fileLock(self.path):
+                    folders = {} if self._cleared else (self._readFolders() or {})
+                    for folder in self._removed:
+                        folders.pop(folder, None)
+                    for folder in self._changed:
+                        if folder in own:
+                            folders[folder] = own[folder]
+                    for folder, usedAt in self._usedAt.items():
+                        record = folders.get(folder)
+                        if record is not None and usedAt > record["lastUsed"]:
+                            record["lastUsed"] = usedAt
+                    if len(folders) > self.maxEntries:
+                        # Evict the least recently used folders
+                        keep = sorted(folders.items(), key=lambda item: item[1]["lastUsed"], reverse=True)
+                        folders = dict(keep[:self.maxEntries])
+                    writeJsonAtomic(self.path, {"version": 1, "signature": self._signature, "folders": folders})
+            except OSError as e:
+                # The scan results are still valid, only the next run re-lists more folders
+                print(f"[WARNING] Could not save the version index: {e}")
+                return
+            self._folders = folders
+            self._changed.clear()
+            self._removed.clear()
+            self._usedAt.clear()
+            self._cleared = False
+            self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        if self._folders is None:
+            self._folders = self._readFolders(report=True)
+            if self._folders is None:
+                # Written with other templates, replaced on the next save
+                self._folders = {}
+                self._cleared = True
+                self._dirty = True
+        return self._folders
+
+    def _readFolders(self, report: bool = False) -> Optional[dict[str, dict]]:
+        """The folders in the file, {} if there is none, None if it was written with other templates."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            if report:
+                print(f"[WARNING] Version index corrupted, rebuilding: {e}")
+            return {}
+        if data.get("signature") != self._signature:
+            if report:
+                print("[INFO] Naming templates changed, rebuilding the version index")
+            return None
+        return data.get("folders", {})
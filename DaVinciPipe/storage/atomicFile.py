@@ -0,0 +1,76 @@
+"""
+Atomic writes and a cross-process file lock for the stores. The CLI's
+worker processes save the same cache and index files, so every writer
+gets its own temp file and read-merge-write happens under the lock.
+"""
+import contextlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Iterator
+
+# Give up on a lock held this long, the holder probably died
+LOCK_TIMEOUT = 30.0
+
+
+def writeAtomic(path: str, text: str):
+    """Writes text to a temp file next to path and moves it in place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmpPath = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmpPath, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmpPath)
+        raise
+
+
+def writeJsonAtomic(path: str, data: Any):
+    writeAtomic(path, json.dumps(data))
+
+
+@contextlib.contextmanager
+def fileLock(path: str, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Holds an exclusive lock on path + ".lock" across processes."""
+    with open(path + ".lock", "a+b") as f:
+        deadline = time.monotonic() + timeout
+        while not _tryLock(f):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for the lock on {path}")
+            time.sleep(0.01)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _tryLock(f) -> bool:
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _tryLock(f) -> bool:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
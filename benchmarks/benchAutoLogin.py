@@ -0,0 +1,65 @@
+"""
+Time until the UI may open with a stored session, against a local fake
+Kitsu server with increasing latency. Compares the blocking validation
+(one get_current_user round trip before the window) with KitsuSession,
+which checks the token expiry locally and validates in the background.
+
+    python -m benchmarks.benchAutoLogin --latencies 0 0.2 1.0
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import gazu
+
+from DaVinciPipe.KitsuSession import KitsuSession
+from DaVinciPipe.storage.CacheStore import CacheStore
+from DaVinciPipe.storage.CredentialStore import CredentialStore
+from benchmarks.fakeKitsuServer import FakeKitsuServer, buildDataset, fakeJwt
+from benchmarks.offlinePipeline import BENCHMARK_APP_NAME
+
+CASES = (
+    ("valid access token", 3600),
+    ("expired, refreshable", -3600),
+)
+
+
+def blockingLogin(apiUrl: str, tokens) -> float:
+    start = time.perf_counter()
+    gazu.client.set_host(apiUrl)
+    gazu.client.default_client.tokens = dict(tokens)
+    gazu.client.get_current_user()
+    return time.perf_counter() - start
+
+
+def sessionLogin(apiUrl: str, tokens) -> tuple[float, float]:
+    """Seconds until start() returned, and until the first request may be sent."""
+    credentials = CredentialStore(appName=BENCHMARK_APP_NAME)
+    session = KitsuSession(apiUrl, tokens, credentials, CacheStore(appName=BENCHMARK_APP_NAME))
+    start = time.perf_counter()
+    assert session.start()
+    started = time.perf_counter() - start
+    assert session.wait()
+    ready = time.perf_counter() - start
+    session._thread.join()
+    return started, ready
+
+
+def run(latencies: list[float]):
+    print(f"{'latency':>8} {'stored session':>22} {'blocking':>9} {'window':>9} {'request':>9}")
+    for latency in latencies:
+        with FakeKitsuServer(buildDataset(1), latency=latency) as server:
+            for case, accessExpiresIn in CASES:
+                tokens = {"access_token": fakeJwt(accessExpiresIn), "refresh_token": fakeJwt(30 * 86400)}
+                blocking = blockingLogin(server.apiUrl, tokens)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    started, ready = sessionLogin(server.apiUrl, tokens)
+                print(f"{latency:>8.2f} {case:>22} {blocking:>9.3f} {started:>9.4f} {ready:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.0, 0.2, 1.0],
+                        help="Seconds added to every Kitsu request")
+    run(parser.parse_args().latencies)
@@ -0,0 +1,93 @@
+"""
+Compares updating every timeline of several projects one by one with the
+batch update (DavinciHandle.updateProjects), which resolves each publish
+folder once. Uses the fake Resolve object model and a synthetic publish
+tree; reels of a project share part of their shots.
+
+    python -m benchmarks.benchBatchSync --shots 1000 --projects 3 --timelines 4
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from DaVinciPipe.ShotRecords import Shot
+from DaVinciPipe.VersionScanner import VersionScanner
+from benchmarks.fakeResolve import FakeResolve
+from benchmarks.offlinePipeline import makeKitsuPipeline
+from benchmarks.publishTree import generatePublishTree, publishNewVersion
+
+
+class CountingScanner(VersionScanner):
+    """Counts folder listings; without an index every scan hits the disk."""
+
+    def __init__(self):
+        super().__init__(index=None)
+        self.folderScans = 0
+
+    def versionEntries(self, folderPath, forceRefresh=False):
+        self.folderScans += 1
+        return super().versionEntries(folderPath, forceRefresh)
+
+
+def buildHandle(folders: list[str], projectNames: list[str], timelineNames: list[str]):
+    resolve = FakeResolve(projectNames=projectNames, timelineNames=timelineNames)
+    scanner = CountingScanner()
+    handle = DavinciHandle(makeKitsuPipeline("http://127.0.0.1:1/api", versionScanner=scanner), resolve, {})
+    shots = [Shot(f"shot{i}", i * 48, i * 48 + 47, 48, f"{folder}/cam_sh{i:05d}_v001.mov")
+             for i, folder in enumerate(folders)]
+
+    # Every reel holds half of the shots, neighbouring reels overlap
+    step = max(1, len(shots) // (2 * len(timelineNames)))
+    for projectName in projectNames:
+        handle.loadProject(projectName)
+        for index, timeline in enumerate(handle.listTimelines()):
+            handle.project.SetCurrentTimeline(timeline)
+            handle.importShotCollection(shots[index * step:index * step + len(shots) // 2])
+    handle.loadProject(projectNames[0])
+    return handle, resolve, scanner
+
+
+def updateOneByOne(handle: DavinciHandle, projectNames: list[str]) -> int:
+    """What conforming by hand costs: every timeline updated on its own."""
+    replaced = 0
+    for projectName in projectNames:
+        handle.loadProject(projectName)
+        for timeline in handle.listTimelines():
+            handle._timeline = timeline
+            replaced += len(handle.updateTimeline()["replaced"])
+    return replaced
+
+
+def run(shotCount: int, projectCount: int, timelineCount: int, changedRatio: float):
+    projectNames = [f"ep{i + 1:02d}" for i in range(projectCount)]
+    timelineNames = [f"reel{i + 1}" for i in range(timelineCount)]
+    print(f"{'mode':>12} {'folder scans':>13} {'bridge calls':>13} {'replaced':>9} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as root:
+        folders = generatePublishTree(root, shotCount, versionsPerShot=1)
+        for folder in folders[::max(1, round(1 / changedRatio))]:
+            publishNewVersion(folder)
+
+        for mode in ("one-by-one", "batch"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                handle, resolve, scanner = buildHandle(folders, projectNames, timelineNames)
+                resolve.bridge.reset()
+                start = time.perf_counter()
+                if mode == "batch":
+                    replaced = handle.updateProjects(projectNames)["replaced"]
+                else:
+                    replaced = updateOneByOne(handle, projectNames)
+                elapsed = time.perf_counter() - start
+            print(f"{mode:>12} {scanner.folderScans:>13} {resolve.bridge.total:>13} {replaced:>9} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=3)
+    parser.add_argument("--timelines", type=int, default=4, help="Timelines per project")
+    parser.add_argument("--changedRatio", type=float, default=0.1, help="Share of shots getting a new version")
+    args = parser.parse_args()
+    run(args.shots, args.projects, args.timelines, args.changedRatio)
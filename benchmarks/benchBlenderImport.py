@@ -0,0 +1,105 @@
+"""
+Builds a Blender sequencer edit from a shot list against the stub bpy,
+reads it back and updates it to newly published versions. Every tenth
+shot is an alternate cut on top of its neighbour. The per-shot rows are
+the previous import: one new_movie per shot on channel 1, untrimmed, so
+overlapping strips collide.
+
+    python -m benchmarks.benchBlenderImport --shots 2000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from DaVinciPipe.AbstractEditingSoftware import BlenderHandle
+from DaVinciPipe.ShotRecords import Shot
+from benchmarks.fakeBpy import FakeBpy
+from benchmarks.offlinePipeline import makeKitsuPipeline
+from benchmarks.publishTree import generatePublishTree, publishNewVersion
+
+
+def buildShots(folders: list[str]) -> list[Shot]:
+    shots = []
+    for i, folder in enumerate(folders):
+        filePath = os.path.join(folder, f"cam_sh{i:05d}_v001.mov")
+        shots.append(Shot(f"sh{i:05d}", i * 48, i * 48 + 47, 48, filePath))
+        if i % 10 == 9:
+            # An alternate of the shot over the second half of it
+            shots.append(Shot(f"sh{i:05d}_alt", i * 48 + 24, i * 48 + 47, 24, filePath))
+    return shots
+
+
+def importPerShot(handle: BlenderHandle, shots: list[Shot]):
+    """The previous import, for comparison."""
+    for shot in shots:
+        handle.sequenceEditor.sequences.new_movie(
+            name=shot["name"], filepath=str(shot["filePath"]), channel=1, frame_start=shot["start"],
+        )
+
+
+def checkReadback(handle: BlenderHandle, shots: list[Shot]):
+    clips = {(clip["filePath"], clip["start"]): clip for clip in handle.getTimelineInfo()}
+    assert len(clips) == len(shots), "Strips are missing or doubled"
+    for shot in shots:
+        clip = clips[(str(shot["filePath"]), shot["start"])]
+        assert (clip["end"], clip["duration"]) == (shot["end"], shot["duration"]), f"Wrong range: {clip}"
+
+
+def run(shotCount: int, movieLength: int, changedRatio: float):
+    print(f"{'mode':>9} {'run':>9} {'bpy calls':>10} {'strips':>7} {'channels':>9} {'collisions':>11} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as root:
+        folders = generatePublishTree(root, shotCount, versionsPerShot=1, extraFilesPerShot=0)
+        shots = buildShots(folders)
+
+        for mode in ("per-shot", "batched"):
+            bpy = FakeBpy(movieLength=movieLength)
+            handle = BlenderHandle(makeKitsuPipeline("http://127.0.0.1:1/api"), {}, bpy)
+            for run in ("first", "reimport"):
+                bpy.calls.clear()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if mode == "batched":
+                        handle.importShotCollection(shots)
+                    else:
+                        importPerShot(handle, shots)
+                elapsed = time.perf_counter() - start
+                strips = bpy.strips
+                print(f"{mode:>9} {run:>9} {sum(bpy.calls.values()):>10} {len(strips):>7} "
+                      f"{len({strip.channel for strip in strips}):>9} {bpy.collisions():>11} {elapsed:>9.3f}")
+
+        checkReadback(handle, shots)
+        start = time.perf_counter()
+        clips = handle.getTimelineInfo()
+        print(f"\nreadback: {len(clips)} clip(s) in {time.perf_counter() - start:.3f}s")
+
+        # New versions are longer than the cut, the strips must keep their range
+        # Starting with the ninth, so the alternates get new versions too
+        step = max(1, round(1 / changedRatio))
+        changed = folders[step - 1::step]
+        for folder in changed:
+            bpy.fileLengths[str(publishNewVersion(folder))] = movieLength * 2
+        bpy.calls.clear()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = handle.updateTimeline()
+        elapsed = time.perf_counter() - start
+        assert len(report["replaced"]) == len(changed) and bpy.collisions() == 0
+        replacedPaths = {entry["oldPath"]: entry["newPath"] for entry in report["replaced"]}
+        updatedShots = [Shot(shot["name"], shot["start"], shot["end"], shot["duration"],
+                             replacedPaths.get(shot["filePath"], shot["filePath"]))
+                        for shot in shots]
+        checkReadback(handle, updatedShots)
+        print(f"update: {len(report['replaced'])} source(s), {sum(entry['clipCount'] for entry in report['replaced'])} "
+              f"strip(s) replaced with {sum(bpy.calls.values())} bpy call(s) in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=2000)
+    parser.add_argument("--movieLength", type=int, default=60, help="Frames of every published movie")
+    parser.add_argument("--changedRatio", type=float, default=0.1, help="Share of shots getting a new version")
+    args = parser.parse_args()
+    run(args.shots, args.movieLength, args.changedRatio)
@@ -0,0 +1,70 @@
+"""
+Counts Resolve bridge calls and wall time of the shot import against the
+fake Resolve object model, per-shot import versus batched import. The
+refetch rows import the same shots again into the filled media pool, where
+known files are reused instead of imported twice. Before the relinked row
+one clip in the middle of the pool is relinked to another file, as in the
+Resolve UI; the batched import has to import its shot's file again.
+
+    python -m benchmarks.benchImport --shots 1000 --latency 0.002
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from benchmarks.fakeResolve import FakeResolve
+
+
+def buildShots(count: int) -> list[dict]:
+    return [{
+        "name": f"sq{i // 50:03d}_sh{i:05d}",
+        "start": i * 48,
+        "end": i * 48 + 47,
+        "duration": 48,
+        "filePath": f"/publish/sq{i // 50:03d}/sh{i:05d}/cam_sh{i:05d}_v001.mov",
+    } for i in range(count)]
+
+
+def importPerShot(handle: DavinciHandle):
+    """The previous import: one AddItemListToMediaPool call per shot."""
+    clipInfos = []
+    for shot in handle.shotCollection:
+        item = handle._importShotViaFilePath(shot)
+        if item is not None:
+            clipInfos.append({"mediaPoolItem": item, "trackIndex": 1, "recordFrame": handle._startFrame() + shot["start"]})
+    handle.mediaPool.AppendToTimeline(clipInfos)
+
+
+def run(shotCount: int, latency: float, chunkSize: int):
+    shots = buildShots(shotCount)
+    print(f"{'mode':>9} {'run':>8} {'bridge calls':>13} {'seconds':>9} {'pool items':>11}")
+    for mode in ("per-shot", "batched"):
+        resolve = FakeResolve(latency=latency)
+        handle = DavinciHandle(None, resolve, {"resolve": {"importChunkSize": chunkSize}})
+        handle._shotCollection = shots
+        pool = resolve._projectManager.GetCurrentProject().mediaPool.rootFolder
+        for run in ("first", "refetch") + (("relinked",) if mode == "batched" else ()):
+            if run == "relinked":
+                pool.clips[len(pool.clips) // 2].ReplaceClip("/elsewhere/relinked.mov")
+            resolve.bridge.reset()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if mode == "batched":
+                    handle.importShotCollection()
+                else:
+                    importPerShot(handle)
+            elapsed = time.perf_counter() - start
+            poolItems = len(pool.clips)
+            assert poolItems == shotCount + (run == "relinked"), "Stale or duplicate media pool items"
+            print(f"{mode:>9} {run:>8} {resolve.bridge.total:>13} {elapsed:>9.3f} {poolItems:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.001, help="Seconds per bridge call")
+    parser.add_argument("--chunkSize", type=int, default=500)
+    args = parser.parse_args()
+    run(args.shots, args.latency, args.chunkSize)
@@ -0,0 +1,104 @@
+"""
+Crashes a timeline build halfway and resumes it, against the fake Resolve.
+The crash hits either the media import or the timeline append, the last
+case in a project without a timeline, so the crashed build is the one that
+creates it. The resumed run has to finish without duplicate media pool
+items or clips, and its cost should follow the remaining work rather than
+the whole edit.
+
+    python -m benchmarks.benchImportResume --shots 5000 --crashAt 0.6 --latency 0.0005
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from DaVinciPipe.storage.ImportJournalStore import ImportJournalStore
+from benchmarks.benchImport import buildShots
+from benchmarks.fakeResolve import FakeResolve
+from benchmarks.offlinePipeline import BENCHMARK_APP_NAME
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+def crashAfter(obj, methodName: str, calls: int):
+    """Lets the method run calls times, then raises like a dying Resolve."""
+    method = getattr(obj, methodName)
+    count = [0]
+
+    def wrapper(*args, **kwargs):
+        if count[0] >= calls:
+            raise SimulatedCrash(methodName)
+        count[0] += 1
+        return method(*args, **kwargs)
+
+    setattr(obj, methodName, wrapper)
+    return lambda: setattr(obj, methodName, method)
+
+
+def currentMediaPool(resolve: FakeResolve):
+    return resolve._projectManager.GetCurrentProject().mediaPool
+
+
+def makeHandle(resolve: FakeResolve, chunkSize: int) -> DavinciHandle:
+    handle = DavinciHandle(None, resolve, {"resolve": {"importChunkSize": chunkSize}})
+    handle._importJournal = ImportJournalStore(appName=BENCHMARK_APP_NAME)
+    return handle
+
+
+def run(shotCount: int, latency: float, chunkSize: int, crashAt: float):
+    shots = buildShots(shotCount)
+    chunkCount = -(-shotCount // chunkSize)
+    crashChunks = max(1, int(chunkCount * crashAt))
+    print(f"{'crash in':>16} {'run':>8} {'bridge calls':>13} {'seconds':>9} {'fsyncs':>7} "
+          f"{'pool items':>11} {'clips':>7}")
+
+    full = FakeResolve(latency=latency)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        makeHandle(full, chunkSize).importShotCollection(shots)
+    print(f"{'-':>16} {'full':>8} {full.bridge.total:>13} {time.perf_counter() - start:>9.3f} {'':>7} "
+          f"{shotCount:>11} {shotCount:>7}")
+
+    for phase, target, methodName, timelineNames in (
+            ("import", lambda resolve: resolve._mediaStorage, "AddItemListToMediaPool", ("Timeline 1",)),
+            ("append", currentMediaPool, "AppendToTimeline", ("Timeline 1",)),
+            ("append, no tl", currentMediaPool, "AppendToTimeline", ())):
+        resolve = FakeResolve(latency=latency, timelineNames=timelineNames)
+        handle = makeHandle(resolve, chunkSize)
+        restore = crashAfter(target(resolve), methodName, crashChunks)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                handle.importShotCollection(shots)
+        except SimulatedCrash:
+            pass
+        restore()
+
+        # A fresh handle, like the next start of the tool
+        resolve.bridge.reset()
+        handle = makeHandle(resolve, chunkSize)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            handle.importShotCollection(shots)
+        elapsed = time.perf_counter() - start
+
+        project = resolve._projectManager.GetCurrentProject()
+        poolItems = len(project.mediaPool.rootFolder.clips)
+        clips = len(project.currentTimeline.GetItemListInTrack("video", 1))
+        assert poolItems == shotCount and clips == shotCount, "Resumed build duplicated or lost work"
+        assert len(project.timelines) == 1, "Resumed build created another timeline"
+        print(f"{phase:>16} {'resumed':>8} {resolve.bridge.total:>13} {elapsed:>9.3f} "
+              f"{handle.importJournal.syncCount:>7} {poolItems:>11} {clips:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0005, help="Seconds per bridge call")
+    parser.add_argument("--chunkSize", type=int, default=500)
+    parser.add_argument("--crashAt", type=float, default=0.6, help="Share of chunks done before the crash")
+    args = parser.parse_args()
+    run(args.shots, args.latency, args.chunkSize, args.crashAt)
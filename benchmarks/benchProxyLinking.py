@@ -0,0 +1,125 @@
+"""
+Links the proxy renders of a synthetic publish tree to the clips of the fake
+Resolve timeline. The rerun must not call LinkProxyMedia at all, and after
+new versions are published only the replaced clips get relinked (or
+unlinked, when their new version has no proxy yet). The per-clip rows are
+the naive way: look up every clip's proxy on its own and link it again.
+
+    python -m benchmarks.benchProxyLinking --shots 1000 --proxyShare 0.8 --latency 0.0005
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from DaVinciPipe.ShotRecords import Shot
+from DaVinciPipe.storage.ImportJournalStore import ImportJournalStore
+from benchmarks.fakeResolve import FakeResolve
+from benchmarks.offlinePipeline import BENCHMARK_APP_NAME, makeKitsuPipeline
+from benchmarks.publishTree import _touch, generatePublishTree
+
+
+def heroName(shotIndex: int, version: int) -> str:
+    return f"cam_sh{shotIndex:05d}_v{version:03d}.mov"
+
+
+def proxyName(shotIndex: int, version: int) -> str:
+    return f"cam_sh{shotIndex:05d}_v{version:03d}_proxy.mov"
+
+
+def buildHandle(folders: list[str], latency: float) -> tuple[DavinciHandle, FakeResolve]:
+    resolve = FakeResolve(latency=latency)
+    handle = DavinciHandle(makeKitsuPipeline("http://127.0.0.1:1/api"), resolve, {})
+    handle._importJournal = ImportJournalStore(appName=BENCHMARK_APP_NAME)
+    shots = [Shot(f"shot{i}", i * 48, i * 48 + 47, 48, os.path.join(folder, heroName(i, 1)))
+             for i, folder in enumerate(folders)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        handle.importShotCollection(shots)
+    return handle, resolve
+
+
+def countFolderScans(handle: DavinciHandle) -> list[int]:
+    scanner = handle.proxyFinder.scanner
+    versionEntries = scanner.versionEntries
+    count = [0]
+
+    def counted(folderPath, forceRefresh=False):
+        count[0] += 1
+        return versionEntries(folderPath, forceRefresh)
+
+    scanner.versionEntries = counted
+    return count
+
+
+def linkPerClip(handle: DavinciHandle) -> dict:
+    """Lists the folder of every clip and links its proxy, whether it changed or not."""
+    linked = 0
+    sources = handle.readTimelineSources()["sources"]
+    for source in sources:
+        folder, fileName = os.path.split(source["filePath"])
+        proxy = fileName.rsplit(".", 1)[0] + "_proxy.mov"
+        if proxy in os.listdir(folder) and source["item"].LinkProxyMedia(os.path.join(folder, proxy)):
+            linked += 1
+    return {"linked": linked, "coverage": linked / len(sources)}
+
+
+def run(shotCount: int, proxyShare: float, changedRatio: float, latency: float):
+    print(f"{'mode':>9} {'run':>8} {'bridge calls':>13} {'links':>6} {'unlinks':>8} {'folder scans':>13} "
+          f"{'coverage':>9} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as root:
+        folders = generatePublishTree(root, shotCount, versionsPerShot=1)
+        proxyStep = max(1, round(1 / (1 - proxyShare))) if proxyShare < 1 else 0
+        for i, folder in enumerate(folders):
+            if not proxyStep or i % proxyStep != proxyStep - 1:
+                _touch(os.path.join(folder, proxyName(i, 1)))
+
+        for mode in ("per-clip", "batched"):
+            handle, resolve = buildHandle(folders, latency)
+            scans = countFolderScans(handle)
+            for run in ("first", "rerun", "publish"):
+                if run == "publish":
+                    # New hero versions, every other one with its proxy
+                    step = max(1, round(1 / changedRatio))
+                    for n, i in enumerate(range(0, shotCount, step)):
+                        _touch(os.path.join(folders[i], heroName(i, 2)))
+                        if n % 2 == 0:
+                            _touch(os.path.join(folders[i], proxyName(i, 2)))
+                    handle.pipe.versionScanner.invalidate()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        handle.updateTimeline()
+
+                resolve.bridge.reset()
+                scans[0] = 0
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if mode == "batched":
+                        report = handle.updateProxies()
+                    else:
+                        report = linkPerClip(handle)
+                elapsed = time.perf_counter() - start
+                links = resolve.bridge.calls.get("MediaPoolItem.LinkProxyMedia", 0)
+                unlinks = resolve.bridge.calls.get("MediaPoolItem.UnlinkProxyMedia", 0)
+                folderScans = scans[0] if mode == "batched" else len(folders)
+                print(f"{mode:>9} {run:>8} {resolve.bridge.total:>13} {links:>6} {unlinks:>8} {folderScans:>13} "
+                      f"{report['coverage']:>9.1%} {elapsed:>9.3f}")
+
+            if mode == "batched":
+                properties = [item.GetClipProperty() for item in resolve._projectManager.GetCurrentProject()
+                              .mediaPool.rootFolder.clips]
+                for itemProperties in properties:
+                    proxy = itemProperties["Proxy Media Path"]
+                    expected = itemProperties["File Path"].rsplit(".", 1)[0] + "_proxy.mov"
+                    assert not proxy or proxy == expected, "A clip is linked to another version's proxy"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=1000)
+    parser.add_argument("--proxyShare", type=float, default=0.8, help="Share of shots with a proxy render")
+    parser.add_argument("--changedRatio", type=float, default=0.1, help="Share of shots getting a new version")
+    parser.add_argument("--latency", type=float, default=0.0005, help="Seconds per bridge call")
+    args = parser.parse_args()
+    run(args.shots, args.proxyShare, args.changedRatio, args.latency)
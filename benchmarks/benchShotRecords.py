@@ -0,0 +1,81 @@
+"""
+Memory, validation and lookup time of synthetic shot lists as dicts and
+as Shot records. Lookups read the name, start and file of every shot, by
+key and by attribute.
+
+    python -m benchmarks.benchShotRecords --shots 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from DaVinciPipe.ShotRecords import Shot, validateShots
+
+
+def _shotFields(i: int) -> tuple:
+    return (f"sq{i // 50:03d}_sh{i:05d}", 1001 + i * 48, 1048 + i * 48, 48,
+            f"/publish/sq{i // 50:03d}/sh{i:05d}/publish/cam_sh{i:05d}_v003.mov")
+
+
+def buildDicts(count: int) -> list[dict]:
+    return [dict(zip(("name", "start", "end", "duration", "filePath"), _shotFields(i))) for i in range(count)]
+
+
+def buildRecords(count: int) -> list[Shot]:
+    return [Shot(*_shotFields(i)) for i in range(count)]
+
+
+def validateDicts(shots: list[dict]) -> bool:
+    """The per-dict check used before the Shot records."""
+    for shot in shots:
+        if not (shot.get("name") and shot.get("start") and shot.get("duration") and shot.get("end")):
+            return False
+    return True
+
+
+def lookupByKey(shots) -> int:
+    return sum(len(shot["name"]) + shot["start"] + len(shot["filePath"]) for shot in shots)
+
+
+def lookupByAttribute(shots: list[Shot]) -> int:
+    return sum(len(shot.name) + shot.start + len(shot.filePath) for shot in shots)
+
+
+def _time(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _measure(build, count: int):
+    tracemalloc.start()
+    result = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def run(count: int):
+    dicts, dictBytes = _measure(buildDicts, count)
+    records, recordBytes = _measure(buildRecords, count)
+
+    rows = [
+        ("dicts", dictBytes, _time(validateDicts, dicts), _time(lookupByKey, dicts), None),
+        ("records", recordBytes, _time(validateShots, records), _time(lookupByKey, records),
+         _time(lookupByAttribute, records)),
+    ]
+
+    print(f"{'':>10} {'MB':>8} {'vs dicts':>9} {'validate s':>11} {'key s':>8} {'attr s':>8}")
+    for name, size, validateSeconds, keySeconds, attributeSeconds in rows:
+        print(f"{name:>10} {size / 1e6:>8.1f} {size / dictBytes:>9.2f} {validateSeconds:>11.4f} "
+              f"{_seconds(keySeconds)} {_seconds(attributeSeconds)}")
+
+
+def _seconds(seconds) -> str:
+    return f"{'':>8}" if seconds is None else f"{seconds:>8.4f}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=100000)
+    run(parser.parse_args().shots)
@@ -0,0 +1,74 @@
+"""
+Compares per-shot and bulk shot retrieval of KitsuPipeline and
+AsyncKitsuPipeline against a local fake Kitsu server. With injected
+failures the synchronous pipeline gives up, the async one retries and has
+to return the same shots as a clean bulk fetch.
+
+    python -m benchmarks.benchShotRetrieval --sizes 100 1000 10000
+    python -m benchmarks.benchShotRetrieval --sizes 1000 --latency 0.01 --failureRate 0.05 --stallRate 0.01
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from DaVinciPipe.KitsuAsyncClient import aiohttp
+from benchmarks.fakeKitsuServer import FakeKitsuServer, buildDataset
+from benchmarks.offlinePipeline import makeAsyncKitsuPipeline, makeKitsuPipeline
+
+MODES = (
+    ("per-shot", makeKitsuPipeline, False),
+    ("bulk", makeKitsuPipeline, True),
+    ("async-per-shot", makeAsyncKitsuPipeline, False),
+    ("async-bulk", makeAsyncKitsuPipeline, True),
+)
+
+
+def _shotKey(shots):
+    return sorted((shot["id"], shot["name"], shot["start"], shot["end"], shot["duration"]) for shot in shots)
+
+
+def run(sizes: list[int], latency: float, failureRate: float, stallRate: float):
+    print(f"{'shots':>8} {'mode':>15} {'requests':>9} {'failures':>9} {'retries':>8} {'seconds':>9}")
+    for size in sizes:
+        dataset = buildDataset(size)
+        with FakeKitsuServer(dataset, latency=latency) as cleanServer:
+            expected = _shotKey(_collect(makeKitsuPipeline(cleanServer.apiUrl, {"deltaSync": False})))
+
+        with FakeKitsuServer(dataset, latency=latency, failureRate=failureRate,
+                             stallRate=stallRate, stallSeconds=2.0) as server:
+            for mode, makePipeline, bulk in MODES:
+                if makePipeline is makeAsyncKitsuPipeline and aiohttp is None:
+                    print(f"{size:>8} {mode:>15} skipped: aiohttp is not installed")
+                    continue
+                pipe = makePipeline(server.apiUrl, {
+                    "deltaSync": False, "bulkShotRetrieval": bulk, "pageSize": 1000, "requestTimeout": 1.0,
+                })
+                server.resetCount()
+                start = time.perf_counter()
+                try:
+                    shots = _collect(pipe)
+                    outcome = f"{time.perf_counter() - start:>9.3f}"
+                    assert _shotKey(shots) == expected, f"{mode} returned different shots"
+                except Exception as e:
+                    outcome = f"failed: {type(e).__name__}"
+                finally:
+                    retries = pipe.client.retryCount if hasattr(pipe, "client") else 0
+                    pipe.close()
+                failures = server.failureCount + server.stallCount
+                print(f"{size:>8} {mode:>15} {server.requestCount:>9} {failures:>9} {retries:>8} {outcome}")
+
+
+def _collect(pipe):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return pipe._collectShotsFromPipeline()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per Kitsu request")
+    parser.add_argument("--failureRate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--stallRate", type=float, default=0.0, help="Share of requests outlasting the timeout")
+    args = parser.parse_args()
+    run(args.sizes, args.latency, args.failureRate, args.stallRate)
@@ -0,0 +1,98 @@
+"""
+Pushes the frame ranges of a re-cut timeline back to a local fake Kitsu
+server. The timeline is imported from the fetched shots, then every
+trimStep-th clip loses trimFrames at its tail and the clips after it ripple
+left, which changes most shots. Compares one request at a time with the
+concurrent write-back of KitsuPipeline and AsyncKitsuPipeline, and checks
+that the server ends up with the edited ranges.
+
+    python -m benchmarks.benchShotWriteBack --shots 2000 --latency 0.02
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from DaVinciPipe.KitsuAsyncClient import aiohttp
+from benchmarks.fakeKitsuServer import FakeKitsuServer, buildDataset
+from benchmarks.fakeResolve import FakeResolve
+from benchmarks.offlinePipeline import makeAsyncKitsuPipeline, makeKitsuPipeline
+from benchmarks.publishTree import generatePublishTree
+
+MODES = (
+    ("one-by-one", makeKitsuPipeline, 1),
+    ("pooled", makeKitsuPipeline, 8),
+    ("async", makeAsyncKitsuPipeline, 8),
+)
+
+
+def recut(handle: DavinciHandle, trimStep: int, trimFrames: int) -> int:
+    """Trims clips and ripples the rest of the timeline; returns the trimmed clip count."""
+    items = sorted(handle.timeline.GetItemListInTrack("video", 1), key=lambda item: item._start)
+    shift = 0
+    trimmed = 0
+    for index, item in enumerate(items):
+        item._start -= shift
+        if index % trimStep == 0:
+            item._duration -= trimFrames
+            shift += trimFrames
+            trimmed += 1
+    return trimmed
+
+
+def run(shotCount: int, latency: float, trimStep: int, trimFrames: int):
+    print(f"{'mode':>11} {'edits':>6} {'requests':>9} {'diff s':>8} {'push s':>8} {'verified':>9}")
+    with tempfile.TemporaryDirectory() as root:
+        generatePublishTree(root, shotCount, versionsPerShot=1)
+        for mode, makePipeline, maxConcurrency in MODES:
+            if makePipeline is makeAsyncKitsuPipeline and aiohttp is None:
+                print(f"{mode:>11} skipped: aiohttp is not installed")
+                continue
+            with FakeKitsuServer(buildDataset(shotCount, publishRoot=root), latency=latency) as server:
+                pipe = makePipeline(server.apiUrl, {"deltaSync": False, "maxConcurrency": maxConcurrency})
+                handle = DavinciHandle(pipe, FakeResolve(), {})
+                with contextlib.redirect_stdout(io.StringIO()):
+                    handle.importShotCollection(handle.fetchShotCollection())
+                assert not handle.diffTimelineShots(), "Fresh import differs from Kitsu"
+                recut(handle, trimStep, trimFrames)
+
+                start = time.perf_counter()
+                edits = handle.diffTimelineShots()
+                diffSeconds = time.perf_counter() - start
+                dryRun = handle.pushShotEdits(edits, dryRun=True)
+                assert len(dryRun["requests"]) == len(edits)
+
+                server.resetCount()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    report = handle.pushShotEdits(edits)
+                pushSeconds = time.perf_counter() - start
+                pipe.close()
+
+                verified = not report["failed"] and _matchesServer(server, edits)
+                print(f"{mode:>11} {len(edits):>6} {server.requestCount:>9} {diffSeconds:>8.3f} "
+                      f"{pushSeconds:>8.3f} {str(verified):>9}")
+
+
+def _matchesServer(server: FakeKitsuServer, edits) -> bool:
+    shotsById = {shot["id"]: shot for shot in server.dataset["shots"]}
+    for edit in edits:
+        shot = shotsById[edit["id"]]
+        stored = {"start": shot["data"]["frame_in"], "end": shot["data"]["frame_out"], "duration": shot["nb_frames"]}
+        if any(stored[key] != edit[key] for key in stored if key in edit):
+            return False
+        if "absolutepath" not in shot["data"]:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per Kitsu request")
+    parser.add_argument("--trimStep", type=int, default=3, help="Every n-th clip gets trimmed")
+    parser.add_argument("--trimFrames", type=int, default=4)
+    args = parser.parse_args()
+    run(args.shots, args.latency, args.trimStep, args.trimFrames)
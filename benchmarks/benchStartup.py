@@ -0,0 +1,71 @@
+"""
+Measures startup cost in fresh interpreters: the -X importtime breakdown of
+importing DaVinciPipe.main (what Resolve's script menu does first) and the
+cold-start-to-window time with an offscreen Qt platform and the fake Resolve.
+
+    python -m benchmarks.benchStartup --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+WINDOW_SNIPPET = """
+import time
+start = time.perf_counter()
+import DaVinciPipe.main
+from PySide6.QtWidgets import QApplication
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from ui.mainUi import MainUi
+from ui.style import appStyle
+from benchmarks.fakeResolve import FakeResolve
+app = QApplication([])
+app.setStyleSheet(appStyle)
+window = MainUi(handle=DavinciHandle(None, FakeResolve(), {}))
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+"""
+
+
+def _run(args: list[str], env: dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=REPO_ROOT, env=env)
+
+
+def importTimes(module: str, env: dict[str, str]) -> list[tuple[int, int, str]]:
+    """Returns (self us, cumulative us, module) for every import."""
+    result = _run(["-X", "importtime", "-c", f"import {module}"], env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfTime, cumulative, name = line[len("import time:"):].split("|")
+        times.append((int(selfTime), int(cumulative), name.rstrip()))
+    return times
+
+
+def run(top: int):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1")
+
+    times = importTimes("DaVinciPipe.main", env)
+    total = max(cumulative for _, cumulative, _ in times)
+    print(f"import DaVinciPipe.main: {total / 1000:.1f} ms")
+    for selfTime, cumulative, name in sorted(times, key=lambda t: t[1], reverse=True)[:top]:
+        print(f"{cumulative / 1000:>9.1f} ms {selfTime / 1000:>9.1f} ms  {name}")
+
+    result = _run(["-c", WINDOW_SNIPPET], env)
+    if result.returncode != 0:
+        print(f"Cold start to window skipped: {result.stderr.strip().splitlines()[-1]}")
+        return
+    print(f"cold start to window: {float(result.stdout.strip().splitlines()[-1]) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    run(parser.parse_args().top)
@@ -0,0 +1,35 @@
+"""
+Bulk frame -> timecode -> frame round trip for a reel worth of events.
+
+    python -m benchmarks.benchTimecode --events 100000 --rate "29.97 DF"
+"""
+import argparse
+import time
+
+from DaVinciPipe import Timecode
+
+
+def run(events: int, rate: str):
+    frameRate = Timecode.FrameRate.parse(rate)
+    frames = list(range(0, events * 37, 37))
+
+    start = time.perf_counter()
+    timecodes = Timecode.framesToTimecodes(frames, frameRate, addOneHour=True)
+    toTimecode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    roundTrip = Timecode.timecodesToFrames(timecodes, frameRate, subtractOneHour=True)
+    toFrames = time.perf_counter() - start
+
+    assert list(roundTrip) == frames
+    backend = "numpy" if Timecode._numpy() is not None else "python"
+    print(f"{events} events at {frameRate} ({backend}): "
+          f"to timecode {toTimecode * 1000:.1f} ms, to frames {toFrames * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--rate", default="29.97 DF")
+    args = parser.parse_args()
+    run(args.events, args.rate)
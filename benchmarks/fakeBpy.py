@@ -0,0 +1,181 @@
+"""
+A minimal stand-in for Blender's bpy sequencer API, enough for the
+BlenderHandle benchmarks. Strips follow Blender's frame model (frame_start,
+offsets, frame_final_*), movies get a fixed length when loaded. Like the
+RNA new_movie, adding a strip never moves it, so overlapping strips on one
+channel stay on top of each other; collisions() counts them.
+"""
+import collections
+import os
+from typing import Optional
+
+
+class FakeSound:
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+
+
+class FakeStrip:
+    def __init__(self, calls: collections.Counter, name: str, stripType: str, channel: int, frameStart: int,
+                 length: int):
+        self._calls = calls
+        self.name = name
+        self.type = stripType
+        self.channel = channel
+        self.frame_start = frameStart
+        self.frame_offset_start = 0
+        self.frame_offset_end = 0
+        self._length = length
+        self._ready = True
+
+    def __setattr__(self, name, value):
+        # Counts the property writes of the caller, not the strip's own setup
+        if not name.startswith("_") and self.__dict__.get("_ready"):
+            self._calls[f"set.{name}"] += 1
+        super().__setattr__(name, value)
+
+    @property
+    def frame_final_start(self) -> int:
+        return self.frame_start + self.frame_offset_start
+
+    @property
+    def frame_final_end(self) -> int:
+        return self.frame_start + self._length - self.frame_offset_end
+
+    @property
+    def frame_final_duration(self) -> int:
+        return self.frame_final_end - self.frame_final_start
+
+    @frame_final_duration.setter
+    def frame_final_duration(self, duration: int):
+        object.__setattr__(self, "frame_offset_end", self._length - self.frame_offset_start - duration)
+
+
+class FakeMovieStrip(FakeStrip):
+    def __init__(self, calls, name, channel, frameStart, filepath: str, length: int, fileLength):
+        self._fileLength = fileLength
+        self._filepath = filepath
+        super().__init__(calls, name, "MOVIE", channel, frameStart, length)
+
+    @property
+    def filepath(self) -> str:
+        return self._filepath
+
+    @filepath.setter
+    def filepath(self, filepath: str):
+        # Reloads the movie; the offsets stay, so the strip's range follows the new length
+        self._filepath = filepath
+        self._length = self._fileLength(filepath)
+
+
+class FakeStripCollection:
+    def __init__(self, calls: collections.Counter, fileLength):
+        self._calls = calls
+        self._fileLength = fileLength
+        self._strips: list[FakeStrip] = []
+        self._names: set[str] = set()
+
+    def __iter__(self):
+        self._calls["iter"] += 1
+        return iter(list(self._strips))
+
+    def __len__(self) -> int:
+        return len(self._strips)
+
+    def new_movie(self, name: str, filepath: str, channel: int, frame_start: int,
+                  fit_method: Optional[str] = None) -> FakeMovieStrip:
+        self._calls["new_movie"] += 1
+        strip = FakeMovieStrip(self._calls, self._uniqueName(name), channel, frame_start, filepath,
+                               self._fileLength(filepath), self._fileLength)
+        self._strips.append(strip)
+        return strip
+
+    def new_sound(self, name: str, filepath: str, channel: int, frame_start: int) -> FakeStrip:
+        self._calls["new_sound"] += 1
+        strip = FakeStrip(self._calls, self._uniqueName(name), "SOUND", channel, frame_start,
+                          self._fileLength(filepath))
+        object.__setattr__(strip, "sound", FakeSound(filepath))
+        self._strips.append(strip)
+        return strip
+
+    def remove(self, strip: FakeStrip):
+        self._calls["remove"] += 1
+        self._strips.remove(strip)
+        self._names.discard(strip.name)
+
+    def _uniqueName(self, name: str) -> str:
+        # Blender appends .001, .002, ... to taken names
+        uniqueName = name
+        suffix = 0
+        while uniqueName in self._names:
+            suffix += 1
+            uniqueName = f"{name}.{suffix:03d}"
+        self._names.add(uniqueName)
+        return uniqueName
+
+
+class FakeSequenceEditor:
+    def __init__(self, calls: collections.Counter, fileLength):
+        self.sequences = FakeStripCollection(calls, fileLength)
+
+    @property
+    def sequences_all(self) -> FakeStripCollection:
+        return self.sequences
+
+
+class FakeScene:
+    def __init__(self, calls: collections.Counter, fileLength):
+        self._calls = calls
+        self._fileLength = fileLength
+        self.sequence_editor: Optional[FakeSequenceEditor] = None
+
+    def sequence_editor_create(self) -> FakeSequenceEditor:
+        if self.sequence_editor is None:
+            self.sequence_editor = FakeSequenceEditor(self._calls, self._fileLength)
+        return self.sequence_editor
+
+
+class FakePath:
+    def __init__(self, blendDirectory: str):
+        self.blendDirectory = blendDirectory
+
+    def abspath(self, path: str) -> str:
+        if path.startswith("//"):
+            return os.path.join(self.blendDirectory, path[2:])
+        return path
+
+
+class FakeContext:
+    def __init__(self, scene: FakeScene):
+        self.scene = scene
+
+
+class FakeBpy:
+    """bpy with one scene; every movie is movieLength frames long unless listed in fileLengths."""
+
+    def __init__(self, movieLength: int = 100, fileLengths: Optional[dict[str, int]] = None,
+                 blendDirectory: str = "/projects/edit"):
+        self.calls = collections.Counter()
+        self.fileLengths = fileLengths or {}
+        self.context = FakeContext(FakeScene(self.calls, lambda filePath: self.fileLengths.get(filePath, movieLength)))
+        self.path = FakePath(blendDirectory)
+
+    @property
+    def strips(self) -> list[FakeStrip]:
+        editor = self.context.scene.sequence_editor
+        return list(editor.sequences._strips) if editor else []
+
+    def collisions(self) -> int:
+        """Pairs of strips that overlap on the same channel."""
+        byChannel = collections.defaultdict(list)
+        for strip in self.strips:
+            byChannel[strip.channel].append((strip.frame_final_start, strip.frame_final_end))
+        count = 0
+        for ranges in byChannel.values():
+            ranges.sort()
+            ends = []
+            for start, end in ranges:
+                ends = [otherEnd for otherEnd in ends if otherEnd > start]
+                count += len(ends)
+                ends.append(end)
+        return count
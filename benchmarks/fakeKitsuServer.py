@@ -0,0 +1,279 @@
+"""
+Local stand-in for the Kitsu API routes KitsuPipeline uses, with a
+configurable dataset size, per-request latency and injected failures. Can
+also run standalone:
+
+    python -m benchmarks.fakeKitsuServer --shots 5000 --latency 0.02 --failureRate 0.05 --port 8080
+"""
+import argparse
+import base64
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def buildDataset(shotCount: int, projectName: str = "hamster", shotsPerSequence: int = 50,
+                 publishRoot: str = "/nonexistent") -> dict[str, Any]:
+    project = {"id": "project-0", "name": projectName}
+    sequences = []
+    shots = []
+    for i in range(shotCount):
+        sequenceIndex = i // shotsPerSequence
+        if sequenceIndex == len(sequences):
+            sequences.append({"id": f"sequence-{sequenceIndex}", "name": f"sq{sequenceIndex:03d}"})
+        shots.append({
+            "id": f"shot-{i}",
+            "name": f"sh{i:05d}",
+            "project_id": project["id"],
+            "parent_id": sequences[sequenceIndex]["id"],
+            "nb_frames": 48,
+            "data": {
+                "frame_in": 1001 + i * 48,
+                "frame_out": 1001 + i * 48 + 47,
+                "absolutepath": publishFolder(publishRoot, sequenceIndex, i),
+            },
+        })
+    return {"projects": [project], "sequences": sequences, "shots": shots, "events": []}
+
+
+def fakeJwt(expiresIn: float) -> str:
+    """An unsigned token with the exp claim, enough for the local expiry check."""
+    def encode(part: dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode({'exp': int(time.time() + expiresIn)})}."
+
+
+def publishFolder(publishRoot: str, sequenceIndex: int, shotIndex: int) -> str:
+    return f"{publishRoot}/sq{sequenceIndex:03d}/sh{shotIndex:05d}/publish"
+
+
+class FakeKitsuServer:
+    """
+    Counts every request so benchmarks can compare round-trips. latency is
+    added to every response, in seconds. failureRate of the requests answer
+    with failureStatus, stallRate of them hang for stallSeconds first, so
+    client retries and timeouts can be exercised.
+    """
+
+    def __init__(self, dataset: dict[str, Any], latency: float = 0.0, port: int = 0,
+                 failureRate: float = 0.0, failureStatus: int = 503,
+                 stallRate: float = 0.0, stallSeconds: float = 5.0, seed: int = 0):
+        self.dataset = dataset
+        self.latency = latency
+        self.failureRate = failureRate
+        self.failureStatus = failureStatus
+        self.stallRate = stallRate
+        self.stallSeconds = stallSeconds
+        self.requestCount = 0
+        self.failureCount = 0
+        self.stallCount = 0
+        self.updateCount = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._shotsById = {shot["id"]: shot for shot in dataset["shots"]}
+        self._sequencesById = {sequence["id"]: sequence for sequence in dataset["sequences"]}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._makeHandler())
+        self._thread = None
+
+    @property
+    def apiUrl(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serveForever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def resetCount(self):
+        with self._lock:
+            self.requestCount = 0
+            self.failureCount = 0
+            self.stallCount = 0
+            self.updateCount = 0
+
+    def touchShot(self, shotId: str, **data):
+        """Changes a shot's custom data and records a shot:update event."""
+        shot = self._shotsById[shotId]
+        shot["data"].update(data)
+        self._recordUpdate(shot)
+
+    def _recordUpdate(self, shot: dict[str, Any]):
+        shotId = shot["id"]
+        self.dataset["events"].append({
+            "name": "shot:update",
+            "project_id": shot["project_id"],
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+            "data": {"shot_id": shotId},
+        })
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def route(self, path: str, query: dict[str, list[str]], method: str = "GET",
+              body: Optional[dict[str, Any]] = None) -> tuple[int, Any]:
+        with self._lock:
+            self.requestCount += 1
+            fail = self._random.random() < self.failureRate
+            stall = self._random.random() < self.stallRate
+            self.failureCount += fail
+            self.stallCount += stall
+        if self.latency:
+            time.sleep(self.latency)
+        if stall:
+            time.sleep(self.stallSeconds)
+        if fail:
+            return self.failureStatus, {"message": "Injected failure"}
+
+        parts = path.strip("/").split("/")
+        if parts[:1] == ["api"]:
+            parts = parts[1:]
+
+        if method == "PUT":
+            if len(parts) == 3 and parts[:2] == ["data", "entities"]:
+                return self._updateShot(parts[2], body or {})
+            return 405, {"message": f"Can't PUT {path}"}
+
+        if parts == ["auth", "authenticated"]:
+            return 200, {"authenticated": True, "user": {"id": "user-0", "full_name": "Benchmark"}}
+        if parts == ["auth", "refresh-token"]:
+            return 200, {"access_token": fakeJwt(3600)}
+        if parts == ["data", "projects", "all"]:
+            return 200, self.dataset["projects"]
+        if parts == ["data", "projects"]:
+            name = query.get("name", [None])[0]
+            return 200, [project for project in self.dataset["projects"] if name is None or project["name"] == name]
+        if len(parts) == 3 and parts[:2] == ["data", "projects"]:
+            project = next((project for project in self.dataset["projects"] if project["id"] == parts[2]), None)
+            if project is None:
+                return 404, {"message": "Project not found"}
+            return 200, project
+        if len(parts) == 4 and parts[:2] == ["data", "projects"] and parts[3] == "sequences":
+            return 200, list(self.dataset["sequences"])
+        if parts == ["data", "events", "last"]:
+            return 200, self._lastEvents(query)
+        if parts == ["data", "shots"]:
+            return 200, self._listShots(query)
+        if len(parts) == 3 and parts[:2] == ["data", "shots"]:
+            shot = self._shotsById.get(parts[2])
+            if shot is None:
+                return 404, {"message": "Shot not found"}
+            return 200, self._fullShot(shot)
+        return 404, {"message": f"Unknown route: {path}"}
+
+    def _updateShot(self, shotId: str, body: dict[str, Any]) -> tuple[int, Any]:
+        """Like Kitsu's entity PUT: given fields replace the stored ones, data included."""
+        shot = self._shotsById.get(shotId)
+        if shot is None:
+            return 404, {"message": "Entity not found"}
+        with self._lock:
+            self.updateCount += 1
+            for key in ("nb_frames", "data"):
+                if key in body:
+                    shot[key] = body[key]
+            self._recordUpdate(shot)
+        return 200, self._fullShot(shot)
+
+    def _listShots(self, query: dict[str, list[str]]) -> Any:
+        projectId = query.get("project_id", [None])[0]
+        shots = [shot for shot in self.dataset["shots"] if projectId is None or shot["project_id"] == projectId]
+        if "page" not in query:
+            return shots
+        page = int(query["page"][0])
+        limit = int(query.get("limit", ["100"])[0])
+        offset = (page - 1) * limit
+        return {
+            "data": shots[offset:offset + limit],
+            "total": len(shots),
+            "nb_pages": max(1, math.ceil(len(shots) / limit)),
+            "limit": limit,
+            "offset": offset,
+            "page": page,
+        }
+
+    def _lastEvents(self, query: dict[str, list[str]]) -> list[dict[str, Any]]:
+        after = query.get("after", [""])[0]
+        name = query.get("name", [None])[0]
+        limit = int(query.get("limit", ["100"])[0])
+        events = [
+            event for event in reversed(self.dataset["events"])
+            if event["created_at"] > after and (name is None or event["name"] == name)
+        ]
+        return events[:limit]
+
+    def _fullShot(self, shot: dict[str, Any]) -> dict[str, Any]:
+        fullShot = dict(shot)
+        fullShot["sequence_name"] = self._sequencesById[shot["parent_id"]]["name"]
+        fullShot["frame_in"] = shot["data"]["frame_in"]
+        fullShot["frame_out"] = shot["data"]["frame_out"]
+        return fullShot
+
+    def _makeHandler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like Kitsu behind its reverse proxy
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, don't wait for delayed ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                self._respond(*server.route(url.path, parse_qs(url.query)))
+
+            def do_PUT(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                self._respond(*server.route(url.path, parse_qs(url.query), "PUT", body))
+
+            def _respond(self, status: int, payload: Any):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out on a stalled request
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--failureRate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--stallRate", type=float, default=0.0, help="Share of requests hanging for 5 seconds")
+    parser.add_argument("--publishRoot", default="/nonexistent")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server = FakeKitsuServer(buildDataset(args.shots, publishRoot=args.publishRoot), args.latency, args.port,
+                             failureRate=args.failureRate, stallRate=args.stallRate)
+    print(f"Fake Kitsu with {args.shots} shots at {server.apiUrl}")
+    try:
+        server.serveForever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,318 @@
+"""
+In-memory stand-in for the parts of the Resolve scripting API DavinciHandle
+uses. Every method call counts as one bridge call, and an optional latency
+per call simulates the cost of crossing the scripting bridge.
+"""
+import collections
+import itertools
+import os
+import time
+from typing import Any, Optional
+
+
+class BridgeCounter:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = collections.Counter()
+
+    def __call__(self, name: str):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self):
+        self.calls.clear()
+
+
+class FakeResolveObject:
+    def __init__(self, bridge: BridgeCounter):
+        self._bridge = bridge
+
+    def _call(self, name: str):
+        self._bridge(f"{type(self).__name__[4:]}.{name}")
+
+
+class FakeMediaPoolItem(FakeResolveObject):
+    _ids = itertools.count(1)
+
+    def __init__(self, bridge: BridgeCounter, filePath: str):
+        super().__init__(bridge)
+        self._uniqueId = str(next(self._ids))
+        self._properties = {
+            "File Path": filePath,
+            "File Name": os.path.basename(filePath),
+            "Clip Name": os.path.basename(filePath),
+            "Proxy Media Path": "",
+        }
+        self.replacedWith = []
+
+    def GetUniqueId(self) -> str:
+        self._call("GetUniqueId")
+        return self._uniqueId
+
+    def GetName(self) -> str:
+        self._call("GetName")
+        return self._properties["Clip Name"]
+
+    def GetClipProperty(self, name: Optional[str] = None):
+        self._call("GetClipProperty")
+        if name is None:
+            return dict(self._properties)
+        return self._properties.get(name, "")
+
+    def ReplaceClip(self, filePath: str) -> bool:
+        self._call("ReplaceClip")
+        self.replacedWith.append(filePath)
+        self._properties["File Path"] = filePath
+        self._properties["File Name"] = os.path.basename(filePath)
+        self._properties["Clip Name"] = os.path.basename(filePath)
+        return True
+
+    def LinkProxyMedia(self, proxyPath: str) -> bool:
+        self._call("LinkProxyMedia")
+        self._properties["Proxy Media Path"] = proxyPath
+        return True
+
+    def UnlinkProxyMedia(self) -> bool:
+        self._call("UnlinkProxyMedia")
+        self._properties["Proxy Media Path"] = ""
+        return True
+
+
+class FakeTimelineItem(FakeResolveObject):
+    def __init__(self, bridge: BridgeCounter, mediaPoolItem: FakeMediaPoolItem, start: int, duration: int):
+        super().__init__(bridge)
+        self._mediaPoolItem = mediaPoolItem
+        self._start = start
+        self._duration = duration
+
+    def GetName(self) -> str:
+        self._call("GetName")
+        return self._mediaPoolItem._properties["File Name"]
+
+    def GetStart(self) -> int:
+        self._call("GetStart")
+        return self._start
+
+    def GetEnd(self) -> int:
+        self._call("GetEnd")
+        return self._start + self._duration
+
+    def GetDuration(self) -> int:
+        self._call("GetDuration")
+        return self._duration
+
+    def GetMediaPoolItem(self) -> FakeMediaPoolItem:
+        self._call("GetMediaPoolItem")
+        return self._mediaPoolItem
+
+
+class FakeTimeline(FakeResolveObject):
+    def __init__(self, bridge: BridgeCounter, name: str):
+        super().__init__(bridge)
+        self._name = name
+        self.tracks: dict[str, list[list[FakeTimelineItem]]] = {"video": [[]], "audio": [[]]}
+
+    def GetName(self) -> str:
+        self._call("GetName")
+        return self._name
+
+    def GetTrackCount(self, trackType: str) -> int:
+        self._call("GetTrackCount")
+        return len(self.tracks.get(trackType, []))
+
+    def GetItemListInTrack(self, trackType: str, index: int) -> list[FakeTimelineItem]:
+        self._call("GetItemListInTrack")
+        tracks = self.tracks.get(trackType, [])
+        if index < 1 or index > len(tracks):
+            return []
+        return list(tracks[index - 1])
+
+    def addItem(self, trackType: str, trackIndex: int, item: FakeTimelineItem):
+        tracks = self.tracks.setdefault(trackType, [])
+        while len(tracks) < trackIndex:
+            tracks.append([])
+        tracks[trackIndex - 1].append(item)
+
+
+class FakeFolder(FakeResolveObject):
+    _ids = itertools.count(1)
+
+    def __init__(self, bridge: BridgeCounter, name: str):
+        super().__init__(bridge)
+        self._uniqueId = f"folder{next(self._ids)}"
+        self._name = name
+        self.clips: list[FakeMediaPoolItem] = []
+        self.subFolders: list["FakeFolder"] = []
+
+    def GetName(self) -> str:
+        self._call("GetName")
+        return self._name
+
+    def GetUniqueId(self) -> str:
+        self._call("GetUniqueId")
+        return self._uniqueId
+
+    def GetClipList(self) -> list[FakeMediaPoolItem]:
+        self._call("GetClipList")
+        return list(self.clips)
+
+    def GetSubFolderList(self) -> list["FakeFolder"]:
+        self._call("GetSubFolderList")
+        return list(self.subFolders)
+
+
+class FakeMediaPool(FakeResolveObject):
+    def __init__(self, bridge: BridgeCounter, project: "FakeProject"):
+        super().__init__(bridge)
+        self._project = project
+        self.rootFolder = FakeFolder(bridge, "Master")
+        self.currentFolder = self.rootFolder
+
+    def GetRootFolder(self) -> FakeFolder:
+        self._call("GetRootFolder")
+        return self.rootFolder
+
+    def GetCurrentFolder(self) -> FakeFolder:
+        self._call("GetCurrentFolder")
+        return self.currentFolder
+
+    def ImportMedia(self, filePaths: list[str]) -> list[FakeMediaPoolItem]:
+        self._call("ImportMedia")
+        return self._project.addMediaPoolItems(filePaths)
+
+    def CreateEmptyTimeline(self, name: str) -> Optional[FakeTimeline]:
+        self._call("CreateEmptyTimeline")
+        return self._project.addTimeline(name)
+
+    def AppendToTimeline(self, clipInfos: list[dict[str, Any]]) -> list[FakeTimelineItem]:
+        self._call("AppendToTimeline")
+        # Like Resolve, appending without a timeline creates one
+        timeline = self._project.currentTimeline or self._project.addTimeline("Timeline 1")
+        items = []
+        for clipInfo in clipInfos:
+            mediaPoolItem = clipInfo["mediaPoolItem"]
+            item = FakeTimelineItem(self._bridge, mediaPoolItem, clipInfo.get("recordFrame", 0), 48)
+            trackType = "audio" if clipInfo.get("mediaType") == 2 else "video"
+            timeline.addItem(trackType, clipInfo.get("trackIndex", 1), item)
+            items.append(item)
+        return items
+
+
+class FakeProject(FakeResolveObject):
+    def __init__(self, bridge: BridgeCounter, name: str, fps: str = "24", timelineNames=("Timeline 1",)):
+        super().__init__(bridge)
+        self._name = name
+        self.settings = {"timelineFrameRate": fps, "timelineDropFrameTimecode": "0"}
+        self.timelines = [FakeTimeline(bridge, timelineName) for timelineName in timelineNames]
+        self.currentTimeline = self.timelines[0] if self.timelines else None
+        self.mediaPool = FakeMediaPool(bridge, self)
+
+    def GetName(self) -> str:
+        self._call("GetName")
+        return self._name
+
+    def GetMediaPool(self) -> FakeMediaPool:
+        self._call("GetMediaPool")
+        return self.mediaPool
+
+    def GetSetting(self, name: str) -> str:
+        self._call("GetSetting")
+        return self.settings.get(name, "")
+
+    def GetTimelineCount(self) -> int:
+        self._call("GetTimelineCount")
+        return len(self.timelines)
+
+    def GetTimelineByIndex(self, index: int) -> Optional[FakeTimeline]:
+        self._call("GetTimelineByIndex")
+        if index < 1 or index > len(self.timelines):
+            return None
+        return self.timelines[index - 1]
+
+    def GetCurrentTimeline(self) -> Optional[FakeTimeline]:
+        self._call("GetCurrentTimeline")
+        return self.currentTimeline
+
+    def SetCurrentTimeline(self, timeline: FakeTimeline) -> bool:
+        self._call("SetCurrentTimeline")
+        self.currentTimeline = timeline
+        return True
+
+    def addTimeline(self, name: str) -> Optional[FakeTimeline]:
+        """A new current timeline; None if the name is taken."""
+        if any(timeline._name == name for timeline in self.timelines):
+            return None
+        self.currentTimeline = FakeTimeline(self._bridge, name)
+        self.timelines.append(self.currentTimeline)
+        return self.currentTimeline
+
+    def addMediaPoolItems(self, filePaths: list[str]) -> list[FakeMediaPoolItem]:
+        items = [FakeMediaPoolItem(self._bridge, str(filePath)) for filePath in filePaths]
+        self.mediaPool.currentFolder.clips.extend(items)
+        return items
+
+
+class FakeProjectManager(FakeResolveObject):
+    def __init__(self, bridge: BridgeCounter, projects: list[FakeProject]):
+        super().__init__(bridge)
+        self.projects = {project._name: project for project in projects}
+        self.currentProject = projects[0]
+
+    def GetCurrentProject(self) -> FakeProject:
+        self._call("GetCurrentProject")
+        return self.currentProject
+
+    def GetProjectListInCurrentFolder(self) -> list[str]:
+        self._call("GetProjectListInCurrentFolder")
+        return list(self.projects)
+
+    def LoadProject(self, name: str) -> Optional[FakeProject]:
+        self._call("LoadProject")
+        project = self.projects.get(name)
+        if project is not None:
+            self.currentProject = project
+        return project
+
+    def SaveProject(self) -> bool:
+        self._call("SaveProject")
+        return True
+
+
+class FakeMediaStorage(FakeResolveObject):
+    def __init__(self, bridge: BridgeCounter, projectManager: FakeProjectManager):
+        super().__init__(bridge)
+        self._projectManager = projectManager
+
+    def AddItemListToMediaPool(self, filePaths: list[str]) -> list[FakeMediaPoolItem]:
+        self._call("AddItemListToMediaPool")
+        return self._projectManager.currentProject.addMediaPoolItems(filePaths)
+
+
+class FakeResolve(FakeResolveObject):
+    def __init__(self, latency: float = 0.0, projectNames=("Project",), fps: str = "24",
+                 timelineNames=("Timeline 1",)):
+        super().__init__(BridgeCounter(latency))
+        projects = [FakeProject(self._bridge, name, fps, timelineNames) for name in projectNames]
+        self._projectManager = FakeProjectManager(self._bridge, projects)
+        self._mediaStorage = FakeMediaStorage(self._bridge, self._projectManager)
+
+    @property
+    def bridge(self) -> BridgeCounter:
+        return self._bridge
+
+    def GetProjectManager(self) -> FakeProjectManager:
+        self._call("GetProjectManager")
+        return self._projectManager
+
+    def GetMediaStorage(self) -> FakeMediaStorage:
+        self._call("GetMediaStorage")
+        return self._mediaStorage
+
+    def GetFusion(self):
+        self._call("GetFusion")
+        return None
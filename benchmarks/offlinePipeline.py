@@ -0,0 +1,34 @@
+from typing import Any, Optional
+
+import gazu
+
+from DaVinciPipe.PipelineInterfaces import AsyncKitsuPipeline, KitsuPipeline
+from DaVinciPipe.VersionScanner import VersionScanner
+
+BENCHMARK_APP_NAME = "ResolveKitsuToolBenchmark"
+
+
+def makeKitsuPipeline(apiUrl: str, kitsuConfig: Optional[dict[str, Any]] = None,
+                      versionScanner: Optional[VersionScanner] = None) -> KitsuPipeline:
+    """
+    Builds a KitsuPipeline talking to a fake Kitsu server, skipping the
+    stored-session login and the login dialog.
+    """
+    return _buildPipeline(KitsuPipeline, apiUrl, kitsuConfig, versionScanner)
+
+
+def makeAsyncKitsuPipeline(apiUrl: str, kitsuConfig: Optional[dict[str, Any]] = None,
+                           versionScanner: Optional[VersionScanner] = None) -> AsyncKitsuPipeline:
+    """Same as makeKitsuPipeline, for the AsyncKitsuPipeline."""
+    return _buildPipeline(AsyncKitsuPipeline, apiUrl, kitsuConfig, versionScanner)
+
+
+def _buildPipeline(pipelineClass, apiUrl: str, kitsuConfig: Optional[dict[str, Any]],
+                   versionScanner: Optional[VersionScanner]):
+    gazu.client.set_host(apiUrl)
+    gazu.client.default_client.tokens = {"access_token": "benchmark"}
+    return pipelineClass.fromSession(
+        {"project_name": "hamster", **(kitsuConfig or {})},
+        versionScanner=versionScanner or VersionScanner(),
+        appName=BENCHMARK_APP_NAME,
+    )
@@ -0,0 +1,48 @@
+"""
+Generates synthetic publish folders on disk, laid out like the dataset of
+the fake Kitsu server (<root>/sqNNN/shNNNNN/publish).
+"""
+import os
+import time
+from pathlib import Path
+
+from benchmarks.fakeKitsuServer import publishFolder
+
+
+def generatePublishTree(root: str, shotCount: int, versionsPerShot: int = 3, shotsPerSequence: int = 50,
+                        cameras: tuple[str, ...] = ("cam",), extensions: tuple[str, ...] = ("mov",),
+                        extraFilesPerShot: int = 2) -> list[str]:
+    """
+    Creates the folders with empty version files and returns the folder
+    paths. Folder mtimes are moved into the past, like an older publish.
+    """
+    past = time.time() - 3600
+    folders = []
+    for i in range(shotCount):
+        folder = publishFolder(root, i // shotsPerSequence, i)
+        os.makedirs(folder, exist_ok=True)
+        for camera in cameras:
+            for ext in extensions:
+                for version in range(1, versionsPerShot + 1):
+                    _touch(os.path.join(folder, f"{camera}_sh{i:05d}_v{version:03d}.{ext}"))
+        for extra in range(extraFilesPerShot):
+            _touch(os.path.join(folder, f"notes_{extra}.txt"))
+        os.utime(folder, (past, past))
+        folders.append(folder)
+    return folders
+
+
+def publishNewVersion(folder: str) -> Path:
+    """Adds the next version file to a generated publish folder."""
+    versions = sorted(f for f in os.listdir(folder) if "_v" in f)
+    newest = versions[-1]
+    stem, ext = newest.rsplit(".", 1)
+    prefix, version = stem.rsplit("_v", 1)
+    newPath = Path(folder) / f"{prefix}_v{int(version) + 1:03d}.{ext}"
+    _touch(str(newPath))
+    return newPath
+
+
+def _touch(path: str):
+    with open(path, "a"):
+        pass
@@ -0,0 +1,195 @@
+"""
+End-to-end sync benchmarks without the studio Kitsu or Resolve: a fake
+Kitsu server, a synthetic publish tree on disk and the fake Resolve object
+model. Every run is appended as one JSON line to the output file (by
+default results.jsonl in the user cache folder), so runs of different
+versions can be compared. With --trace the run is traced and
+written as a Chrome trace.
+
+    python -m benchmarks.runBenchmarks --shots 2000 --latency 0.005
+    python -m benchmarks.runBenchmarks --shots 2000 --trace /tmp/sync_trace.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from DaVinciPipe import Tracing
+from DaVinciPipe.DavinciHandle import DavinciHandle
+from DaVinciPipe.VersionScanner import VersionScanner
+from DaVinciPipe.storage.VersionIndexStore import VersionIndexStore
+from benchmarks.fakeKitsuServer import FakeKitsuServer, buildDataset
+from benchmarks.fakeResolve import FakeResolve
+from benchmarks.offlinePipeline import BENCHMARK_APP_NAME, makeKitsuPipeline
+from benchmarks.publishTree import generatePublishTree, publishNewVersion
+
+
+def _timed(function: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return result, time.perf_counter() - start
+
+
+def _makeScanner(workers: int) -> VersionScanner:
+    return VersionScanner(maxWorkers=workers, index=VersionIndexStore(appName=BENCHMARK_APP_NAME))
+
+
+def benchVersionScan(folders: list[str], workers: int) -> list[dict[str, Any]]:
+    scanner = _makeScanner(workers)
+    scanner.invalidate()
+    _, cold = _timed(lambda: scanner.scanFolders(folders))
+    _, warm = _timed(lambda: scanner.scanFolders(folders))
+    _, sequential = _timed(lambda: [VersionScanner(index=None).scanFolder(folder) for folder in folders])
+    return [
+        {"name": "scan.sequential", "seconds": sequential},
+        {"name": "scan.cold", "seconds": cold},
+        {"name": "scan.warm", "seconds": warm},
+    ]
+
+
+def benchFetchAndUpdate(server: FakeKitsuServer, folders: list[str], workers: int,
+                        bridgeLatency: float, changedRatio: float) -> list[dict[str, Any]]:
+    results = []
+    resolve = FakeResolve(latency=bridgeLatency)
+    pipe = makeKitsuPipeline(server.apiUrl, versionScanner=_makeScanner(workers))
+    handle = DavinciHandle(pipe, Tracing.traceResolve(resolve), {
+        "publishWatcher": {"mode": "polling", "pollInterval": 0.1, "debounceSeconds": 0.1},
+    })
+    pipe.shotSnapshots.clear(server.dataset["projects"][0]["id"])
+
+    server.resetCount()
+    shots, seconds = _timed(handle.fetchShotCollection)
+    results.append({"name": "fetch.kitsu", "seconds": seconds, "requests": server.requestCount,
+                    "shots": len(shots)})
+
+    for shot in server.dataset["shots"][:max(1, len(shots) // 100)]:
+        server.touchShot(shot["id"], frame_out=shot["data"]["frame_out"] + 1)
+    server.resetCount()
+    _, seconds = _timed(handle.fetchShotCollection)
+    results.append({"name": "fetch.kitsuDelta", "seconds": seconds, "requests": server.requestCount})
+
+    resolve.bridge.reset()
+    _, seconds = _timed(lambda: handle.importShotCollection(shots))
+    results.append({"name": "fetch.import", "seconds": seconds, "bridgeCalls": resolve.bridge.total})
+
+    resolve.bridge.reset()
+    report, seconds = _timed(handle.updateTimeline)
+    results.append({"name": "update.noChange", "seconds": seconds, "bridgeCalls": resolve.bridge.total,
+                    "replaced": len(report["replaced"])})
+
+    for folder in random.Random(0).sample(folders, int(len(folders) * changedRatio)):
+        publishNewVersion(folder)
+    resolve.bridge.reset()
+    report, seconds = _timed(handle.updateTimeline)
+    results.append({"name": "update.changed", "seconds": seconds, "bridgeCalls": resolve.bridge.total,
+                    "replaced": len(report["replaced"]),
+                    "replaceCalls": resolve.bridge.calls["MediaPoolItem.ReplaceClip"]})
+
+    results.append(benchPublishWatcher(handle, resolve, folders))
+    return results
+
+
+def benchPublishWatcher(handle: DavinciHandle, resolve: FakeResolve, folders: list[str]) -> dict[str, Any]:
+    """
+    A few new publishes picked up by the watcher instead of a full update.
+    mainThreadSeconds leaves out the planning, which the UI runs in a worker.
+    """
+    handle.startPublishWatcher()
+    try:
+        changed = random.Random(1).sample(folders, max(1, len(folders) // 100))
+        for folder in changed:
+            publishNewVersion(folder)
+        deadline = time.perf_counter() + 10
+        while handle._changedFolders.empty() and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        # Let the debounce collect the whole burst
+        time.sleep(0.3)
+        resolve.bridge.reset()
+        publishedSources, takeSeconds = _timed(handle.takePublishedSources)
+        if publishedSources is None:
+            return {"name": "update.watched", "published": len(changed), "replaced": 0}
+        plan, planSeconds = _timed(lambda: handle.planTimelineUpdate(publishedSources))
+        report, applySeconds = _timed(lambda: handle.applyPublishedUpdate(publishedSources, plan))
+    finally:
+        handle.stopPublishWatcher()
+    return {"name": "update.watched", "seconds": takeSeconds + planSeconds + applySeconds,
+            "mainThreadSeconds": takeSeconds + applySeconds, "bridgeCalls": resolve.bridge.total,
+            "published": len(changed), "replaced": len(report["replaced"])}
+
+
+def _gitRevision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.trace:
+        Tracing.enable()
+    with tempfile.TemporaryDirectory() as root:
+        folders = generatePublishTree(root, args.shots, versionsPerShot=args.versions)
+        results = benchVersionScan(folders, args.workers)
+        with FakeKitsuServer(buildDataset(args.shots, publishRoot=root), latency=args.latency) as server:
+            results += benchFetchAndUpdate(server, folders, args.workers, args.bridgeLatency, args.changedRatio)
+
+    if args.trace:
+        tracer = Tracing.getTracer()
+        tracer.exportChromeTrace(args.trace)
+        print(tracer.formatSummary(25))
+        print(f"Trace written to {args.trace}")
+        Tracing.disable()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _gitRevision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "shots": args.shots,
+            "versions": args.versions,
+            "workers": args.workers,
+            "latency": args.latency,
+            "bridgeLatency": args.bridgeLatency,
+            "changedRatio": args.changedRatio,
+            "traced": bool(args.trace),
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shots", type=int, default=1000)
+    parser.add_argument("--versions", type=int, default=3, help="Versions per publish folder")
+    parser.add_argument("--workers", type=int, default=8, help="Version scan thread pool size")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per Kitsu request")
+    parser.add_argument("--bridgeLatency", type=float, default=0.0, help="Seconds per Resolve bridge call")
+    parser.add_argument("--changedRatio", type=float, default=0.1, help="Share of shots getting a new version")
+    parser.add_argument("--output", help="JSON lines file the run is appended to")
+    parser.add_argument("--trace", help="Trace the run and write a Chrome trace to this path")
+    args = parser.parse_args()
+
+    record = run(args)
+    for result in record["results"]:
+        print(json.dumps(result))
+    if not args.output:
+        from appdirs import user_cache_dir
+
+        args.output = os.path.join(user_cache_dir(BENCHMARK_APP_NAME), "results.jsonl")
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {args.output}")
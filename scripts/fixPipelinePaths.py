@@ -1,13 +1,17 @@
 import gazu
 
+from DaVinciPipe.ProjectResolver import ProjectResolver
+from DaVinciPipe.storage.CacheStore import CacheStore
+
 basePath = "N:/"
 productionName = "hamster"
 
 
 def start():
-    allProjects = gazu.client.get("/data/projects/all")
-    kitsuProject = [project for project in allProjects if project["name"] == productionName][0]
-    kitsuProjectId = kitsuProject.get("id")
+    resolver = ProjectResolver(
+        lambda path, params=None: gazu.client.get(path, params=params), CacheStore(), gazu.client.get_host()
+    )
+    kitsuProjectId = resolver.resolve(productionName)["id"]
     kitsuFilter = {"project_id": kitsuProjectId}
     allShots = gazu.client.get("/data/shots", params=kitsuFilter)
     setAbsolutepathForEveryShot(allShots)
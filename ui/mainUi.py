@@ -1,20 +1,31 @@
-from PySide6.QtCore import Qt
+import time
+
+from PySide6.QtCore import Qt, QThreadPool, QTimer
 from PySide6.QtWidgets import (
     QWidget,
+    QCheckBox,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
     QPushButton,
     QFrame,
-    QApplication
+    QMessageBox,
+    QProgressBar
 )
 
+from DaVinciPipe import Tracing
+from ui.syncWorker import SyncWorker
+
 
 class MainUi(QWidget):
     def __init__(self, handle, parent=None):
         super().__init__(parent)
 
         self.__handle = handle
+        self.__worker = None
+        self.__workerStarted = 0.0
+        self.__onWorkerFinished = None
+        self.__workerUnit = "folders"
         self.setWindowTitle("Kitsu Timeline Sync")
         self.setMinimumWidth(420)
         self.setObjectName("Root")
@@ -53,6 +64,26 @@ class MainUi(QWidget):
         self.statusLabel.setWordWrap(True)
         cardLayout.addWidget(self.statusLabel)
 
+        # --- Progress ---
+
+        self.progressBar = QProgressBar(self)
+        self.progressBar.setTextVisible(False)
+        self.progressBar.setVisible(False)
+        cardLayout.addWidget(self.progressBar)
+
+        rowProgress = QHBoxLayout()
+        rowProgress.setSpacing(10)
+
+        self.throughputLabel = QLabel("", self)
+        self.throughputLabel.setObjectName("Subtitle")
+
+        self.cancelButton = QPushButton("Cancel", self)
+        self.cancelButton.setVisible(False)
+
+        rowProgress.addWidget(self.throughputLabel, 1)
+        rowProgress.addWidget(self.cancelButton)
+        cardLayout.addLayout(rowProgress)
+
         # --- Button Groups ---
 
         # Row 1: Fetch / Update
@@ -67,6 +98,21 @@ class MainUi(QWidget):
         rowFetchUpdate.addWidget(self.updateTimelineButton)
         cardLayout.addLayout(rowFetchUpdate)
 
+        rowTimelines = QHBoxLayout()
+        rowTimelines.setSpacing(10)
+
+        self.updateAllTimelinesButton = QPushButton("Update All Timelines", self)
+
+        self.linkProxiesButton = QPushButton("Link Proxies", self)
+
+        rowTimelines.addWidget(self.updateAllTimelinesButton)
+        rowTimelines.addWidget(self.linkProxiesButton)
+        cardLayout.addLayout(rowTimelines)
+
+        # Frame range edits of the timeline back to Kitsu
+        self.pushShotEditsButton = QPushButton("Push Shot Edits", self)
+        cardLayout.addWidget(self.pushShotEditsButton)
+
         # Row 2: Publish / Save Version
         rowPublishSave = QHBoxLayout()
         rowPublishSave.setSpacing(10)
@@ -79,6 +125,14 @@ class MainUi(QWidget):
         rowPublishSave.addWidget(self.saveVersionButton)
         cardLayout.addLayout(rowPublishSave)
 
+        # Row 3: Publish watcher
+        self.watchPublishesCheckBox = QCheckBox("Watch publishes", self)
+        cardLayout.addWidget(self.watchPublishesCheckBox)
+
+        # Applies the versions the watcher queued, Resolve calls stay on the main thread
+        self.publishTimer = QTimer(self)
+        self.publishTimer.setInterval(1000)
+
         # --- Footer Hint ---
 
         footerLabel = QLabel("Next feature is coming soon.", self)
@@ -89,8 +143,12 @@ class MainUi(QWidget):
         # --- Style ---
         self.fetchTimelineButton.setProperty("role", "primary")
         self.updateTimelineButton.setProperty("role", "primary")
+        self.updateAllTimelinesButton.setProperty("role", "secondary")
+        self.linkProxiesButton.setProperty("role", "secondary")
+        self.pushShotEditsButton.setProperty("role", "secondary")
         self.publishTimelineButton.setProperty("role", "secondary")
         self.saveVersionButton.setProperty("role", "secondary")
+        self.cancelButton.setProperty("role", "secondary")
 
         # --- Signals ---
 
@@ -100,24 +158,246 @@ class MainUi(QWidget):
         self.updateTimelineButton.clicked.connect(
             self.updateTimelineButtonClicked
         )
+        self.updateAllTimelinesButton.clicked.connect(
+            self.updateAllTimelinesButtonClicked
+        )
+        self.linkProxiesButton.clicked.connect(
+            self.linkProxiesButtonClicked
+        )
+        self.pushShotEditsButton.clicked.connect(
+            self.pushShotEditsButtonClicked
+        )
         self.publishTimelineButton.clicked.connect(
             lambda: self.setStatus("Coming soon.")
         )
         self.saveVersionButton.clicked.connect(
             lambda: self.setStatus("Coming soon.")
         )
+        self.cancelButton.clicked.connect(
+            self.cancelButtonClicked
+        )
+        self.watchPublishesCheckBox.toggled.connect(
+            self.watchPublishesToggled
+        )
+        self.publishTimer.timeout.connect(
+            self.applyPublishedVersions
+        )
 
     def setStatus(self, message: str) -> None:
         self.statusLabel.setText(message)
 
     def fetchTimelineButtonClicked(self):
         self.setStatus("Fetching...")
-        QApplication.processEvents()
-        self.__handle.importShotCollection()
+        self._startWorker(self.__handle.fetchShotCollection, self._importFetchedShots)
+
+    def _importFetchedShots(self, shotCollection):
+        # Resolve calls stay on the main thread
+        self.setStatus("Importing...")
+        self.__handle.importShotCollection(shotCollection)
+        self._rewatchPublishes()
         self.setStatus("Fetching successful")
 
     def updateTimelineButtonClicked(self):
+        self.setStatus("Reading timeline...")
+        timelineSources = self.__handle.readTimelineSources()
         self.setStatus("Updating...")
-        QApplication.processEvents()
-        self.__handle.updateTimeline()
-        self.setStatus("Update successful")
+        self._startWorker(
+            lambda progress, cancelEvent: self.__handle.planTimelineUpdate(timelineSources, progress, cancelEvent),
+            self._applyTimelineUpdate,
+        )
+
+    def _applyTimelineUpdate(self, plan):
+        report = self.__handle.applyTimelineUpdate(plan)
+        self._rewatchPublishes()
+        self.setStatus(f"Update successful: {len(report['replaced'])} source(s) replaced")
+
+    def updateAllTimelinesButtonClicked(self):
+        self.setStatus("Reading timelines...")
+        timelineSources = self.__handle.readTimelinesSources()
+        self.setStatus(f"Updating {len(timelineSources['timelines'])} timeline(s)...")
+        self._startWorker(
+            lambda progress, cancelEvent: self.__handle.planTimelineUpdate(timelineSources, progress, cancelEvent),
+            lambda plan: self._applyTimelinesUpdate(timelineSources, plan),
+        )
+
+    def _applyTimelinesUpdate(self, timelineSources, plan):
+        report = self.__handle.applyTimelinesUpdate(timelineSources, plan)
+        self._rewatchPublishes()
+        changedTimelines = sum(1 for timeline in report["timelines"].values() if timeline["replaced"])
+        self.setStatus(
+            f"Update successful: {len(report['replaced'])} source(s) replaced "
+            f"in {changedTimelines} of {len(report['timelines'])} timeline(s)"
+        )
+
+    def linkProxiesButtonClicked(self):
+        self.setStatus("Reading timeline...")
+        timelineSources = self.__handle.readTimelineSources()
+        self.setStatus("Looking for proxies...")
+        self._startWorker(
+            lambda progress, cancelEvent: self.__handle.planProxyLinks(timelineSources, progress, cancelEvent),
+            self._applyProxyLinks,
+        )
+
+    def _applyProxyLinks(self, plan):
+        report = self.__handle.applyProxyLinks(plan)
+        self.setStatus(
+            f"Proxies: {len(report['linked'])} linked, {len(report['unlinked'])} unlinked, "
+            f"{report['coverage']:.0%} of {report['sourceCount']} source(s) covered"
+        )
+
+    def pushShotEditsButtonClicked(self):
+        self.setStatus("Comparing timeline with Kitsu...")
+        edits = self.__handle.diffTimelineShots()
+        if not edits:
+            self.setStatus("No frame range changes to push.")
+            return
+        # Dry run first, nothing is sent before the user confirmed the diff
+        self._startWorker(
+            lambda progress, cancelEvent: self.__handle.pushShotEdits(edits, True, progress, cancelEvent),
+            lambda report: self._confirmShotEdits(edits, report),
+        )
+
+    def _confirmShotEdits(self, edits, dryRun):
+        failedIds = {failure["id"] for failure in dryRun["failed"]}
+        edits = [edit for edit in edits if edit["id"] not in failedIds]
+        if not edits:
+            self.setStatus(f"None of the {len(failedIds)} edited shot(s) were found in Kitsu.")
+            return
+
+        lines = [_describeShotEdit(edit) for edit in edits]
+        lines += [f"{failure['name']}: {failure['error']}, skipped" for failure in dryRun["failed"]]
+        dialog = QMessageBox(self)
+        dialog.setWindowTitle("Push Shot Edits")
+        dialog.setIcon(QMessageBox.Question)
+        dialog.setText(f"Update the frame range of {len(edits)} shot(s) in Kitsu?")
+        dialog.setInformativeText("\n".join(lines[:10]) + (f"\n... and {len(lines) - 10} more" if len(lines) > 10 else ""))
+        dialog.setDetailedText("\n".join(lines))
+        dialog.setStandardButtons(QMessageBox.Yes | QMessageBox.Cancel)
+        dialog.setDefaultButton(QMessageBox.Cancel)
+        if dialog.exec() != QMessageBox.Yes:
+            self.setStatus("Push canceled.")
+            return
+
+        self.setStatus(f"Pushing {len(edits)} shot(s)...")
+        self._startWorker(
+            lambda progress, cancelEvent: self.__handle.pushShotEdits(edits, False, progress, cancelEvent),
+            self._shotEditsPushed,
+            unit="shots",
+        )
+
+    def _shotEditsPushed(self, report):
+        if report["failed"]:
+            self.setStatus(f"Pushed {len(report['updated'])} shot(s), {len(report['failed'])} failed")
+        else:
+            self.setStatus(f"Pushed {len(report['updated'])} shot(s)")
+
+    def watchPublishesToggled(self, checked: bool):
+        if checked:
+            folderCount = self.__handle.startPublishWatcher()
+            self.publishTimer.start()
+            self.setStatus(f"Watching {folderCount} publish folder(s)")
+        else:
+            self.publishTimer.stop()
+            self.__handle.stopPublishWatcher()
+            self.setStatus("Stopped watching publishes.")
+
+    def applyPublishedVersions(self):
+        # Leave the timeline alone while a fetch or full update is running
+        if self.__worker is not None:
+            return
+        publishedSources = self.__handle.takePublishedSources()
+        if publishedSources is None:
+            return
+        # The publish folders are scanned in the worker, only the replace runs here
+        self._startWorker(
+            lambda progress, cancelEvent: self.__handle.planTimelineUpdate(publishedSources, progress, cancelEvent),
+            lambda plan: self._applyPublishedUpdate(publishedSources, plan),
+        )
+
+    def _applyPublishedUpdate(self, publishedSources, plan):
+        report = self.__handle.applyPublishedUpdate(publishedSources, plan)
+        if report["replaced"]:
+            names = ", ".join(entry["mediaName"] for entry in report["replaced"])
+            self.setStatus(f"New version(s) loaded: {names}")
+
+    def _rewatchPublishes(self):
+        # The timeline changed, so the watched folders and sources did too
+        if self.__handle.isWatchingPublishes:
+            self.__handle.startPublishWatcher()
+
+    def closeEvent(self, event):
+        self.publishTimer.stop()
+        self.__handle.stopPublishWatcher()
+        self.__handle.pipe.close()
+        Tracing.flush()
+        super().closeEvent(event)
+
+    def cancelButtonClicked(self):
+        if self.__worker is not None:
+            self.__worker.cancel()
+            self.cancelButton.setEnabled(False)
+            self.setStatus("Canceling...")
+
+    ### WORKER ###
+
+    def _startWorker(self, task, onFinished, unit: str = "folders"):
+        """unit names what the task's progress counts: scanned folders, or shots sent to Kitsu."""
+        if self.__worker is not None:
+            return
+        self.__worker = SyncWorker(task)
+        self.__workerStarted = time.perf_counter()
+        self.__onWorkerFinished = onFinished
+        self.__workerUnit = unit
+        self.__worker.signals.progress.connect(self._workerProgress)
+        self.__worker.signals.finished.connect(self._workerFinished)
+        self.__worker.signals.failed.connect(self._workerFailed)
+        self.__worker.signals.canceled.connect(self._workerCanceled)
+        self._setBusy(True)
+        QThreadPool.globalInstance().start(self.__worker)
+
+    def _workerProgress(self, done: int, total: int):
+        self.progressBar.setMaximum(max(total, 1))
+        self.progressBar.setValue(done)
+        elapsed = time.perf_counter() - self.__workerStarted
+        rate = done / elapsed if elapsed > 0 else 0.0
+        unit = self.__workerUnit
+        self.throughputLabel.setText(f"{done}/{total} {unit} - {rate:.1f} {unit}/s")
+
+    def _workerFinished(self, result):
+        onFinished = self.__onWorkerFinished
+        self._setBusy(False)
+        try:
+            onFinished(result)
+        except Exception as e:
+            self.setStatus(f"Failed: {e}")
+            raise
+
+    def _workerFailed(self, message: str):
+        self._setBusy(False)
+        self.setStatus(f"Failed: {message}")
+
+    def _workerCanceled(self):
+        self._setBusy(False)
+        self.setStatus("Canceled.")
+
+    def _setBusy(self, busy: bool):
+        if not busy:
+            self.__worker = None
+            self.__onWorkerFinished = None
+        self.fetchTimelineButton.setEnabled(not busy)
+        self.updateTimelineButton.setEnabled(not busy)
+        self.updateAllTimelinesButton.setEnabled(not busy)
+        self.linkProxiesButton.setEnabled(not busy)
+        self.pushShotEditsButton.setEnabled(not busy)
+        self.progressBar.setVisible(busy)
+        self.progressBar.setValue(0)
+        self.cancelButton.setVisible(busy)
+        self.cancelButton.setEnabled(busy)
+        if busy:
+            self.throughputLabel.setText("")
+
+
+def _describeShotEdit(edit) -> str:
+    """One line of the push confirmation, like "sh010: start 0 -> 4, duration 48 -> 44"."""
+    changes = ", ".join(f"{key} {previous} -> {edit[key]}" for key, previous in edit["previous"].items())
+    return f"{edit['name']}: {changes}"
@@ -0,0 +1,42 @@
+import threading
+import traceback
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from DaVinciPipe.Progress import SyncCanceled
+
+
+class SyncWorkerSignals(QObject):
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+    canceled = Signal()
+
+
+class SyncWorker(QRunnable):
+    """
+    Runs the network and filesystem part of a sync on a QThreadPool thread.
+    The task is called with (progressCallback, cancelEvent) and must not
+    touch Resolve; its result is delivered to the main thread via finished.
+    """
+
+    def __init__(self, task: Callable[[Callable[[int, int], None], threading.Event], Any]):
+        super().__init__()
+        self.signals = SyncWorkerSignals()
+        self._task = task
+        self._cancelEvent = threading.Event()
+
+    def cancel(self):
+        self._cancelEvent.set()
+
+    def run(self):
+        try:
+            result = self._task(self.signals.progress.emit, self._cancelEvent)
+        except SyncCanceled:
+            self.signals.canceled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)